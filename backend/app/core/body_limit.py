@@ -0,0 +1,78 @@
+"""
+Request Body Limits
+Rejects oversized upload requests with 413 before Starlette reads and spools their multipart body
+"""
+from typing import Dict
+import json
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+class BodySizeLimitMiddleware:
+    """
+    Per-path caps on request body size
+
+    A declared Content-Length over the cap is refused before any of the
+    body is read. Bodies without one (chunked) are counted as they are
+    received and cut off with a 413 once they pass the cap, whatever error
+    the app makes of the aborted read.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope.get("path", "")) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        declared = dict(scope.get("headers") or []).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            await self._reject(send, limit)
+            return
+
+        received = 0
+        exceeded = False
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    raise BodyTooLarge()
+            return message
+
+        async def limited_send(message):
+            nonlocal rejected
+            # The app turns the aborted read into its own error response; answer 413 instead
+            if exceeded:
+                if not rejected:
+                    rejected = True
+                    await self._reject(send, limit)
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, limited_send)
+        except Exception:
+            if not exceeded:
+                raise
+            if not rejected:
+                await self._reject(send, limit)
+
+    @staticmethod
+    async def _reject(send, limit: int) -> None:
+        body = json.dumps({"detail": f"Request body exceeds the {limit / (1024 * 1024):.1f}MB limit"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,167 @@
+"""
+Application Configuration
+Runtime settings read from environment variables (or .env)
+"""
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Default location of the SQLite files the app creates itself, independent of the working directory
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _get_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def _get_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+# LLM
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "gemini")  # gemini | stub
+LLM_MODEL = os.getenv("LLM_MODEL", "gemini-2.5-flash")
+GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+
+# Offline stub provider (LLM_PROVIDER=stub)
+LLM_STUB_LATENCY_MS = _get_float("LLM_STUB_LATENCY_MS", 800)
+LLM_STUB_LATENCY_JITTER_MS = _get_float("LLM_STUB_LATENCY_JITTER_MS", 200)
+LLM_STUB_LATENCY_DISTRIBUTION = os.getenv("LLM_STUB_LATENCY_DISTRIBUTION", "lognormal")
+LLM_STUB_TOKENS_PER_SECOND = _get_float("LLM_STUB_TOKENS_PER_SECOND", 80)
+# JSON list of {"match": "<prompt substring>", "response": "<text>"} rules
+LLM_STUB_RESPONSES_PATH = os.getenv("LLM_STUB_RESPONSES_PATH", "")
+LLM_STUB_SEED = _get_int("LLM_STUB_SEED", 0)
+
+# Analysis result cache
+ANALYZE_CACHE_MAX_ENTRIES = _get_int("ANALYZE_CACHE_MAX_ENTRIES", 512)
+ANALYZE_CACHE_TTL_SECONDS = _get_float("ANALYZE_CACHE_TTL_SECONDS", 24 * 3600)
+# Path to a SQLite file for the persistent tier; empty disables it
+ANALYZE_CACHE_DB_PATH = os.getenv("ANALYZE_CACHE_DB_PATH", "")
+# Row cap of that SQLite file
+ANALYZE_CACHE_DB_MAX_ENTRIES = _get_int("ANALYZE_CACHE_DB_MAX_ENTRIES", 10000)
+
+# Batch analysis
+ANALYZE_BATCH_CONCURRENCY = _get_int("ANALYZE_BATCH_CONCURRENCY", 4)
+ANALYZE_BATCH_MAX_ITEMS = _get_int("ANALYZE_BATCH_MAX_ITEMS", 50)
+
+# Chat history
+CHAT_HISTORY_BACKEND = os.getenv("CHAT_HISTORY_BACKEND", "memory")  # memory | sqlite
+CHAT_HISTORY_DB_PATH = os.getenv("CHAT_HISTORY_DB_PATH", "")
+CHAT_HISTORY_MAX_SESSIONS = _get_int("CHAT_HISTORY_MAX_SESSIONS", 1000)
+CHAT_HISTORY_IDLE_TTL_SECONDS = _get_float("CHAT_HISTORY_IDLE_TTL_SECONDS", 3600)
+CHAT_HISTORY_MAX_MESSAGES = _get_int("CHAT_HISTORY_MAX_MESSAGES", 10)
+CHAT_HISTORY_MAX_BYTES = _get_int("CHAT_HISTORY_MAX_BYTES", 16384)
+
+# Chat knowledge-base retrieval
+CHAT_KB_TOP_K = _get_int("CHAT_KB_TOP_K", 4)
+CHAT_KB_TOKEN_BUDGET = _get_int("CHAT_KB_TOKEN_BUDGET", 600)
+
+# Resume parsing
+RESUME_MAX_BYTES = _get_int("RESUME_MAX_BYTES", 5 * 1024 * 1024)
+RESUME_PARSE_WORKERS = _get_int("RESUME_PARSE_WORKERS", 2)
+RESUME_PARSE_MAX_CONCURRENT = _get_int("RESUME_PARSE_MAX_CONCURRENT", 4)
+RESUME_PARSE_CPU_SECONDS = _get_float("RESUME_PARSE_CPU_SECONDS", 10)
+RESUME_PARSE_TIMEOUT_SECONDS = _get_float("RESUME_PARSE_TIMEOUT_SECONDS", 15)
+# Extraction stops once this many characters were collected
+RESUME_MAX_CHARS = _get_int("RESUME_MAX_CHARS", 100_000)
+# PDFs with at least this many pages are extracted page-range-parallel
+RESUME_PDF_PARALLEL_MIN_PAGES = _get_int("RESUME_PDF_PARALLEL_MIN_PAGES", 8)
+# Temp files for upload processing (default: the system temp dir)
+RESUME_SPOOL_DIR = os.getenv("RESUME_SPOOL_DIR", "") or None
+# Multipart framing allowed on top of the file size before an upload request is refused with 413
+UPLOAD_FORM_OVERHEAD_BYTES = _get_int("UPLOAD_FORM_OVERHEAD_BYTES", 64 * 1024)
+
+# Parsed resume cache (resume_id -> text)
+RESUME_CACHE_MAX_ENTRIES = _get_int("RESUME_CACHE_MAX_ENTRIES", 1000)
+RESUME_CACHE_TTL_SECONDS = _get_float("RESUME_CACHE_TTL_SECONDS", 24 * 3600)
+RESUME_CACHE_DB_PATH = os.getenv("RESUME_CACHE_DB_PATH", "")
+# Row cap of the SQLite tier
+RESUME_CACHE_DB_MAX_ENTRIES = _get_int("RESUME_CACHE_DB_MAX_ENTRIES", 10000)
+
+# LLM admission control
+LLM_MAX_CONCURRENCY = _get_int("LLM_MAX_CONCURRENCY", 8)
+LLM_MAX_QUEUE = _get_int("LLM_MAX_QUEUE", 32)
+LLM_MAX_QUEUE_SECONDS = _get_float("LLM_MAX_QUEUE_SECONDS", 10)
+
+# Logging
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_JSON = os.getenv("LOG_JSON", "false").lower() in ("1", "true", "yes")
+
+# Background analysis jobs
+ANALYZE_JOBS_DB_PATH = os.getenv("ANALYZE_JOBS_DB_PATH", os.path.join(BACKEND_DIR, "analysis_jobs.db"))
+ANALYZE_JOB_WORKERS = _get_int("ANALYZE_JOB_WORKERS", 2)
+ANALYZE_JOB_MAX_ATTEMPTS = _get_int("ANALYZE_JOB_MAX_ATTEMPTS", 3)
+ANALYZE_JOB_RETRY_BASE_SECONDS = _get_float("ANALYZE_JOB_RETRY_BASE_SECONDS", 2)
+# A running job whose worker died is re-claimed after this long
+ANALYZE_JOB_LEASE_SECONDS = _get_float("ANALYZE_JOB_LEASE_SECONDS", 300)
+ANALYZE_JOB_RETENTION_SECONDS = _get_float("ANALYZE_JOB_RETENTION_SECONDS", 7 * 24 * 3600)
+# Comma-separated hosts allowed as callback_url targets
+ANALYZE_JOB_CALLBACK_HOSTS = [
+    host.strip() for host in os.getenv("ANALYZE_JOB_CALLBACK_HOSTS", "localhost,127.0.0.1").split(",") if host.strip()
+]
+
+# Candidate ranking (/api/rank)
+# Path to a SQLite file for the stored resume corpus; empty keeps it in memory
+RESUME_CORPUS_DB_PATH = os.getenv("RESUME_CORPUS_DB_PATH", "")
+RANK_MAX_TOP_K = _get_int("RANK_MAX_TOP_K", 100)
+RANK_ANALYZE_CONCURRENCY = _get_int("RANK_ANALYZE_CONCURRENCY", 4)
+
+# Extracted job-description requirements, reused across resumes
+JD_REQUIREMENTS_CACHE_MAX_ENTRIES = _get_int("JD_REQUIREMENTS_CACHE_MAX_ENTRIES", 1024)
+JD_REQUIREMENTS_CACHE_TTL_SECONDS = _get_float("JD_REQUIREMENTS_CACHE_TTL_SECONDS", 7 * 24 * 3600)
+JD_REQUIREMENTS_CACHE_DB_PATH = os.getenv("JD_REQUIREMENTS_CACHE_DB_PATH", "")
+# Row cap of the SQLite tier
+JD_REQUIREMENTS_CACHE_DB_MAX_ENTRIES = _get_int("JD_REQUIREMENTS_CACHE_DB_MAX_ENTRIES", 10000)
+
+# Per-field prompt token budgets; longer inputs lose their lowest-value sections first
+ANALYZE_JD_TOKEN_BUDGET = _get_int("ANALYZE_JD_TOKEN_BUDGET", 2000)
+ANALYZE_RESUME_TOKEN_BUDGET = _get_int("ANALYZE_RESUME_TOKEN_BUDGET", 4000)
+CHAT_QUERY_TOKEN_BUDGET = _get_int("CHAT_QUERY_TOKEN_BUDGET", 500)
+CHAT_CONTEXT_TOKEN_BUDGET = _get_int("CHAT_CONTEXT_TOKEN_BUDGET", 1500)
+
+# Analysis output: constrain replies to the result schema where the provider supports it
+ANALYZE_STRUCTURED_OUTPUT = os.getenv("ANALYZE_STRUCTURED_OUTPUT", "true").lower() in ("1", "true", "yes")
+
+# Chat semantic cache: reworded versions of an answered question reuse its answer
+# (only for questions without resume context or earlier turns)
+CHAT_SEMANTIC_CACHE_ENABLED = os.getenv("CHAT_SEMANTIC_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+CHAT_SEMANTIC_CACHE_MAX_ENTRIES = _get_int("CHAT_SEMANTIC_CACHE_MAX_ENTRIES", 512)
+CHAT_SEMANTIC_CACHE_TTL_SECONDS = _get_float("CHAT_SEMANTIC_CACHE_TTL_SECONDS", 6 * 3600)
+# Cosine similarity (0-1) a question needs to an answered one to reuse its answer
+CHAT_SEMANTIC_CACHE_THRESHOLD = _get_float("CHAT_SEMANTIC_CACHE_THRESHOLD", 0.9)
+
+# Analysis LLM call deadline; past it (or while the breaker is open) the keyword-overlap result is served
+ANALYZE_TIMEOUT_SECONDS = _get_float("ANALYZE_TIMEOUT_SECONDS", 30)
+# Hedging: a second attempt for calls still running after the p95 latency (costs extra LLM calls)
+ANALYZE_HEDGE_ENABLED = os.getenv("ANALYZE_HEDGE_ENABLED", "false").lower() in ("1", "true", "yes")
+ANALYZE_HEDGE_MIN_DELAY_SECONDS = _get_float("ANALYZE_HEDGE_MIN_DELAY_SECONDS", 2)
+ANALYZE_HEDGE_QUANTILE = _get_float("ANALYZE_HEDGE_QUANTILE", 0.95)
+# Consecutive failures that open the analysis circuit breaker, and how long it stays open
+LLM_BREAKER_FAILURE_THRESHOLD = _get_int("LLM_BREAKER_FAILURE_THRESHOLD", 5)
+LLM_BREAKER_RESET_SECONDS = _get_float("LLM_BREAKER_RESET_SECONDS", 30)
+
+# Startup: build the LLM clients and services in the background once the server is up;
+# /readyz reports 503 until that finishes. Off: they are built by the first request that needs them
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+# Production launcher (serve.py); each worker is a separate process with its own caches and LLM gateway.
+# With more than one, an unset resume cache or in-memory chat history is moved to SQLite files
+SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+SERVER_PORT = _get_int("SERVER_PORT", 8000)
+SERVER_WORKERS = _get_int("SERVER_WORKERS", 1)
+
+# Bulk resume upload (/api/parse-resume/bulk): files per request (archive members included),
+# request body size (413 before the body is read), and files allowed to wait for the parser at once
+RESUME_BULK_MAX_FILES = _get_int("RESUME_BULK_MAX_FILES", 500)
+RESUME_BULK_MAX_BYTES = _get_int("RESUME_BULK_MAX_BYTES", 200 * 1024 * 1024)
+RESUME_BULK_MAX_PENDING = _get_int("RESUME_BULK_MAX_PENDING", 8)
+
+# Chat history in prompts: a running summary plus the newest turns within this budget
+CHAT_HISTORY_TOKEN_BUDGET = _get_int("CHAT_HISTORY_TOKEN_BUDGET", 1200)
+CHAT_HISTORY_RECENT_MESSAGES = _get_int("CHAT_HISTORY_RECENT_MESSAGES", 6)
+# Rolling summaries: once unsummarized turns pass the trigger, older turns are folded into
+# the summary in the background (at batch priority, at most once per interval per session)
+CHAT_SUMMARY_ENABLED = os.getenv("CHAT_SUMMARY_ENABLED", "true").lower() in ("1", "true", "yes")
+CHAT_SUMMARY_TRIGGER_TOKENS = _get_int("CHAT_SUMMARY_TRIGGER_TOKENS", 1600)
+CHAT_SUMMARY_TOKEN_BUDGET = _get_int("CHAT_SUMMARY_TOKEN_BUDGET", 300)
+CHAT_SUMMARY_MIN_INTERVAL_SECONDS = _get_float("CHAT_SUMMARY_MIN_INTERVAL_SECONDS", 30)
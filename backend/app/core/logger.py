@@ -0,0 +1,20 @@
+"""
+Logging
+Process-wide loguru logger: leveled, with structured fields and optional JSON output
+"""
+import sys
+
+from loguru import logger
+
+from app.core import config
+
+logger.remove()
+logger.add(
+    sys.stderr,
+    level=config.LOG_LEVEL,
+    serialize=config.LOG_JSON,
+    # Structured fields passed as keyword arguments end up in `extra`
+    format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function} - {message} | {extra}"
+)
+
+__all__ = ["logger"]
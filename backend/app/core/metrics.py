@@ -0,0 +1,252 @@
+"""
+Metrics
+In-process counters and histograms rendered in the Prometheus text exposition format
+"""
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import bisect
+import threading
+import time
+
+from app.services.tokens import estimate_tokens
+
+# Seconds; spans sub-millisecond parsing up to slow LLM calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (16, 64, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count per label set"""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._series[key] = series
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, [list(s[0]), s[1], s[2]]) for key, s in self._series.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class StatsGauge(_Metric):
+    """
+    Gauges read at scrape time from existing `stats()` methods
+
+    Every numeric field of a stats dict becomes one sample labelled with
+    its component and field name; nested dicts are flattened one level.
+    """
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str):
+        super().__init__(name, documentation, ("component", "field"))
+        self._sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def track(self, component: str, stats: Callable[[], Dict[str, Any]]) -> None:
+        self._sources[component] = stats
+
+    def samples(self) -> List[str]:
+        lines = []
+        for component, stats in self._sources.items():
+            try:
+                values = stats()
+            except Exception:
+                continue
+            for field, value in self._flatten(values):
+                labels = _format_labels(self.labelnames, (component, field))
+                lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+    @staticmethod
+    def _flatten(values: Dict[str, Any]) -> Iterator[Tuple[str, float]]:
+        for field, value in values.items():
+            if isinstance(value, dict):
+                for sub_field, sub_value in value.items():
+                    if isinstance(sub_value, (int, float)) and not isinstance(sub_value, bool):
+                        yield f"{field}_{sub_field}", sub_value
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                yield field, value
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> Any:
+        return self._metrics.setdefault(metric.name, metric)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "career_compass_stage_seconds",
+    "Time spent in each processing stage",
+    ("service", "stage")
+))
+LLM_TOKENS = REGISTRY.register(Histogram(
+    "career_compass_llm_tokens",
+    "Tokens per LLM call (provider usage metadata when available, else estimated)",
+    ("service", "direction"),
+    buckets=TOKEN_BUCKETS
+))
+FALLBACK_RESULTS = REGISTRY.register(Counter(
+    "career_compass_fallback_results_total",
+    "Requests answered with a fallback instead of a model result",
+    ("service", "reason")
+))
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "career_compass_http_request_seconds",
+    "End-to-end HTTP request latency",
+    ("method", "route", "status")
+))
+SERVICE_STATE = REGISTRY.register(StatsGauge(
+    "career_compass_state",
+    "Point-in-time state of caches, queues and pools"
+))
+
+
+# Worker processes cannot update the parent's metrics; they record stage
+# timings here and the parent replays them (see parser_pool)
+_captured: Optional[List[Tuple[str, str, float]]] = None
+
+
+@contextmanager
+def stage(service: str, name: str) -> Iterator[None]:
+    """Time a processing stage into career_compass_stage_seconds"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, service=service, stage=name)
+        if _captured is not None:
+            _captured.append((service, name, elapsed))
+
+
+@contextmanager
+def capture_stages() -> Iterator[List[Tuple[str, str, float]]]:
+    """Collect stage timings recorded inside the block, for shipping across processes"""
+    global _captured
+    previous, _captured = _captured, []
+    try:
+        yield _captured
+    finally:
+        _captured = previous
+
+
+def replay_stages(timings: List[Tuple[str, str, float]]) -> None:
+    for service, name, elapsed in timings:
+        STAGE_SECONDS.observe(elapsed, service=service, stage=name)
+
+
+def record_llm_tokens(service: str, response: Any, prompt: str, output_text: str) -> Dict[str, int]:
+    """Record input/output tokens of one call; prefers the provider's usage metadata"""
+    usage = getattr(response, "usage_metadata", None) or {}
+    tokens = {
+        "input": int(usage.get("input_tokens") or estimate_tokens(prompt)),
+        "output": int(usage.get("output_tokens") or estimate_tokens(output_text)),
+    }
+    for direction, count in tokens.items():
+        LLM_TOKENS.observe(count, service=service, direction=direction)
+    return tokens
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
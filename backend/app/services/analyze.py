@@ -1,14 +1,30 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import PromptTemplate
 from pydantic import BaseModel, Field
-from typing import List
-import json
-import os
-import re
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from collections import Counter
+import asyncio
+import copy
+import threading
+import time
 from dotenv import load_dotenv
 
+from app.core import config
+from app.core.logger import logger
+from app.core.metrics import FALLBACK_RESULTS, STAGE_SECONDS, record_llm_tokens, stage
+from app.services.cache import ResultCache, make_cache_key
+from app.services.llm_gateway import LLMOverloadedError, get_llm_gateway
+from app.services.llm_json import IncrementalJSONParser, extract_json
+from app.services.llm_provider import get_chat_model, get_structured_chat_model, provider_model_name
+from app.services.prompt_budget import PromptBudget
+from app.services.resilience import CircuitBreaker, CircuitOpenError, DeadlineExceeded, ResilientCaller
+from app.services.requirements import REQUIREMENTS_PROMPT_VERSION, RequirementExtractor, format_requirements
+from app.services.singleflight import SingleFlight
+from app.services.skills import get_skill_extractor
+
 load_dotenv()
 
+# Bump whenever analysis_prompt changes so stale cached results are not served
+PROMPT_VERSION = "2"
+
 
 # Output_Schema
 class SkillGapModel(BaseModel):
@@ -26,26 +42,63 @@ class AnalysisResultModel(BaseModel):
     actionable_tip: str = Field(description="One specific actionable tip")
 
 
+# Fallbacks for fields missing from an otherwise usable reply
+FIELD_DEFAULTS: Dict[str, Any] = {
+    "match_score": 5.0,
+    "match_level": "Moderate Match",
+    "skills_matched": [],
+    "skills_gaps": [],
+    "strengths_found": [],
+    "actionable_tip": "Review the job requirements carefully",
+}
+
+
 class JobMatchAnalyzer:
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            temperature=0.3,
-            google_api_key=os.getenv("GOOGLE_API_KEY")
+        self.model_name = provider_model_name()
+        if config.ANALYZE_STRUCTURED_OUTPUT:
+            self.llm = get_structured_chat_model(temperature=0.3, schema=AnalysisResultModel)
+        else:
+            self.llm = get_chat_model(temperature=0.3)
+
+        self.cache = ResultCache(
+            max_entries=config.ANALYZE_CACHE_MAX_ENTRIES,
+            ttl_seconds=config.ANALYZE_CACHE_TTL_SECONDS,
+            db_path=config.ANALYZE_CACHE_DB_PATH,
+            max_disk_entries=config.ANALYZE_CACHE_DB_MAX_ENTRIES
+        )
+        self.inflight = SingleFlight()
+        self.gateway = get_llm_gateway()
+        self.requirements = RequirementExtractor()
+        self.llm_caller = ResilientCaller(
+            CircuitBreaker(
+                failure_threshold=config.LLM_BREAKER_FAILURE_THRESHOLD,
+                reset_seconds=config.LLM_BREAKER_RESET_SECONDS
+            ),
+            hedge=config.ANALYZE_HEDGE_ENABLED,
+            hedge_min_delay=config.ANALYZE_HEDGE_MIN_DELAY_SECONDS,
+            hedge_quantile=config.ANALYZE_HEDGE_QUANTILE,
+            reserve_slot=self.gateway.try_acquire,
+            release_slot=self.gateway.release
         )
         
+        # Imported here so importing this module stays cheap; see get_analyzer()
+        from langchain_core.prompts import PromptTemplate
+
         self.analysis_prompt = PromptTemplate(
-            input_variables=["job_description", "resume_text"],
+            input_variables=["job_section", "resume_text", "skill_overlap"],
             template="""You are an expert career counselor and technical recruiter with deep knowledge of job markets and skill requirements.
 
 Analyze the following job description and candidate's resume to provide a comprehensive match analysis.
 
-JOB DESCRIPTION:
-{job_description}
+{job_section}
 
 CANDIDATE'S RESUME:
 {resume_text}
 
+PRE-COMPUTED KEYWORD OVERLAP (from a deterministic skill matcher; confirm these and look for anything it missed, such as soft skills and experience):
+{skill_overlap}
+
 Your task is to:
 1. Calculate an accurate match score (0-10) based on skills alignment, experience, and qualifications
 2. Identify all skills that match between the job requirements and resume
@@ -75,88 +128,428 @@ IMPORTANT: Return ONLY a valid JSON object with this exact structure (no markdow
 Return ONLY the JSON object above, nothing else."""
         )
     
-    async def analyze(self, job_description: str, resume_text: str) -> dict:
+    async def analyze(
+        self,
+        job_description: str,
+        resume_text: str,
+        use_cache: bool = True,
+        mode: str = "full",
+        priority: str = "interactive",
+        requirements: Optional[dict] = None,
+        timeout_seconds: Optional[float] = None
+    ) -> dict:
         """
         Analyze job-resume match using LangChain
+
+        mode="fast" skips the LLM and returns a keyword-overlap heuristic.
+        The prompt carries the JD's extracted requirements instead of the
+        raw text when they are passed in or were already extracted.
+        The LLM call waits for a gateway slot at the given priority and
+        raises LLMOverloadedError if the queue is full or no slot frees up
+        within LLM_MAX_QUEUE_SECONDS.
+        Successful results are cached by content hash; pass use_cache=False
+        to force a fresh LLM call (the fresh result still refreshes the cache).
+        Identical concurrent requests share a single LLM call.
+        The call must finish within `timeout_seconds` (capped at
+        ANALYZE_TIMEOUT_SECONDS, gateway wait included); on timeout (also
+        while still queued), LLM errors or while the circuit breaker is open
+        the keyword-overlap result is returned at once, flagged `degraded`.
         """
+        if mode == "fast":
+            with stage("analyze", "heuristic"):
+                return self._heuristic_result(job_description, resume_text)
+
+        if requirements is None:
+            requirements = self.requirements.cached(job_description)
+
+        cache_key = self._cache_key(job_description, resume_text, requirements is not None)
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+
+        deadline = time.monotonic() + self._timeout(timeout_seconds)
+        result = await self.inflight.do(
+            cache_key,
+            lambda: self._run_analysis(job_description, resume_text, cache_key, priority, requirements, deadline)
+        )
+        return copy.deepcopy(result)
+
+    async def _run_analysis(self, job_description: str, resume_text: str, cache_key: str, priority: str,
+                            requirements: Optional[dict] = None, deadline: Optional[float] = None) -> dict:
+        """Call the LLM and cache the result unless it is the fallback"""
+        if deadline is None:
+            deadline = time.monotonic() + self._timeout()
         try:
-           
-            prompt_text = self.analysis_prompt.format(
-                job_description=job_description,
-                resume_text=resume_text
-            )
-            
-        
-            response = await self.llm.ainvoke(prompt_text)
-            
-           
+            prompt_text, budget = self._build_prompt(job_description, resume_text, requirements)
+
+            # No point queueing for a slot the breaker would not let us use
+            if self.llm_caller.breaker.rejects():
+                raise CircuitOpenError("LLM circuit breaker is open")
+            async with self.gateway.slot(priority, timeout=deadline - time.monotonic()):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise DeadlineExceeded("Deadline passed while waiting for an LLM slot")
+                with stage("analyze", "llm_call"):
+                    response = await self.llm_caller.call(lambda: self.llm.ainvoke(prompt_text), remaining)
+
             result_text = response.content if hasattr(response, 'content') else str(response)
-         
-            parsed_result = self._extract_json(result_text)
-            
-           
-            if parsed_result:
-                return self._validate_result(parsed_result)
-            else:
-                return self._get_default_result()
-            
+            tokens = record_llm_tokens("analyze", response, prompt_text, result_text)
+            logger.debug("Analysis LLM call finished", input_tokens=tokens["input"], output_tokens=tokens["output"])
+
+            parser = IncrementalJSONParser()
+            with stage("analyze", "extract_json"):
+                parser.feed(result_text)
+            result = self._finish(parser, budget, cache_key)
+            if self._is_default_result(result):
+                return self._degraded_result(job_description, resume_text, "invalid_output")
+            return result
+
+        except LLMOverloadedError:
+            if not self._out_of_time(deadline):
+                raise
+            logger.warning("Analysis deadline passed while waiting for an LLM slot, returning keyword-overlap result")
+            return self._degraded_result(job_description, resume_text, "deadline")
+        except CircuitOpenError:
+            return self._degraded_result(job_description, resume_text, "circuit_open")
+        except DeadlineExceeded as e:
+            logger.warning("Analysis LLM call timed out, returning keyword-overlap result", error=str(e))
+            return self._degraded_result(job_description, resume_text, "deadline")
+        except Exception as e:
+            logger.error("Analysis failed, returning keyword-overlap result", error=str(e))
+            return self._degraded_result(job_description, resume_text, "llm_error")
+
+    async def analyze_stream(
+        self,
+        job_description: str,
+        resume_text: str,
+        use_cache: bool = True,
+        priority: str = "interactive",
+        timeout_seconds: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Analyze with the LLM reply streamed
+
+        Yields {"field": name, "value": value} for each result field as soon
+        as it is parsed (match_score and skills_matched come first), then
+        {"result": result} with the validated result. A cached result is
+        yielded at once. Streams are not shared with identical in-flight
+        requests; closing the iterator early closes the upstream stream.
+        Deadline and circuit breaker apply as in `analyze` (no hedging).
+        """
+        deadline = time.monotonic() + self._timeout(timeout_seconds)
+        requirements = self.requirements.cached(job_description)
+        cache_key = self._cache_key(job_description, resume_text, requirements is not None)
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                yield {"result": copy.deepcopy(cached)}
+                return
+
+        prompt_text, budget = self._build_prompt(job_description, resume_text, requirements)
+        parser = IncrementalJSONParser()
+        breaker = self.llm_caller.breaker
+        if not breaker.allow():
+            yield {"result": self._degraded_result(job_description, resume_text, "circuit_open")}
+            return
+        try:
+            async with self.gateway.slot(priority, timeout=deadline - time.monotonic()):
+                started = time.perf_counter()
+                stream = self.llm.astream(prompt_text)
+                try:
+                    while True:
+                        remaining = deadline - time.monotonic()
+                        try:
+                            if remaining <= 0:
+                                raise asyncio.TimeoutError
+                            chunk = await asyncio.wait_for(stream.__anext__(), remaining)
+                        except StopAsyncIteration:
+                            break
+                        except asyncio.TimeoutError:
+                            raise DeadlineExceeded("Analysis stream exceeded its deadline")
+                        text = chunk.content if hasattr(chunk, 'content') else str(chunk)
+                        if not text:
+                            continue
+                        if not parser.text:
+                            STAGE_SECONDS.observe(time.perf_counter() - started, service="analyze", stage="llm_first_token")
+                        for name, value in parser.feed(text).items():
+                            if name not in FIELD_DEFAULTS:
+                                continue
+                            try:
+                                value = self._normalize_field(name, value)
+                            except (TypeError, ValueError):
+                                continue
+                            yield {"field": name, "value": value}
+                finally:
+                    await stream.aclose()
+                    STAGE_SECONDS.observe(time.perf_counter() - started, service="analyze", stage="llm_stream")
+        except LLMOverloadedError:
+            breaker.release_probe()
+            if not self._out_of_time(deadline):
+                raise
+            logger.warning("Streaming analysis deadline passed while waiting for an LLM slot, "
+                           "returning keyword-overlap result")
+            yield {"result": self._degraded_result(job_description, resume_text, "deadline")}
+            return
+        except DeadlineExceeded as e:
+            breaker.record_failure()
+            logger.warning("Streaming analysis timed out, returning keyword-overlap result", error=str(e))
+            yield {"result": self._degraded_result(job_description, resume_text, "deadline")}
+            return
         except Exception as e:
-            print(f"Analysis error: {str(e)}")
+            breaker.record_failure()
+            logger.error("Streaming analysis failed, returning keyword-overlap result", error=str(e))
+            yield {"result": self._degraded_result(job_description, resume_text, "llm_error")}
+            return
+        except BaseException:
+            # Client went away mid-stream: no verdict on the provider
+            breaker.release_probe()
+            raise
+
+        breaker.record_success()
+        record_llm_tokens("analyze", None, prompt_text, parser.text)
+        result = self._finish(parser, budget, cache_key)
+        if self._is_default_result(result):
+            result = self._degraded_result(job_description, resume_text, "invalid_output")
+        yield {"result": result}
+
+    @staticmethod
+    def _out_of_time(deadline: float) -> bool:
+        """Whether a gateway wait ended because the deadline ran out (timers may fire a hair early)"""
+        return deadline - time.monotonic() < 0.01
+
+    def _build_prompt(self, job_description: str, resume_text: str,
+                      requirements: Optional[dict] = None) -> Tuple[str, PromptBudget]:
+        """Analysis prompt with the JD and resume fitted to their token budgets"""
+        with stage("analyze", "prompt_format"):
+            budget = PromptBudget({
+                "job_description": config.ANALYZE_JD_TOKEN_BUDGET,
+                "resume_text": config.ANALYZE_RESUME_TOKEN_BUDGET
+            })
+            prompt_jd = job_description if requirements else budget.fit("job_description", job_description)
+            prompt_text = self.analysis_prompt.format(
+                job_section=self._format_job_section(prompt_jd, requirements),
+                resume_text=budget.fit("resume_text", resume_text, kind="resume"),
+                skill_overlap=self._format_skill_overlap(job_description, resume_text)
+            )
+        return prompt_text, budget
+
+    def _finish(self, parser: IncrementalJSONParser, budget: PromptBudget, cache_key: str) -> dict:
+        """
+        Validate the parsed reply and cache it unless it is the fallback
+
+        Only a reply that parsed in full is cached. One cut off
+        mid-generation is accepted if its score parsed and flagged `partial`;
+        a complete but malformed one keeps the fields that parsed and is
+        flagged `degraded`. Neither is cached, so a retry can do better.
+        """
+        with stage("analyze", "extract_json"):
+            parsed = parser.result()
+        exact = parser.complete and not parser.malformed
+        if not parsed or (not exact and "match_score" not in parsed):
             return self._get_default_result()
+
+        with stage("analyze", "validate"):
+            result = self._validate_result(parsed)
+        if self._is_default_result(result):
+            return result
+        if budget.report():
+            result["prompt_truncation"] = budget.report()
+        if exact:
+            self.cache.set(cache_key, copy.deepcopy(result))
+        elif parser.complete:
+            FALLBACK_RESULTS.inc(service="analyze", reason="malformed_output")
+            result["degraded"] = "malformed_output"
+            logger.warning("Analysis reply was malformed, returning the fields that parsed", fields=sorted(parsed))
+        else:
+            result["partial"] = True
+            logger.warning("Analysis reply was truncated, returning the fields that parsed", fields=sorted(parsed))
+        return result
+
+    async def analyze_many(
+        self,
+        pairs: List[Tuple[str, str]],
+        concurrency: int = 4,
+        use_cache: bool = True,
+        mode: str = "full"
+    ) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+        """
+        Analyze (job_description, resume_text) pairs concurrently
+
+        Yields (index, result, error) in completion order; at most
+        `concurrency` LLM calls run at once. Abandoning the iterator
+        cancels whatever is still pending. A JD shared by several pairs
+        has its requirements extracted once and reused for each of them.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        shared = Counter(jd for jd, _ in pairs) if mode == "full" else Counter()
+        extractions = {
+            jd: asyncio.ensure_future(self.requirements.extract(jd, priority="batch"))
+            for jd, count in shared.items() if count > 1
+        }
+
+        async def requirements_for(job_description: str) -> Optional[dict]:
+            extraction = extractions.get(job_description)
+            if extraction is None:
+                return None
+            try:
+                return await asyncio.shield(extraction)
+            except LLMOverloadedError:
+                return None
+
+        async def run(index: int, job_description: str, resume_text: str):
+            async with semaphore:
+                try:
+                    result = await self.analyze(
+                        job_description,
+                        resume_text,
+                        use_cache=use_cache,
+                        mode=mode,
+                        priority="batch",
+                        requirements=await requirements_for(job_description)
+                    )
+                    return index, result, None
+                except Exception as e:
+                    return index, None, str(e)
+
+        tasks = [asyncio.create_task(run(i, jd, rt)) for i, (jd, rt) in enumerate(pairs)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in [*tasks, *extractions.values()]:
+                task.cancel()
+
+    def _format_job_section(self, job_description: str, requirements: Optional[dict] = None) -> str:
+        """The raw JD, or its compact extracted requirements"""
+        if requirements:
+            return f"JOB REQUIREMENTS (extracted from the job description):\n{format_requirements(requirements)}"
+        return f"JOB DESCRIPTION:\n{job_description}"
+
+    def _format_skill_overlap(self, job_description: str, resume_text: str) -> str:
+        """Summarize the local skill match for the prompt"""
+        overlap = get_skill_extractor().compare(job_description, resume_text)
+        if not overlap["required"]:
+            return "No known technical skills detected in the job description"
+        return (
+            f"Matched: {', '.join(overlap['matched']) or 'none'}\n"
+            f"Missing from resume: {', '.join(overlap['missing']) or 'none'}"
+        )
+
+    def _timeout(self, timeout_seconds: Optional[float] = None) -> float:
+        if timeout_seconds is None or timeout_seconds <= 0:
+            return config.ANALYZE_TIMEOUT_SECONDS
+        return min(timeout_seconds, config.ANALYZE_TIMEOUT_SECONDS)
+
+    def _degraded_result(self, job_description: str, resume_text: str, reason: str) -> dict:
+        """Keyword-overlap result served when the LLM cannot answer; never cached"""
+        FALLBACK_RESULTS.inc(service="analyze", reason=reason)
+        with stage("analyze", "heuristic"):
+            result = self._heuristic_result(job_description, resume_text)
+        result["degraded"] = reason
+        return result
+
+    def _heuristic_result(self, job_description: str, resume_text: str) -> dict:
+        """
+        Score a match from skill keyword overlap alone
+
+        Skills the JD mentions more than once count double. No LLM call is
+        made, so this returns in milliseconds.
+        """
+        overlap = get_skill_extractor().compare(job_description, resume_text)
+        required, matched, missing = overlap["required"], overlap["matched"], overlap["missing"]
+        repeated = set(overlap["repeated"])
+
+        if required:
+            weight = {skill: 2 if skill in repeated else 1 for skill in required}
+            score = 10.0 * sum(weight[s] for s in matched) / sum(weight.values())
+        else:
+            score = 5.0
+        score = round(score, 1)
+
+        if score >= 8:
+            match_level = "Excellent Match"
+        elif score >= 6:
+            match_level = "Good Match"
+        elif score >= 4:
+            match_level = "Moderate Match"
+        else:
+            match_level = "Needs Improvement"
+
+        strengths = []
+        if required:
+            strengths.append(f"Covers {len(matched)} of {len(required)} technical skills in the job description")
+        if matched:
+            strengths.append(f"Hands-on with {', '.join(matched[:5])}")
+
+        if missing:
+            tip = f"Add a project or bullet point that demonstrates {missing[0]}, since the role asks for it"
+        else:
+            tip = "Quantify the impact of your most relevant projects to stand out"
+
+        return {
+            "match_score": score,
+            "match_level": match_level,
+            "skills_matched": matched,
+            "skills_gaps": [
+                {
+                    "skill": skill,
+                    "importance": "high" if skill in repeated else "medium",
+                    "suggestion": f"Build a small project using {skill} and list it on your resume"
+                }
+                for skill in missing[:5]
+            ],
+            "strengths_found": strengths,
+            "actionable_tip": tip
+        }
+
+    def _cache_key(self, job_description: str, resume_text: str, compact: bool = False) -> str:
+        """Content hash of everything that determines the analysis output"""
+        parts = [job_description, resume_text, self.model_name, PROMPT_VERSION]
+        if compact:
+            parts.append("requirements:" + REQUIREMENTS_PROMPT_VERSION)
+        return make_cache_key(*parts)
     
     def _extract_json(self, text: str) -> dict:
         """Extract JSON from LLM response"""
-        try:
-           
-            text = re.sub(r'```json\s*', '', text)
-            text = re.sub(r'```\s*', '', text)
-            
-         
-            start = text.find("{")
-            end = text.rfind("}") + 1
-            
-            if start != -1 and end > start:
-                json_str = text[start:end]
-                data = json.loads(json_str)
-                return data
-        except json.JSONDecodeError as e:
-            print(f"JSON decode error: {str(e)}")
-        except Exception as e:
-            print(f"JSON extraction error: {str(e)}")
-        
-        return None
+        return extract_json(text)
     
     def _validate_result(self, data: dict) -> dict:
         """Validate and normalize the result"""
         try:
-           
-            validated = {
-                "match_score": float(data.get("match_score", 5.0)),
-                "match_level": str(data.get("match_level", "Moderate Match")),
-                "skills_matched": data.get("skills_matched", []),
-                "skills_gaps": [],
-                "strengths_found": data.get("strengths_found", []),
-                "actionable_tip": str(data.get("actionable_tip", "Review the job requirements carefully"))
+            return {
+                name: self._normalize_field(name, data.get(name, copy.deepcopy(default)))
+                for name, default in FIELD_DEFAULTS.items()
             }
-            
-            
-            for gap in data.get("skills_gaps", []):
-                if isinstance(gap, dict):
-                    validated["skills_gaps"].append({
-                        "skill": str(gap.get("skill", "Unknown")),
-                        "importance": str(gap.get("importance", "medium")),
-                        "suggestion": str(gap.get("suggestion", "Consider learning this skill"))
-                    })
-            
-            
-            validated["match_score"] = max(0.0, min(10.0, validated["match_score"]))
-            
-            return validated
-            
         except Exception as e:
-            print(f"Validation error: {str(e)}")
+            logger.warning("Analysis result failed validation", error=str(e))
             return self._get_default_result()
-    
+
+    def _normalize_field(self, name: str, value: Any) -> Any:
+        """Coerce one result field to its response type; raises on values that cannot be"""
+        if name == "match_score":
+            return max(0.0, min(10.0, float(value)))
+        if name in ("match_level", "actionable_tip"):
+            return str(value)
+        if name == "skills_gaps":
+            return [
+                {
+                    "skill": str(gap.get("skill", "Unknown")),
+                    "importance": str(gap.get("importance", "medium")),
+                    "suggestion": str(gap.get("suggestion", "Consider learning this skill"))
+                }
+                for gap in value if isinstance(gap, dict)
+            ]
+        return value
+
+    def _is_default_result(self, result: dict) -> bool:
+        """Fallback results must never be cached"""
+        return result == self._get_default_result()
+
+    def is_fallback(self, result: dict) -> bool:
+        """The result did not come from the LLM (degraded or the generic default)"""
+        return bool(result.get("degraded")) or self._is_default_result(result)
+
     def _get_default_result(self) -> dict:
         """Return default result when analysis fails"""
         return {
@@ -172,4 +565,18 @@ Return ONLY the JSON object above, nothing else."""
             ],
             "strengths_found": ["Analysis incomplete - please retry"],
             "actionable_tip": "Ensure your resume clearly highlights relevant skills and experience"
-        }
\ No newline at end of file
+        }
+
+
+_analyzer: Optional[JobMatchAnalyzer] = None
+_analyzer_lock = threading.Lock()
+
+
+def get_analyzer() -> JobMatchAnalyzer:
+    """Shared analyzer, built on first use (or by the startup warm-up)"""
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                _analyzer = JobMatchAnalyzer()
+    return _analyzer
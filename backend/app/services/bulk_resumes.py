@@ -0,0 +1,284 @@
+"""
+Bulk Resume Ingestion
+Parses resumes from a multi-file upload and/or ZIP archives, yielding one result per file as it finishes
+"""
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Iterator, List, Optional
+import asyncio
+import os
+import posixpath
+import zipfile
+import zlib
+
+from fastapi import UploadFile
+
+from app.core.logger import logger
+from app.services.cache import ResultCache
+from app.services.parser_pool import ResumeParseError, ResumeParserPool, ResumeTooLargeError
+from app.services.uploads import spool_stream, spool_upload
+
+CONTENT_TYPES = {
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".txt": "text/plain",
+}
+ZIP_CONTENT_TYPES = {"application/zip", "application/x-zip-compressed", "application/x-zip"}
+
+
+@dataclass
+class _Entry:
+    index: int
+    filename: str
+    content_type: Optional[str] = None
+    # Temp file holding the upload or extracted archive member
+    path: Optional[str] = None
+    resume_id: Optional[str] = None
+    size: int = 0
+    error: Optional[str] = None
+
+
+def content_type_for(filename: str, declared: Optional[str] = None) -> Optional[str]:
+    """Resume MIME type from the declared type, else from the extension; None if unsupported"""
+    if declared in CONTENT_TYPES.values():
+        return declared
+    return CONTENT_TYPES.get(posixpath.splitext(filename.lower())[1])
+
+
+def is_zip(upload: UploadFile) -> bool:
+    return upload.content_type in ZIP_CONTENT_TYPES or (upload.filename or "").lower().endswith(".zip")
+
+
+def _skipped(name: str) -> bool:
+    """Directories and OS metadata (__MACOSX/, .DS_Store, ._ forks) are not resumes"""
+    return name.endswith("/") or name.startswith("__MACOSX/") or posixpath.basename(name).startswith(".")
+
+
+def _iter_archive(archive_file: BinaryIO, check_size: Callable[[int], None],
+                  directory: Optional[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Extract archive members one at a time to temp files
+
+    Blocking; driven step by step from a thread. Only one member is
+    decompressed at a time, and each is cut off at the per-file size limit
+    whatever size its header declares.
+    """
+    with zipfile.ZipFile(archive_file) as archive:
+        for info in archive.infolist():
+            if _skipped(info.filename):
+                continue
+            member: Dict[str, Any] = {"filename": info.filename}
+            content_type = content_type_for(info.filename)
+            if content_type is None:
+                member["error"] = "Unsupported file type; expected PDF, DOCX or TXT"
+            elif info.flag_bits & 0x1:
+                member["error"] = "Encrypted archive entries are not supported"
+            else:
+                try:
+                    check_size(info.file_size)
+                    with archive.open(info) as source:
+                        member["path"], member["resume_id"], member["size"] = spool_stream(
+                            source, check_size, directory
+                        )
+                    member["content_type"] = content_type
+                except ResumeTooLargeError as e:
+                    member["error"] = str(e)
+                except (zipfile.BadZipFile, zlib.error, EOFError, NotImplementedError) as e:
+                    member["error"] = f"Corrupt archive entry: {e}"
+            yield member
+
+
+def _discard_spooled(future: "asyncio.Future") -> None:
+    """Delete the temp file of an extraction that finished after its caller gave up"""
+    if future.cancelled() or future.exception() is not None:
+        return
+    member = future.result()
+    if isinstance(member, dict) and member.get("path"):
+        with suppress(OSError):
+            os.unlink(member["path"])
+
+
+class BulkResumeParser:
+    """
+    Parses many uploaded resumes through the shared parser pool
+
+    Each upload is a resume or a ZIP archive of resumes. Archives are read
+    from the file Starlette spooled and extracted member by member, never
+    unpacked in full; at most `max_pending` files wait for the parser at a
+    time.
+    Files with identical bytes are parsed once per request (and not at all
+    if the resume cache has them). Results come in completion order.
+    """
+
+    def __init__(self, parser_pool: ResumeParserPool, cache: ResultCache, max_files: int = 500,
+                 max_pending: int = 8, spool_dir: Optional[str] = None):
+        self.parser_pool = parser_pool
+        self.cache = cache
+        self.max_files = max_files
+        self.max_pending = max_pending
+        self.spool_dir = spool_dir
+
+    async def parse(self, uploads: List[UploadFile], include_text: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield one dict per file, then {"summary": counts}
+
+        A file's dict has its `index` and `filename`, plus either the parse
+        result (`resume_id`, `chars`, `cached`, ...), `duplicate_of` (index of
+        the same bytes earlier in the request) or `error`. Abandoning the
+        iterator cancels pending parses and deletes their temp files.
+        """
+        results: asyncio.Queue = asyncio.Queue()
+        slots = asyncio.Semaphore(max(1, self.max_pending))
+        first_index: Dict[str, int] = {}
+        tasks = set()
+        counts = {"files": 0, "parsed": 0, "cached": 0, "duplicates": 0, "errors": 0}
+
+        async def run(entry: _Entry) -> None:
+            try:
+                result = await self._parse_entry(entry, include_text)
+            finally:
+                if entry.path:
+                    with suppress(OSError):
+                        os.unlink(entry.path)
+                slots.release()
+            results.put_nowait(result)
+
+        async def produce() -> None:
+            try:
+                async for entry in self._entries(uploads, slots):
+                    if entry.error is None and entry.resume_id not in first_index:
+                        first_index[entry.resume_id] = entry.index
+                        tasks.add(asyncio.ensure_future(run(entry)))
+                        continue
+                    if entry.error is not None:
+                        result = {"index": entry.index, "filename": entry.filename, "error": entry.error}
+                    else:
+                        if entry.path:
+                            os.unlink(entry.path)
+                        result = {"index": entry.index, "filename": entry.filename,
+                                  "resume_id": entry.resume_id, "duplicate_of": first_index[entry.resume_id]}
+                    slots.release()
+                    results.put_nowait(result)
+                if tasks:
+                    await asyncio.gather(*tasks)
+            finally:
+                results.put_nowait(None)
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            while True:
+                result = await results.get()
+                if result is None:
+                    break
+                counts["files"] += 1
+                if "error" in result:
+                    counts["errors"] += 1
+                elif "duplicate_of" in result:
+                    counts["duplicates"] += 1
+                else:
+                    counts["cached" if result["cached"] else "parsed"] += 1
+                yield result
+            await producer
+            logger.info("Bulk resume parse finished", **counts)
+            yield {"summary": counts}
+        finally:
+            producer.cancel()
+            for task in tasks:
+                task.cancel()
+
+    async def _entries(self, uploads: List[UploadFile], slots: asyncio.Semaphore) -> AsyncIterator[_Entry]:
+        """Read every resume in the request; each yielded entry holds one slot"""
+        index = 0
+        for upload in uploads:
+            filename = upload.filename or f"file-{index}"
+            members: Iterator[Dict[str, Any]] = iter(())
+            prefix = ""
+            plain = not is_zip(upload)
+            try:
+                if not plain:
+                    members = _iter_archive(upload.file, self.parser_pool.check_size, self.spool_dir)
+                    prefix = f"{filename}/"
+
+                while True:
+                    await slots.acquire()
+                    try:
+                        if plain:
+                            member = await self._read_file(upload, filename)
+                        else:
+                            member = await self._next_member(members)
+                    except zipfile.BadZipFile as e:
+                        member = {"filename": filename, "error": f"Not a valid ZIP archive: {e}"}
+                        members, prefix = iter(()), ""
+                    except BaseException:
+                        slots.release()
+                        raise
+                    if member is None:
+                        slots.release()
+                        break
+                    member["filename"] = prefix + member["filename"]
+                    if index >= self.max_files:
+                        if member.get("path"):
+                            os.unlink(member["path"])
+                        yield _Entry(index, member["filename"],
+                                     error=f"Too many files: at most {self.max_files} per request")
+                        return
+                    yield _Entry(index, **member)
+                    index += 1
+                    if plain:
+                        break
+            finally:
+                close = getattr(members, "close", None)
+                if close is not None:
+                    with suppress(ValueError):
+                        close()
+
+    async def _read_file(self, upload: UploadFile, filename: str) -> Dict[str, Any]:
+        content_type = content_type_for(filename, upload.content_type)
+        if content_type is None:
+            return {"filename": filename, "error": "Unsupported file type; expected PDF, DOCX, TXT or ZIP"}
+        try:
+            if upload.size is not None:
+                self.parser_pool.check_size(upload.size)
+            path, resume_id, size = await spool_upload(upload, self.parser_pool.check_size, self.spool_dir)
+        except ResumeTooLargeError as e:
+            return {"filename": filename, "error": str(e)}
+        return {"filename": filename, "content_type": content_type, "path": path, "resume_id": resume_id, "size": size}
+
+    @staticmethod
+    async def _next_member(members: Iterator[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Advance the (blocking) member iterator in a thread without leaking its temp file on cancel"""
+        step = asyncio.ensure_future(asyncio.to_thread(next, members, None))
+        try:
+            return await asyncio.shield(step)
+        except asyncio.CancelledError:
+            step.add_done_callback(_discard_spooled)
+            raise
+
+    async def _parse_entry(self, entry: _Entry, include_text: bool) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"index": entry.index, "filename": entry.filename}
+        cached = self.cache.get(entry.resume_id)
+        if cached is not None:
+            text = cached["text"]
+        else:
+            try:
+                text = await self.parser_pool.parse(entry.path, entry.content_type)
+            except ResumeParseError as e:
+                result["error"] = f"Error parsing file: {e}"
+                return result
+            except Exception as e:
+                logger.warning("Bulk resume parse failed", filename=entry.filename, error=str(e))
+                result["error"] = f"Error parsing file: {e}"
+                return result
+            self.cache.set(entry.resume_id, {"text": text, "content_type": entry.content_type})
+
+        result.update({
+            "resume_id": entry.resume_id,
+            "content_type": entry.content_type,
+            "size": entry.size,
+            "chars": len(text),
+            "truncated": len(text) >= self.parser_pool.max_chars,
+            "cached": cached is not None,
+        })
+        if include_text:
+            result["text"] = text
+        return result
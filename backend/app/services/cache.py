@@ -0,0 +1,151 @@
+"""
+Result Cache Service
+Content-addressed LRU cache with TTL and an optional SQLite tier
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+
+# The SQLite tier is swept for expired and surplus rows once per this many writes
+SWEEP_EVERY_WRITES = 64
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so cosmetic edits hash to the same key"""
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+
+def make_cache_key(*parts: str) -> str:
+    """
+    Build a SHA-256 key from normalized parts
+
+    Parts are length-prefixed so ("ab", "c") and ("a", "bc") never collide.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        encoded = normalize_text(part).encode('utf-8')
+        digest.update(str(len(encoded)).encode('ascii') + b':' + encoded)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Bounded in-memory LRU with per-entry TTL
+
+    When `db_path` is set, entries are also written to SQLite so they survive
+    restarts; memory misses fall through to disk and are promoted on hit.
+    The file holds at most `max_disk_entries` rows: expired rows and the
+    ones closest to expiry beyond the cap are deleted on open and every
+    SWEEP_EVERY_WRITES writes.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 3600, db_path: str = "",
+                 max_disk_entries: int = 10000):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_entries = max_disk_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_evictions = 0
+        self._writes = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS result_cache ("
+                "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value TEXT NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_result_cache_expires ON result_cache (expires_at)")
+            self._db.commit()
+            self._sweep()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value or None if missing/expired"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT expires_at, value FROM result_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    expires_at, raw = row
+                    if expires_at > now:
+                        value = json.loads(raw)
+                        self._store(key, expires_at, value)
+                        self.disk_hits += 1
+                        return value
+                    self._db.execute("DELETE FROM result_cache WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value"""
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._store(key, expires_at, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO result_cache (key, expires_at, value) VALUES (?, ?, ?)",
+                    (key, expires_at, json.dumps(value)),
+                )
+                self._db.commit()
+                self._writes += 1
+                if self._writes % SWEEP_EVERY_WRITES == 0:
+                    self._sweep()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM result_cache")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "persistent": self._db is not None,
+                "disk_evictions": self.disk_evictions,
+            }
+
+    def _store(self, key: str, expires_at: float, value: Any) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _sweep(self) -> None:
+        """Delete expired rows, then the ones expiring soonest beyond max_disk_entries"""
+        with self._db:
+            self.disk_evictions += self._db.execute(
+                "DELETE FROM result_cache WHERE expires_at <= ? OR key IN ("
+                "SELECT key FROM result_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (time.time(), self.max_disk_entries)
+            ).rowcount
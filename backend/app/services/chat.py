@@ -1,23 +1,60 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from typing import List, Dict
-import os
+from typing import Any, AsyncIterator, List, Dict, Optional, Tuple
 from dotenv import load_dotenv
+import threading
+import time
+
+from app.core import config
+from app.core.logger import logger
+from app.core.metrics import FALLBACK_RESULTS, STAGE_SECONDS, record_llm_tokens, stage
+from app.services.cache import make_cache_key
+from app.services.history import HistoryStore, create_history_store
+from app.services.llm_gateway import LLMOverloadedError, get_llm_gateway
+from app.services.llm_provider import get_chat_model
+from app.services.prompt_budget import PromptBudget
+from app.services.retrieval import KnowledgeRetriever
+from app.services.semantic_cache import SemanticCache
+from app.services.singleflight import SingleFlight
+from app.services.skills import get_skill_extractor
+from app.services.summarizer import HistorySummarizer
 
 load_dotenv()
 
 
 class CareerChatService:
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            temperature=0.7,
-            google_api_key=os.getenv("GOOGLE_API_KEY")
-        )
+        self.llm = get_chat_model(temperature=0.7)
         
         
-        self.chat_history: List[Dict[str, str]] = []
+        self.history: HistoryStore = create_history_store(
+            config.CHAT_HISTORY_BACKEND,
+            db_path=config.CHAT_HISTORY_DB_PATH,
+            max_sessions=config.CHAT_HISTORY_MAX_SESSIONS,
+            idle_ttl_seconds=config.CHAT_HISTORY_IDLE_TTL_SECONDS,
+            max_messages=config.CHAT_HISTORY_MAX_MESSAGES,
+            max_bytes=config.CHAT_HISTORY_MAX_BYTES
+        )
         
         self.knowledge_base = self._get_knowledge_base()
+        self.retriever = KnowledgeRetriever(self.knowledge_base)
+        self.inflight = SingleFlight()
+        self.gateway = get_llm_gateway()
+        self.semantic_cache = SemanticCache(
+            max_entries=config.CHAT_SEMANTIC_CACHE_MAX_ENTRIES,
+            ttl_seconds=config.CHAT_SEMANTIC_CACHE_TTL_SECONDS,
+            threshold=config.CHAT_SEMANTIC_CACHE_THRESHOLD
+        )
+        self.summarizer = HistorySummarizer(
+            self.history,
+            get_chat_model(temperature=0.2),
+            self.gateway,
+            enabled=config.CHAT_SUMMARY_ENABLED,
+            trigger_tokens=config.CHAT_SUMMARY_TRIGGER_TOKENS,
+            recent_tokens=config.CHAT_HISTORY_TOKEN_BUDGET,
+            recent_messages=config.CHAT_HISTORY_RECENT_MESSAGES,
+            summary_tokens=config.CHAT_SUMMARY_TOKEN_BUDGET,
+            min_interval_seconds=config.CHAT_SUMMARY_MIN_INTERVAL_SECONDS,
+            store_max_messages=config.CHAT_HISTORY_MAX_MESSAGES
+        )
     
     def _get_knowledge_base(self) -> str:
         """Return comprehensive career knowledge as a single string"""
@@ -219,32 +256,36 @@ RED FLAGS (NOT READY):
 ✗ Haven't built anything outside of tutorials
 """
     
+    TOPIC_KEYWORDS = {
+        "data science": ["data science", "data scientist", "ml engineer", "machine learning", "data analyst"],
+        "frontend": ["frontend", "front-end", "react", "vue", "javascript", "web developer", "ui developer"],
+        "backend": ["backend", "back-end", "api", "server", "database", "python developer"],
+        "fullstack": ["fullstack", "full-stack", "full stack"],
+        "resume": ["resume", "cv", "application"],
+        "interview": ["interview", "interviewing", "technical round", "behavioral"],
+        "job search": ["job search", "apply", "application", "hiring"],
+        "skills": ["skill", "learn", "technology", "framework"],
+        "ready": ["ready", "prepared", "qualified", "career readiness"]
+    }
+
+    def _match_topics(self, query: str) -> List[str]:
+        """Topics whose keywords appear in the query"""
+        query_lower = query.lower()
+        return [
+            topic for topic, keywords in self.TOPIC_KEYWORDS.items()
+            if any(keyword in query_lower for keyword in keywords)
+        ]
+
     def _find_relevant_context(self, query: str) -> str:
         """Simple keyword matching to find relevant sections"""
-        query_lower = query.lower()
         kb = self.knowledge_base
         
-       
-        sections = {
-            "data science": ["data science", "data scientist", "ml engineer", "machine learning", "data analyst"],
-            "frontend": ["frontend", "front-end", "react", "vue", "javascript", "web developer", "ui developer"],
-            "backend": ["backend", "back-end", "api", "server", "database", "python developer"],
-            "fullstack": ["fullstack", "full-stack", "full stack"],
-            "resume": ["resume", "cv", "application"],
-            "interview": ["interview", "interviewing", "technical round", "behavioral"],
-            "job search": ["job search", "apply", "application", "hiring"],
-            "skills": ["skill", "learn", "technology", "framework"],
-            "ready": ["ready", "prepared", "qualified", "career readiness"]
-        }
-        
         
         relevant = []
-        for section, keywords in sections.items():
-            if any(keyword in query_lower for keyword in keywords):
-                
-                start_marker = f"=== {section.upper()}"
-                if start_marker in kb.upper():
-                    relevant.append(section)
+        for section in self._match_topics(query):
+            start_marker = f"=== {section.upper()}"
+            if start_marker in kb.upper():
+                relevant.append(section)
         
        
         if not relevant:
@@ -252,23 +293,46 @@ RED FLAGS (NOT READY):
         
         return f"Focus on: {', '.join(relevant)}"
     
-    async def chat(self, query: str, context: str = "") -> str:
+    def _build_prompt(self, query: str, context: str = "", session_id: str = "") -> Tuple[str, Dict[str, Any]]:
         """
-        Handle career chat without embeddings
+        Assemble the chat prompt for a query
+
+        Only the knowledge-base chunks retrieved for the query are inlined,
+        and the query and resume context are held to their token budgets;
+        returns the prompt and metadata (retrieval stats, what was cut).
         """
-        try:
-            
-            relevant_context = self._find_relevant_context(query)
-            
-           
-            history_text = ""
-            for msg in self.chat_history[-4:]:  # Last 4 messages for context
-                role = msg["role"]
-                content = msg["content"]
-                history_text += f"{role.upper()}: {content}\n\n"
-            
-          
-            prompt = f"""You are an expert career counselor and job search advisor specializing in tech careers.
+        relevant_context = self._find_relevant_context(query)
+
+        # Topic names expand the query so "cv" also retrieves resume chunks
+        retrieval_query = " ".join([query] + self._match_topics(query))
+        knowledge, metadata = self.retriever.retrieve(
+            retrieval_query,
+            top_k=config.CHAT_KB_TOP_K,
+            token_budget=config.CHAT_KB_TOKEN_BUDGET
+        )
+        
+       
+        # Running summary of older turns plus the newest turns, within CHAT_HISTORY_TOKEN_BUDGET
+        history_text = ""
+        chat_history = self.history.get(session_id) if session_id else []
+        summary, recent_turns = self.summarizer.context(chat_history)
+        if summary:
+            history_text += f"SUMMARY OF EARLIER CONVERSATION: {summary}\n\n"
+        for msg in recent_turns:
+            role = msg["role"]
+            content = msg["content"]
+            history_text += f"{role.upper()}: {content}\n\n"
+
+        budget = PromptBudget({
+            "query": config.CHAT_QUERY_TOKEN_BUDGET,
+            "context": config.CHAT_CONTEXT_TOKEN_BUDGET
+        })
+        prompt_query = budget.fit("query", query)
+        context = budget.fit("context", context, kind="resume")
+        metadata = {**metadata, "prompt_truncation": budget.report()}
+        
+      
+        prompt = f"""You are an expert career counselor and job search advisor specializing in tech careers.
 
 Your role is to:
 - Provide actionable career advice and guidance
@@ -279,8 +343,8 @@ Your role is to:
 
 Be encouraging but realistic. Provide specific, actionable advice rather than generic platitudes.
 
-COMPREHENSIVE CAREER KNOWLEDGE BASE:
-{self.knowledge_base}
+RELEVANT CAREER KNOWLEDGE:
+{knowledge if knowledge else "No specific knowledge base entries; use general career expertise"}
 
 RELEVANT TOPICS FOR THIS QUERY: {relevant_context}
 
@@ -290,26 +354,158 @@ USER'S RESUME CONTEXT:
 CONVERSATION HISTORY:
 {history_text if history_text else "No previous conversation"}
 
-USER QUERY: {query}
+USER QUERY: {prompt_query}
 
 Provide a helpful, specific, and actionable response (2-4 paragraphs). Use bullet points for lists. Be conversational and encouraging."""
 
-            
-            response = await self.llm.ainvoke(prompt)
-            
-          
+        return prompt, metadata
+
+    def _semantic_partition(self, query: str, context: str, session_id: str) -> Optional[str]:
+        """
+        Semantic cache partition for a query, or None if its answer is personal
+
+        Answers depend on the resume and on earlier turns, so only standalone
+        questions without either are shared. Questions are only matched
+        against others naming the same topics and skills, so "frontend" and
+        "backend" (or "React" and "Vue") variants never share an answer.
+        """
+        if not config.CHAT_SEMANTIC_CACHE_ENABLED or (context and context.strip()):
+            return None
+        if session_id and self.history.get(session_id):
+            return None
+        topics = sorted(self._match_topics(query))
+        skills = sorted(get_skill_extractor().extract(query))
+        return ",".join(topics) + "|" + ",".join(skills)
+
+    def _semantic_lookup(self, query: str, partition: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Stored answer to a near-duplicate question, with how it matched"""
+        if partition is None:
+            return None
+        hit = self.semantic_cache.get(query, partition)
+        if hit is None:
+            return None
+        value, similarity, matched_query = hit
+        logger.debug("Chat semantic cache hit", similarity=round(similarity, 3))
+        return {**value, "semantic_cache": {"similarity": round(similarity, 3), "matched_query": matched_query}}
+
+    def _remember(self, session_id: str, query: str, response_text: str) -> None:
+        """Append a completed exchange to the session's history; long sessions get summarized in the background"""
+        if not session_id:
+            return
+        self.history.append(session_id, [
+            {"role": "user", "content": query},
+            {"role": "assistant", "content": response_text}
+        ])
+        self.summarizer.maybe_refresh(session_id)
+
+    async def chat(self, query: str, context: str = "", session_id: str = "") -> Dict[str, Any]:
+        """
+        Handle career chat with retrieved knowledge-base context
+        Returns the response text plus prompt metadata
+
+        A duplicate submission of the same message in the same session
+        (double click, client retry) shares the in-flight LLM call. A
+        standalone question close enough to one already answered reuses that
+        answer without an LLM call.
+        """
+        partition = self._semantic_partition(query, context, session_id)
+        cached = self._semantic_lookup(query, partition)
+        if cached is not None:
+            self._remember(session_id, query, cached["response"])
+            return cached
+
+        key = make_cache_key(session_id, query, context or "")
+        result = await self.inflight.do(key, lambda: self._run_chat(query, context, session_id, partition))
+        return dict(result)
+
+    async def _run_chat(self, query: str, context: str, session_id: str,
+                        partition: Optional[str] = None) -> Dict[str, Any]:
+        try:
+            with stage("chat", "build_prompt"):
+                prompt, metadata = self._build_prompt(query, context, session_id)
+
+            async with self.gateway.slot("interactive"):
+                with stage("chat", "llm_call"):
+                    response = await self.llm.ainvoke(prompt)
+
             response_text = response.content if hasattr(response, 'content') else str(response)
-            
-        
-            self.chat_history.append({"role": "user", "content": query})
-            self.chat_history.append({"role": "assistant", "content": response_text})
-            
-          
-            if len(self.chat_history) > 10:
-                self.chat_history = self.chat_history[-10:]
-            
-            return response_text
-            
+            tokens = record_llm_tokens("chat", response, prompt, response_text)
+            logger.debug("Chat LLM call finished", input_tokens=tokens["input"], output_tokens=tokens["output"])
+
+            self._remember(session_id, query, response_text)
+            if partition is not None:
+                self.semantic_cache.set(query, {"response": response_text, **metadata}, partition)
+
+            return {"response": response_text, **metadata}
+
+        except LLMOverloadedError:
+            raise
         except Exception as e:
-            print(f"Chat error: {str(e)}")
-            return "I apologize, but I'm having trouble processing your request. Please try rephrasing your question or check your API key configuration."
\ No newline at end of file
+            logger.error("Chat failed, returning fallback response", error=str(e))
+            FALLBACK_RESULTS.inc(service="chat", reason="llm_error")
+            return {"response": "I apologize, but I'm having trouble processing your request. Please try rephrasing your question or check your API key configuration."}
+
+    async def chat_stream(
+        self,
+        query: str,
+        context: str = "",
+        session_id: str = "",
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the chat response token by token
+
+        History is only updated once the stream completes; closing the
+        iterator early (client disconnect) closes the upstream stream.
+        Prompt metadata is written into `metadata` when one is passed.
+        A semantic cache hit is yielded as a single chunk.
+        """
+        partition = self._semantic_partition(query, context, session_id)
+        cached = self._semantic_lookup(query, partition)
+        if cached is not None:
+            response_text = cached.pop("response")
+            if metadata is not None:
+                metadata.update(cached)
+            yield response_text
+            self._remember(session_id, query, response_text)
+            return
+
+        with stage("chat", "build_prompt"):
+            prompt, prompt_metadata = self._build_prompt(query, context, session_id)
+        if metadata is not None:
+            metadata.update(prompt_metadata)
+        parts: List[str] = []
+        async with self.gateway.slot("interactive"):
+            started = time.perf_counter()
+            stream = self.llm.astream(prompt)
+            try:
+                async for chunk in stream:
+                    text = chunk.content if hasattr(chunk, 'content') else str(chunk)
+                    if text:
+                        if not parts:
+                            STAGE_SECONDS.observe(time.perf_counter() - started, service="chat", stage="llm_first_token")
+                        parts.append(text)
+                        yield text
+            finally:
+                await stream.aclose()
+                STAGE_SECONDS.observe(time.perf_counter() - started, service="chat", stage="llm_stream")
+
+        response_text = "".join(parts)
+        record_llm_tokens("chat", None, prompt, response_text)
+        self._remember(session_id, query, response_text)
+        if partition is not None and response_text:
+            self.semantic_cache.set(query, {"response": response_text, **prompt_metadata}, partition)
+
+
+_chat_service: Optional[CareerChatService] = None
+_chat_service_lock = threading.Lock()
+
+
+def get_chat_service() -> CareerChatService:
+    """Shared chat service, built on first use (or by the startup warm-up)"""
+    global _chat_service
+    if _chat_service is None:
+        with _chat_service_lock:
+            if _chat_service is None:
+                _chat_service = CareerChatService()
+    return _chat_service
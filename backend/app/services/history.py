@@ -0,0 +1,266 @@
+"""
+Chat History Store
+Session-keyed, bounded conversation history with idle eviction
+"""
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import sqlite3
+import threading
+import time
+
+
+Message = Dict[str, str]
+
+# A running summary of folded turns is stored as the session's first message
+SUMMARY_ROLE = "summary"
+
+
+def _message_bytes(message: Message) -> int:
+    return len(message["content"].encode('utf-8'))
+
+
+def split_summary(messages: List[Message]) -> Tuple[Optional[str], List[Message]]:
+    """Separate a session's running summary (if any) from its turns"""
+    if messages and messages[0]["role"] == SUMMARY_ROLE:
+        return messages[0]["content"], messages[1:]
+    return None, messages
+
+
+def _trim(messages: List[Message], max_messages: int, max_bytes: int) -> List[Message]:
+    """Drop the oldest messages until both caps are respected; the summary is kept outside the caps"""
+    summary, messages = split_summary(messages)
+    head = [{"role": SUMMARY_ROLE, "content": summary}] if summary is not None else []
+    return head + _trim_turns(messages, max_messages, max_bytes)
+
+
+def _trim_turns(messages: List[Message], max_messages: int, max_bytes: int) -> List[Message]:
+    messages = messages[-max_messages:] if max_messages > 0 else []
+    total = sum(_message_bytes(m) for m in messages)
+    while len(messages) > 1 and total > max_bytes:
+        total -= _message_bytes(messages.pop(0))
+    if messages and total > max_bytes:
+        # A single oversized message keeps its most recent text
+        content = messages[0]["content"].encode('utf-8')[-max_bytes:]
+        messages[0] = {"role": messages[0]["role"], "content": content.decode('utf-8', errors='ignore')}
+    return messages
+
+
+class HistoryStore:
+    """Interface for chat history backends"""
+
+    def get(self, session_id: str) -> List[Message]:
+        raise NotImplementedError
+
+    def append(self, session_id: str, messages: List[Message]) -> None:
+        raise NotImplementedError
+
+    def compact(self, session_id: str, folded: List[Message], summary: str) -> bool:
+        """
+        Replace the leading `folded` messages with a summary message
+
+        Returns False (and changes nothing) if the session no longer starts
+        with exactly those messages, e.g. it was trimmed or compacted since.
+        """
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class MemoryHistoryStore(HistoryStore):
+    """
+    Per-process LRU of sessions
+
+    Sessions idle for longer than `idle_ttl_seconds` are evicted, and the
+    least recently used session is dropped once `max_sessions` is reached.
+    """
+
+    def __init__(self, max_sessions: int = 1000, idle_ttl_seconds: float = 3600,
+                 max_messages: int = 10, max_bytes: int = 16384):
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, session_id: str) -> List[Message]:
+        with self._lock:
+            self._evict_idle()
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return []
+            # Reads count as activity (as in SQLiteHistoryStore) and keep the dict ordered by last_seen
+            self._sessions[session_id] = (time.time(), entry[1])
+            self._sessions.move_to_end(session_id)
+            return list(entry[1])
+
+    def append(self, session_id: str, messages: List[Message]) -> None:
+        with self._lock:
+            self._evict_idle()
+            _, existing = self._sessions.get(session_id, (0.0, []))
+            trimmed = _trim(existing + list(messages), self.max_messages, self.max_bytes)
+            self._sessions[session_id] = (time.time(), trimmed)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+
+    def compact(self, session_id: str, folded: List[Message], summary: str) -> bool:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None or entry[1][:len(folded)] != folded:
+                return False
+            last_seen, messages = entry
+            self._sessions[session_id] = (last_seen, [{"role": SUMMARY_ROLE, "content": summary}] + messages[len(folded):])
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._evict_idle()
+            messages = sum(len(m) for _, m in self._sessions.values())
+            content_bytes = sum(_message_bytes(msg) for _, m in self._sessions.values() for msg in m)
+            return {
+                "backend": "memory",
+                "sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "messages": messages,
+                "content_bytes": content_bytes,
+                "evictions": self.evictions,
+            }
+
+    def _evict_idle(self) -> None:
+        cutoff = time.time() - self.idle_ttl_seconds
+        # Oldest-touched sessions sit at the front of the OrderedDict
+        while self._sessions:
+            session_id, (last_seen, _) = next(iter(self._sessions.items()))
+            if last_seen >= cutoff:
+                break
+            del self._sessions[session_id]
+            self.evictions += 1
+
+
+class SQLiteHistoryStore(HistoryStore):
+    """
+    History shared through a local SQLite file
+
+    Lets several uvicorn workers on one host see the same sessions.
+    """
+
+    def __init__(self, db_path: str, max_sessions: int = 1000, idle_ttl_seconds: float = 3600,
+                 max_messages: int = 10, max_bytes: int = 16384):
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=5.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS chat_sessions (
+                session_id TEXT PRIMARY KEY,
+                last_seen REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS chat_messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_chat_messages_session ON chat_messages (session_id, id);
+            CREATE INDEX IF NOT EXISTS idx_chat_sessions_last_seen ON chat_sessions (last_seen);
+            """
+        )
+        self._db.commit()
+
+    def get(self, session_id: str) -> List[Message]:
+        with self._lock:
+            self._evict()
+            rows = self._db.execute(
+                "SELECT role, content FROM chat_messages WHERE session_id = ? ORDER BY id",
+                (session_id,)
+            ).fetchall()
+            if rows:
+                self._db.execute(
+                    "UPDATE chat_sessions SET last_seen = ? WHERE session_id = ?",
+                    (time.time(), session_id)
+                )
+                self._db.commit()
+            return [{"role": role, "content": content} for role, content in rows]
+
+    def append(self, session_id: str, messages: List[Message]) -> None:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT role, content FROM chat_messages WHERE session_id = ? ORDER BY id",
+                (session_id,)
+            ).fetchall()
+            existing = [{"role": role, "content": content} for role, content in rows]
+            trimmed = _trim(existing + list(messages), self.max_messages, self.max_bytes)
+            self._replace(session_id, trimmed, touch=True)
+            self._evict()
+
+    def compact(self, session_id: str, folded: List[Message], summary: str) -> bool:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT role, content FROM chat_messages WHERE session_id = ? ORDER BY id",
+                (session_id,)
+            ).fetchall()
+            messages = [{"role": role, "content": content} for role, content in rows]
+            if not messages or messages[:len(folded)] != folded:
+                return False
+            self._replace(session_id, [{"role": SUMMARY_ROLE, "content": summary}] + messages[len(folded):])
+            return True
+
+    def _replace(self, session_id: str, messages: List[Message], touch: bool = False) -> None:
+        with self._db:
+            self._db.execute("DELETE FROM chat_messages WHERE session_id = ?", (session_id,))
+            self._db.executemany(
+                "INSERT INTO chat_messages (session_id, role, content) VALUES (?, ?, ?)",
+                [(session_id, m["role"], m["content"]) for m in messages]
+            )
+            if touch:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO chat_sessions (session_id, last_seen) VALUES (?, ?)",
+                    (session_id, time.time())
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._evict()
+            sessions = self._db.execute("SELECT COUNT(*) FROM chat_sessions").fetchone()[0]
+            messages, content_bytes = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(CAST(content AS BLOB))), 0) FROM chat_messages"
+            ).fetchone()
+            return {
+                "backend": "sqlite",
+                "sessions": sessions,
+                "max_sessions": self.max_sessions,
+                "messages": messages,
+                "content_bytes": content_bytes,
+            }
+
+    def _evict(self) -> None:
+        cutoff = time.time() - self.idle_ttl_seconds
+        with self._db:
+            evicted = self._db.execute(
+                "DELETE FROM chat_sessions WHERE last_seen < ? OR session_id IN ("
+                "SELECT session_id FROM chat_sessions ORDER BY last_seen DESC LIMIT -1 OFFSET ?)",
+                (cutoff, self.max_sessions)
+            ).rowcount
+            if evicted:
+                self._db.execute(
+                    "DELETE FROM chat_messages WHERE session_id NOT IN (SELECT session_id FROM chat_sessions)"
+                )
+
+
+def create_history_store(backend: str, db_path: str = "", **limits) -> HistoryStore:
+    """Build the configured history backend"""
+    if backend == "memory":
+        return MemoryHistoryStore(**limits)
+    if backend == "sqlite":
+        if not db_path:
+            raise ValueError("CHAT_HISTORY_DB_PATH is required for the sqlite history backend")
+        return SQLiteHistoryStore(db_path, **limits)
+    raise ValueError(f"Unsupported chat history backend: {backend}")
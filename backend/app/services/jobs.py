@@ -0,0 +1,312 @@
+"""
+Analysis Job Queue
+Runs analyses in background workers with job state persisted in SQLite, so results outlive the HTTP request
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+
+from app.core.logger import logger
+from app.services.llm_gateway import LLMOverloadedError
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+
+class JobStore:
+    """
+    SQLite-backed job table
+
+    A running job holds a lease; if its process dies the lease expires and
+    another worker (or the restarted process) claims it again. Claims run in
+    an immediate transaction so several uvicorn workers can share one file.
+    Methods block and may be called from any thread.
+    """
+
+    def __init__(self, db_path: str, lease_seconds: float = 300):
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=5.0, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS analysis_jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                next_attempt_at REAL NOT NULL,
+                lease_expires_at REAL,
+                callback_url TEXT,
+                callback_error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_analysis_jobs_due ON analysis_jobs (status, next_attempt_at);
+            """
+        )
+
+    def create(self, payload: Dict[str, Any], max_attempts: int, callback_url: Optional[str] = None) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO analysis_jobs (id, status, payload, max_attempts, next_attempt_at, "
+                "callback_url, created_at, updated_at) VALUES (?, 'queued', ?, ?, ?, ?, ?, ?)",
+                (job_id, json.dumps(payload), max_attempts, now, callback_url, now, now)
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str, include_payload: bool = False) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM analysis_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row, include_payload) if row is not None else None
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Atomically take the oldest due job, or one whose lease expired
+
+        Blocking; workers call it from a thread. The write lock is only
+        taken once a plain read finds something to claim, so idle workers
+        polling an empty queue never contend for it.
+        """
+        now = time.time()
+        with self._lock:
+            candidate = self._db.execute(
+                "SELECT 1 FROM analysis_jobs WHERE "
+                "(status = 'queued' AND next_attempt_at <= ?) OR (status = 'running' AND lease_expires_at < ?) "
+                "LIMIT 1",
+                (now, now)
+            ).fetchone()
+            if candidate is None:
+                return None
+
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                # A job whose worker keeps dying mid-run must not be retried forever
+                self._db.execute(
+                    "UPDATE analysis_jobs SET status = 'failed', error = 'Worker stopped while running the job', "
+                    "lease_expires_at = NULL, updated_at = ? "
+                    "WHERE status = 'running' AND lease_expires_at < ? AND attempts >= max_attempts",
+                    (now, now)
+                )
+                # Re-read under the lock: another process may have claimed it meanwhile
+                row = self._db.execute(
+                    "SELECT id FROM analysis_jobs WHERE "
+                    "(status = 'queued' AND next_attempt_at <= ?) OR (status = 'running' AND lease_expires_at < ?) "
+                    "ORDER BY next_attempt_at LIMIT 1",
+                    (now, now)
+                ).fetchone()
+                if row is None:
+                    self._db.execute("COMMIT")
+                    return None
+                self._db.execute(
+                    "UPDATE analysis_jobs SET status = 'running', attempts = attempts + 1, "
+                    "lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                    (now + self.lease_seconds, now, row[0])
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return self.get(row[0], include_payload=True)
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        self._update(job_id, status="succeeded", result=json.dumps(result), error=None, lease_expires_at=None)
+
+    def retry(self, job_id: str, error: str, delay_seconds: float) -> None:
+        self._update(job_id, status="queued", error=error, lease_expires_at=None,
+                     next_attempt_at=time.time() + delay_seconds)
+
+    def release(self, job_id: str) -> None:
+        """Hand an interrupted job back without counting the attempt"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE analysis_jobs SET status = 'queued', attempts = MAX(0, attempts - 1), "
+                "lease_expires_at = NULL, next_attempt_at = ?, updated_at = ? WHERE id = ? AND status = 'running'",
+                (time.time(), time.time(), job_id)
+            )
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._update(job_id, status="failed", error=error, lease_expires_at=None)
+
+    def set_callback_error(self, job_id: str, error: Optional[str]) -> None:
+        self._update(job_id, callback_error=error)
+
+    def purge(self, older_than_seconds: float) -> int:
+        """Delete finished jobs last updated before the cutoff"""
+        with self._lock:
+            return self._db.execute(
+                "DELETE FROM analysis_jobs WHERE status IN ('succeeded', 'failed') AND updated_at < ?",
+                (time.time() - older_than_seconds,)
+            ).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM analysis_jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in JOB_STATUSES}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._db.execute(
+                f"UPDATE analysis_jobs SET {assignments} WHERE id = ?",
+                (*fields.values(), job_id)
+            )
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row, include_payload: bool) -> Dict[str, Any]:
+        job = {
+            "job_id": row["id"],
+            "status": row["status"],
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "attempts": row["attempts"],
+            "max_attempts": row["max_attempts"],
+            "callback_url": row["callback_url"],
+            "callback_error": row["callback_error"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+        if row["status"] == "queued" and row["next_attempt_at"] > time.time():
+            job["next_attempt_at"] = row["next_attempt_at"]
+        if include_payload:
+            job["payload"] = json.loads(row["payload"])
+        return job
+
+
+class AnalysisJobQueue:
+    """
+    Background workers that drain the JobStore
+
+    Each worker claims a job, runs `analyze(**payload)` and stores the
+    result. Failures, gateway rejections and fallback results are retried
+    with exponential backoff until `max_attempts`; then the job fails. When
+    a job finishes and has a callback URL, the job is POSTed to it.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        analyze: Callable[..., Awaitable[Dict[str, Any]]],
+        is_fallback: Callable[[Dict[str, Any]], bool],
+        workers: int = 2,
+        max_attempts: int = 3,
+        retry_base_seconds: float = 2,
+        poll_seconds: float = 1,
+        callback_hosts: Optional[List[str]] = None,
+        callback_timeout_seconds: float = 5
+    ):
+        self.store = store
+        self.analyze = analyze
+        self.is_fallback = is_fallback
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.poll_seconds = poll_seconds
+        self.callback_hosts = callback_hosts or []
+        self.callback_timeout_seconds = callback_timeout_seconds
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._running: Dict[asyncio.Task, str] = {}
+
+    def submit(self, payload: Dict[str, Any], callback_url: Optional[str] = None) -> Dict[str, Any]:
+        if callback_url:
+            self.check_callback_url(callback_url)
+        job = self.store.create(payload, self.max_attempts, callback_url)
+        self._wakeup.set()
+        return job
+
+    def check_callback_url(self, url: str) -> None:
+        """Only local (allow-listed) hosts may receive callbacks"""
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or parsed.hostname not in self.callback_hosts:
+            raise ValueError(f"callback_url host must be one of: {', '.join(self.callback_hosts) or 'none'}")
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel workers and requeue the jobs they were running"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for job_id in self._running.values():
+            self.store.release(job_id)
+        self._running.clear()
+        self._tasks = []
+
+    def stats(self) -> Dict[str, Any]:
+        return {"workers": len(self._tasks), **self.store.counts()}
+
+    async def _worker(self) -> None:
+        while True:
+            job = await asyncio.to_thread(self.store.claim)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            current = asyncio.current_task()
+            self._running[current] = job["job_id"]
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("Analysis job worker error", job_id=job["job_id"], error=str(e))
+            self._running.pop(current, None)
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        job_id = job["job_id"]
+        retry_after = 0.0
+        try:
+            result = await self.analyze(**job["payload"])
+            error = "LLM returned no usable analysis" if self.is_fallback(result) else None
+        except LLMOverloadedError as e:
+            result, error, retry_after = None, str(e), e.retry_after
+        except Exception as e:
+            result, error = None, str(e)
+
+        if error is None:
+            self.store.complete(job_id, result)
+            logger.info("Analysis job succeeded", job_id=job_id, attempts=job["attempts"])
+        elif job["attempts"] < job["max_attempts"]:
+            delay = max(retry_after, self.retry_base_seconds * 2 ** (job["attempts"] - 1))
+            self.store.retry(job_id, error, delay)
+            logger.warning("Analysis job failed, retrying", job_id=job_id, attempts=job["attempts"],
+                           retry_in_seconds=delay, error=error)
+            return
+        else:
+            self.store.fail(job_id, error)
+            logger.error("Analysis job failed permanently", job_id=job_id, attempts=job["attempts"], error=error)
+
+        if job["callback_url"]:
+            await self._notify(job_id, job["callback_url"])
+
+    async def _notify(self, job_id: str, url: str) -> None:
+        import httpx
+
+        job = self.store.get(job_id)
+        try:
+            async with httpx.AsyncClient(timeout=self.callback_timeout_seconds) as client:
+                response = await client.post(url, json=job)
+                response.raise_for_status()
+            self.store.set_callback_error(job_id, None)
+        except Exception as e:
+            logger.warning("Analysis job callback failed", job_id=job_id, url=url, error=str(e))
+            self.store.set_callback_error(job_id, str(e))
@@ -0,0 +1,175 @@
+"""
+LLM Gateway
+Shared admission control for LLM calls: bounded concurrency, a priority wait queue and fast rejection
+"""
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+import asyncio
+import heapq
+import itertools
+import time
+
+from app.core import config
+
+
+# Lower value is served first
+PRIORITIES = {
+    "interactive": 0,  # chat and single analyses a user is waiting on
+    "batch": 1,        # batch fan-out
+}
+
+
+class LLMOverloadedError(Exception):
+    """The gateway queue is full or the wait exceeded the maximum queue time"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMGateway:
+    """
+    Admission control shared by every service that calls the LLM
+
+    At most `max_concurrency` calls run at once. Further callers wait in a
+    priority queue (interactive ahead of batch) of at most `max_queue`
+    entries for up to `max_queue_seconds`; beyond that they are rejected
+    with LLMOverloadedError so the API can answer 429 immediately.
+    """
+
+    def __init__(self, max_concurrency: int = 8, max_queue: int = 32, max_queue_seconds: float = 10):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_queue_seconds = max_queue_seconds
+
+        self._active = 0
+        self._waiters: List[tuple] = []  # heap of (priority, seq, future)
+        self._sequence = itertools.count()
+
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._wait_times: Deque[float] = deque(maxlen=1000)
+        self._call_seconds = 5.0  # EWMA of slot hold time, seeds Retry-After
+
+    @asynccontextmanager
+    async def slot(self, priority: str = "interactive", timeout: Optional[float] = None) -> AsyncIterator[None]:
+        """Hold one concurrency slot for the duration of the block"""
+        await self.acquire(priority, timeout)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._call_seconds = 0.9 * self._call_seconds + 0.1 * (time.monotonic() - started)
+            self.release()
+
+    async def acquire(self, priority: str = "interactive", timeout: Optional[float] = None) -> None:
+        """
+        Take a slot, queueing for at most `max_queue_seconds`
+
+        A caller with its own deadline passes the time it has left as
+        `timeout` to wait less than that.
+        """
+        started = time.monotonic()
+        if self._active < self.max_concurrency and not self._waiters:
+            self._active += 1
+            self._admit(started)
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise LLMOverloadedError("LLM queue is full", self.retry_after())
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (PRIORITIES.get(priority, PRIORITIES["batch"]), next(self._sequence), future)
+        heapq.heappush(self._waiters, entry)
+        try:
+            wait = self.max_queue_seconds if timeout is None else max(0.0, min(timeout, self.max_queue_seconds))
+            await asyncio.wait_for(asyncio.shield(future), timeout=wait)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                # Granted in the same tick the wait expired; keep the slot
+                self._admit(started)
+                return
+            future.cancel()
+            self._remove(entry)
+            self.timed_out += 1
+            raise LLMOverloadedError("Timed out waiting for an LLM slot", self.retry_after())
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # Slot was handed over but the caller went away
+            else:
+                future.cancel()
+                self._remove(entry)
+            raise
+        self._admit(started)
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free right now (no queueing)"""
+        if self._active < self.max_concurrency and not self._waiters:
+            self._active += 1
+            self._admit(time.monotonic())
+            return True
+        return False
+
+    def release(self) -> None:
+        """Hand the slot to the highest-priority waiter, or free it"""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active -= 1
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait, from queue depth and call time"""
+        backlog = (len(self._waiters) + self._active) / max(1, self.max_concurrency)
+        return max(1, int(round(backlog * self._call_seconds)))
+
+    def stats(self) -> Dict[str, Any]:
+        waits = sorted(self._wait_times)
+        queued: Dict[str, int] = {name: 0 for name in PRIORITIES}
+        names = {value: name for name, value in PRIORITIES.items()}
+        for priority, _, future in self._waiters:
+            if not future.done():
+                queued[names[priority]] += 1
+        return {
+            "active": self._active,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": sum(queued.values()),
+            "queued_by_priority": queued,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "wait_seconds_avg": sum(waits) / len(waits) if waits else 0.0,
+            "wait_seconds_p95": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+            "wait_seconds_max": waits[-1] if waits else 0.0,
+        }
+
+    def _admit(self, started: float) -> None:
+        self.admitted += 1
+        self._wait_times.append(time.monotonic() - started)
+
+    def _remove(self, entry: tuple) -> None:
+        try:
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+        except ValueError:
+            pass
+
+
+_gateway = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Process-wide gateway shared by JobMatchAnalyzer and CareerChatService"""
+    global _gateway
+    if _gateway is None:
+        _gateway = LLMGateway(
+            max_concurrency=config.LLM_MAX_CONCURRENCY,
+            max_queue=config.LLM_MAX_QUEUE,
+            max_queue_seconds=config.LLM_MAX_QUEUE_SECONDS
+        )
+    return _gateway
@@ -0,0 +1,187 @@
+"""
+LLM JSON Output
+Pulls the JSON object out of a model reply that may be wrapped in markdown, prose, or cut off mid-generation
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import re
+
+from app.core.logger import logger
+
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_WHITESPACE = " \t\r\n"
+
+
+def _loads(text: str) -> Any:
+    """json.loads that forgives trailing commas, a common model slip"""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return json.loads(_TRAILING_COMMA.sub(r"\1", text))
+
+
+class IncrementalJSONParser:
+    """
+    Streaming parser for the first JSON object in a model reply
+
+    Text before the opening brace (prose, code fences) and after the
+    closing one is ignored. `feed` returns the top-level fields whose values
+    were completed by the chunk, so callers can act on them before the
+    generation ends. `result` returns the whole object; if the reply was cut
+    off, the object is closed after the last complete top-level field or
+    array element; if it is malformed, `malformed` is set and only the
+    top-level fields that parsed are kept.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.fields: Dict[str, Any] = {}
+        self.malformed = False
+        self._pos = 0
+        self._start = -1
+        self._end = -1
+        self._stack: List[str] = []
+        self._expect_key = False
+        self._in_string = False
+        self._escape = False
+        self._token_start = -1
+        self._scalar_start = -1
+        self._key: Optional[str] = None
+        self._value_start = -1
+        # Last point where the object can be closed: (index, open containers)
+        self._safe: Optional[Tuple[int, Tuple[str, ...]]] = None
+
+    @property
+    def complete(self) -> bool:
+        return self._end >= 0
+
+    def feed(self, chunk: str) -> Dict[str, Any]:
+        """Consume a chunk; returns the top-level fields it completed"""
+        self.text += chunk
+        completed: Dict[str, Any] = {}
+        text, stack = self.text, self._stack
+
+        for i in range(self._pos, len(text)):
+            if self._end >= 0:
+                break
+            char = text[i]
+            if self._start < 0:
+                if char == "{":
+                    self._start = i
+                    stack.append("{")
+                    self._expect_key = True
+                    self._safe = (i + 1, ("{",))
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if stack[-1] == "{" and self._expect_key:
+                        if len(stack) == 1:
+                            self._key = json.loads(text[self._token_start:i + 1])
+                    else:
+                        self._value_done(i + 1, completed)
+                continue
+
+            if self._scalar_start >= 0 and (char in _WHITESPACE or char in ",]}"):
+                self._scalar_start = -1
+                self._value_done(i, completed)
+
+            if char == '"':
+                self._in_string = True
+                self._token_start = i
+            elif char in "{[":
+                stack.append(char)
+                self._expect_key = char == "{"
+            elif char in "}]":
+                stack.pop()
+                if not stack:
+                    self._end = i + 1
+                    break
+                self._expect_key = False
+                self._value_done(i + 1, completed)
+            elif char == ":":
+                self._expect_key = False
+                if len(stack) == 1:
+                    self._value_start = i + 1
+            elif char == ",":
+                self._expect_key = stack[-1] == "{"
+            elif char not in _WHITESPACE and self._scalar_start < 0:
+                self._scalar_start = i
+
+        self._pos = len(text)
+        return completed
+
+    def _value_done(self, end: int, completed: Dict[str, Any]) -> None:
+        stack = self._stack
+        if len(stack) == 1 or stack[-1] == "[":
+            self._safe = (end, tuple(stack))
+        if len(stack) == 1 and self._key is not None:
+            try:
+                value = _loads(self.text[self._value_start:end])
+            except json.JSONDecodeError:
+                return
+            finally:
+                key, self._key = self._key, None
+            self.fields[key] = value
+            completed[key] = value
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        """The parsed object, repaired if the reply was truncated, or None"""
+        if self._start < 0:
+            return None
+        if self._end >= 0:
+            candidate = self.text[self._start:self._end]
+        elif self._safe is not None:
+            index, open_containers = self._safe
+            closers = "".join("}" if c == "{" else "]" for c in reversed(open_containers))
+            candidate = _TRAILING_COMMA.sub(r"\1", self.text[self._start:index].rstrip().rstrip(",") + closers)
+        else:
+            return None
+        try:
+            parsed = _loads(candidate)
+        except json.JSONDecodeError:
+            # Malformed beyond a trailing comma: keep whatever fields did parse
+            self.malformed = True
+            return dict(self.fields) or None
+        return parsed if isinstance(parsed, dict) else None
+
+
+def repair_json(text: str) -> Optional[Dict[str, Any]]:
+    """Best-effort object from a complete, truncated or slightly malformed reply"""
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    return parser.result()
+
+
+def extract_json(text: str) -> Optional[Dict[str, Any]]:
+    """Extract the outermost JSON object from an LLM response, or None"""
+    try:
+        text = re.sub(r'```json\s*', '', text)
+        text = re.sub(r'```\s*', '', text)
+
+        start = text.find("{")
+        end = text.rfind("}") + 1
+
+        if start != -1 and end > start:
+            return json.loads(text[start:end])
+    except json.JSONDecodeError as e:
+        repaired = repair_json(text)
+        if repaired:
+            logger.warning("Repaired malformed LLM JSON", error=str(e), fields=len(repaired))
+            return repaired
+        logger.warning("LLM response is not valid JSON", error=str(e))
+        return None
+    except Exception as e:
+        logger.warning("JSON extraction failed", error=str(e))
+        return None
+
+    # No closing brace at all: the reply was cut off
+    repaired = repair_json(text)
+    if repaired:
+        logger.warning("Repaired truncated LLM JSON", fields=len(repaired))
+    return repaired
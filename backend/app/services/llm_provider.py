@@ -0,0 +1,88 @@
+"""
+LLM Provider
+Builds the chat model selected by configuration: the shared Gemini client or a local stub
+"""
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type
+import json
+
+from pydantic import BaseModel
+
+from app.core import config
+
+if TYPE_CHECKING:
+    from langchain_core.language_models.chat_models import BaseChatModel
+
+
+def _build_gemini() -> "BaseChatModel":
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(
+        model=config.LLM_MODEL,
+        google_api_key=config.GOOGLE_API_KEY
+    )
+
+
+def _build_stub() -> "BaseChatModel":
+    # LangChain is imported with the first model, not with this module
+    from app.services.stub_llm import StubChatModel
+
+    responses: List[Dict[str, str]] = []
+    if config.LLM_STUB_RESPONSES_PATH:
+        with open(config.LLM_STUB_RESPONSES_PATH, encoding="utf-8") as f:
+            responses = json.load(f)
+    return StubChatModel(
+        latency_ms=config.LLM_STUB_LATENCY_MS,
+        latency_jitter_ms=config.LLM_STUB_LATENCY_JITTER_MS,
+        latency_distribution=config.LLM_STUB_LATENCY_DISTRIBUTION,
+        tokens_per_second=config.LLM_STUB_TOKENS_PER_SECOND,
+        responses=responses,
+        seed=config.LLM_STUB_SEED
+    )
+
+
+def _gemini_json_output(schema: Dict[str, Any]) -> Dict[str, Any]:
+    return {"response_mime_type": "application/json", "response_json_schema": schema}
+
+
+PROVIDERS = {
+    "gemini": _build_gemini,
+    "stub": _build_stub,
+}
+
+# Call options that constrain replies to a JSON schema; other providers rely on the prompt alone
+STRUCTURED_OUTPUT = {
+    "gemini": _gemini_json_output,
+}
+
+_base_model: Optional["BaseChatModel"] = None
+
+
+def get_base_model() -> "BaseChatModel":
+    """The single process-wide client; services share its connection pool"""
+    global _base_model
+    if _base_model is None:
+        builder = PROVIDERS.get(config.LLM_PROVIDER)
+        if builder is None:
+            raise ValueError(f"Unsupported LLM provider: {config.LLM_PROVIDER}")
+        _base_model = builder()
+    return _base_model
+
+
+def get_chat_model(temperature: float):
+    """Shared client bound to a per-service sampling temperature"""
+    return get_base_model().bind(temperature=temperature)
+
+
+def get_structured_chat_model(temperature: float, schema: Type[BaseModel]):
+    """
+    Shared client bound to a temperature and, where the provider supports
+    it, to JSON output matching `schema`
+    """
+    json_output = STRUCTURED_OUTPUT.get(config.LLM_PROVIDER)
+    options = json_output(schema.model_json_schema()) if json_output else {}
+    return get_base_model().bind(temperature=temperature, **options)
+
+
+def provider_model_name() -> str:
+    """Identifies the provider and model, e.g. for cache keys"""
+    return f"{config.LLM_PROVIDER}:{config.LLM_MODEL}"
@@ -0,0 +1,230 @@
+"""
+Resume Parser Pool
+Runs resume parsing in worker processes so large documents never block the event loop
+"""
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Set, Tuple
+import asyncio
+import signal
+
+from app.core.metrics import capture_stages, replay_stages, stage
+from app.services.resume_parser import Source, count_pdf_pages, extract_text_from_pdf, parse_resume_file
+
+try:
+    import resource
+except ImportError:  # Windows: no CPU rlimits, wall-clock limit still applies
+    resource = None
+
+
+class ResumeParseError(Exception):
+    """The document could not be parsed (malformed, unsupported or too slow)"""
+
+
+class ResumeTooLargeError(ResumeParseError):
+    """The upload exceeds the configured size limit"""
+
+
+class ResumeParseTimeout(ResumeParseError):
+    """Parsing exceeded its CPU-time or wall-clock limit"""
+
+
+def _raise_timeout(signum, frame):
+    raise ResumeParseTimeout("Resume parsing exceeded its time limit")
+
+
+def _run_with_limits(fn: Callable[..., Any], args: tuple, cpu_seconds: float,
+                     wall_seconds: float) -> Tuple[Any, List[Tuple[str, str, float]]]:
+    """
+    Worker-side entry point
+
+    Arms a CPU-time rlimit and a wall-clock timer whose signals raise inside
+    the parser, so a pathological file fails fast and the worker survives.
+    Returns fn's result plus the stage timings recorded in this process.
+    """
+    previous_cpu_limit = None
+    if resource is not None and hasattr(signal, "SIGXCPU"):
+        signal.signal(signal.SIGXCPU, _raise_timeout)
+        previous_cpu_limit = resource.getrlimit(resource.RLIMIT_CPU)
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        used = int(usage.ru_utime + usage.ru_stime)
+        resource.setrlimit(resource.RLIMIT_CPU, (used + max(1, int(cpu_seconds)), previous_cpu_limit[1]))
+    if hasattr(signal, "setitimer"):
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, wall_seconds)
+
+    try:
+        with capture_stages() as timings:
+            result = fn(*args)
+        return result, timings
+    finally:
+        if hasattr(signal, "setitimer"):
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        if previous_cpu_limit is not None:
+            resource.setrlimit(resource.RLIMIT_CPU, previous_cpu_limit)
+
+
+class ResumeParserPool:
+    """
+    Bounded process pool for `parse_resume_file`
+
+    At most `max_concurrent` parses are in flight; each worker task is
+    limited to `cpu_seconds` of CPU time and `timeout_seconds` of wall-clock
+    time. PDFs of at least `parallel_min_pages` pages are split into page
+    ranges extracted by several workers at once. Extraction stops once
+    `max_chars` characters were collected.
+
+    No more tasks than workers are handed to the executor, so a task's
+    timeout only counts time it actually ran, never time queued behind
+    others. A task that outlives even the grace period is written off but
+    left running; the pool is only replaced (killing every worker) once no
+    healthy task is left in flight.
+    """
+
+    def __init__(self, max_workers: int = 2, max_concurrent: int = 4, max_bytes: int = 5 * 1024 * 1024,
+                 cpu_seconds: float = 10, timeout_seconds: float = 15, max_chars: int = 100_000,
+                 parallel_min_pages: int = 8):
+        self.max_workers = max_workers
+        self.max_bytes = max_bytes
+        self.cpu_seconds = cpu_seconds
+        self.timeout_seconds = timeout_seconds
+        self.max_chars = max_chars
+        self.parallel_min_pages = parallel_min_pages
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._worker_slots = asyncio.Semaphore(max_workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._inflight: Set[Future] = set()
+        self._stuck: Set[Future] = set()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _reset_executor(self) -> None:
+        """Drop a broken or wedged pool; the next parse starts a fresh one"""
+        if self._executor is not None:
+            for process in list(getattr(self._executor, "_processes", {}).values()):
+                process.kill()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._stuck.clear()
+
+    def _task_done(self, future: Future) -> None:
+        """Executor task finished (or was killed): free its worker slot"""
+        if future in self._inflight:
+            self._inflight.discard(future)
+            self._stuck.discard(future)
+            self._worker_slots.release()
+            self._reset_if_wedged()
+
+    def _reset_if_wedged(self) -> None:
+        """Replace the pool once everything still running in it is stuck"""
+        if self._stuck and self._stuck == self._inflight:
+            self._reset_executor()
+
+    def check_size(self, size: int) -> None:
+        """Raise ResumeTooLargeError if an upload of `size` bytes is over the limit"""
+        if size > self.max_bytes:
+            limit = f"{self.max_bytes / (1024 * 1024):.1f}MB" if self.max_bytes >= 1024 * 1024 else f"{self.max_bytes} bytes"
+            raise ResumeTooLargeError(f"File exceeds the {limit} limit")
+
+    async def parse(self, content: Source, content_type: str) -> str:
+        """
+        Parse a resume (bytes or the path of a spooled upload) in worker processes
+        """
+        if isinstance(content, (bytes, bytearray)):
+            self.check_size(len(content))
+
+        async with self._semaphore:
+            if content_type == "application/pdf" and self.max_workers > 1:
+                pages = await self._submit(count_pdf_pages, content)
+                if pages >= self.parallel_min_pages:
+                    return await self._parse_pdf_parallel(content, pages)
+            return await self._submit(parse_resume_file, content, content_type, self.max_chars)
+
+    async def _parse_pdf_parallel(self, content: Source, pages: int) -> str:
+        """Extract page ranges concurrently; stop scheduling once the character budget is met"""
+        per_task = -(-pages // self.max_workers)
+        ranges = [(start, min(pages, start + per_task)) for start in range(0, pages, per_task)]
+        tasks = [
+            asyncio.ensure_future(self._submit(extract_text_from_pdf, content, self.max_chars, start, end))
+            for start, end in ranges
+        ]
+        parts: List[str] = []
+        collected = 0
+        try:
+            # Ranges are joined in page order
+            for task in tasks:
+                text = await task
+                if text:
+                    parts.append(text)
+                    collected += len(text)
+                if collected >= self.max_chars:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+        return "\n".join(parts)[:self.max_chars]
+
+    async def _submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) in a worker under the CPU and wall-clock limits"""
+        loop = asyncio.get_running_loop()
+        # Taken before submitting and only given back when the worker is done with the task
+        await self._worker_slots.acquire()
+        executor = self._get_executor()
+        try:
+            future = executor.submit(
+                _run_with_limits,
+                fn,
+                args,
+                self.cpu_seconds,
+                self.timeout_seconds
+            )
+        except BaseException:
+            self._worker_slots.release()
+            raise
+        self._inflight.add(future)
+
+        def done_callback(done: Future) -> None:
+            # Runs in the executor's thread; the loop may already be closed at shutdown
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._task_done, done)
+
+        future.add_done_callback(done_callback)
+        waiter = asyncio.wrap_future(future)
+        # A task written off as stuck may still fail later, with nobody awaiting it
+        waiter.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+        try:
+            # Grace period on top of the in-worker timer for a worker stuck in C code
+            with stage("resume_parser", "worker_roundtrip"):
+                result, timings = await asyncio.wait_for(
+                    asyncio.shield(waiter),
+                    timeout=self.timeout_seconds + 2
+                )
+            replay_stages(timings)
+            return result
+        except asyncio.TimeoutError:
+            # Other workers keep going; the pool is replaced once only stuck tasks remain
+            self._stuck.add(future)
+            self._reset_if_wedged()
+            raise ResumeParseTimeout("Resume parsing exceeded its time limit")
+        except BrokenProcessPool:
+            # Tasks of a pool that was already replaced must not tear down its successor
+            if self._executor is executor:
+                self._reset_executor()
+            raise ResumeParseError("Resume parser worker crashed")
+        except ResumeParseError:
+            raise
+        except Exception as e:
+            raise ResumeParseError(str(e))
+        finally:
+            if not future.done():
+                # Cancelled or timed out: drop it if it never started; a running task keeps its slot
+                future.cancel()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,187 @@
+"""
+Prompt Budgeting
+Fits resumes, job descriptions and chat context into per-field token budgets, cutting low-value sections first
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+from app.services.tokens import CHARS_PER_TOKEN, estimate_tokens
+
+
+# Higher priority survives longer. The first keyword found in a heading decides.
+SECTION_PRIORITIES = {
+    "resume": [
+        (("skill", "technolog", "tech stack", "competenc", "tools"), 5),
+        (("experience", "employment", "work history", "career history"), 5),
+        (("project",), 4),
+        (("summary", "profile", "objective", "about"), 3),
+        (("certification", "certificate", "license"), 3),
+        (("education", "academic", "qualification"), 3),
+        (("achievement", "award", "publication", "accomplishment"), 2),
+        (("volunteer", "leadership", "activit"), 2),
+        (("language",), 1),
+        (("interest", "hobb", "personal", "declaration"), 0),
+        (("reference", "referee"), 0),
+    ],
+    "job_description": [
+        (("requirement", "qualification", "must have", "must-have", "skill", "what you bring",
+          "what we're looking for", "what we are looking for", "you have"), 5),
+        (("responsibilit", "what you'll do", "what you will do", "the role", "duties", "you will"), 4),
+        (("nice to have", "nice-to-have", "preferred", "bonus", "plus"), 3),
+        (("about the team", "team"), 2),
+        (("about us", "about the company", "who we are", "our mission", "company"), 1),
+        (("benefit", "perk", "compensation", "salary", "we offer", "why join"), 1),
+        (("equal opportunity", "eeo", "diversity", "accommodation", "privacy", "how to apply",
+          "application process", "disclaimer"), 0),
+    ],
+}
+DEFAULT_PRIORITY = 3
+# Text before the first heading: contact details, job title, intro
+PREAMBLE_PRIORITY = 4
+
+HEADING_PATTERN = re.compile(r"^\s*(?:#{1,4}\s*)?([A-Za-z][A-Za-z0-9 &/'’,\-()]{1,48}?)\s*:?\s*$")
+TRUNCATION_MARKER = "[...]"
+
+
+@dataclass
+class Section:
+    heading: str
+    lines: List[str]
+    priority: int
+
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+def _is_heading(line: str) -> bool:
+    match = HEADING_PATTERN.match(line)
+    if not match:
+        return False
+    words = match.group(1).split()
+    if len(words) > 6:
+        return False
+    # ALL-CAPS lines, "Title Case:" lines and markdown headings
+    stripped = line.strip()
+    return (
+        stripped.isupper()
+        or stripped.startswith("#")
+        or (stripped.endswith(":") and all(w[0].isupper() or not w[0].isalpha() for w in words))
+    )
+
+
+def section_priority(heading: str, kind: str) -> int:
+    lowered = heading.lower()
+    for keywords, priority in SECTION_PRIORITIES.get(kind, []):
+        if any(keyword in lowered for keyword in keywords):
+            return priority
+    return DEFAULT_PRIORITY
+
+
+def split_sections(text: str, kind: str) -> List[Section]:
+    """Split text at heading lines; the heading is kept as the section's first line"""
+    sections = [Section(heading="", lines=[], priority=PREAMBLE_PRIORITY)]
+    for line in text.split("\n"):
+        if line.strip() and _is_heading(line):
+            heading = line.strip().strip("#: ").strip()
+            sections.append(Section(heading=heading, lines=[line], priority=section_priority(heading, kind)))
+        else:
+            sections[-1].lines.append(line)
+    return [section for section in sections if section.heading or any(l.strip() for l in section.lines)]
+
+
+def fit_to_budget(text: str, max_tokens: int, kind: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Shrink `text` to at most `max_tokens` tokens
+
+    Whole sections are dropped lowest priority first (later sections first
+    among equals). If the rest is still too long, the lowest-priority
+    remaining sections lose lines from their end. Returns the text and a
+    report of what was cut, or None when the text already fits.
+    """
+    original_tokens = estimate_tokens(text)
+    if original_tokens <= max_tokens:
+        return text, None
+
+    sections = split_sections(text, kind)
+    dropped: List[str] = []
+    truncated: List[str] = []
+
+    def total() -> int:
+        # +1 per section for the joining newline
+        return sum(estimate_tokens(s.text()) + 1 for s in sections)
+
+    # Lowest priority first; among equals, later sections go first
+    order = [s for _, s in sorted(enumerate(sections), key=lambda item: (item[1].priority, -item[0]))]
+
+    # Never drop the highest-priority content wholesale
+    keep_floor = max((s.priority for s in sections), default=0)
+    for section in order:
+        if total() <= max_tokens:
+            break
+        if section.priority >= keep_floor:
+            break
+        sections.remove(section)
+        dropped.append(section.heading or "(preamble)")
+
+    for section in order:
+        if section not in sections:
+            continue
+        over = total() - max_tokens
+        if over <= 0:
+            break
+        body = section.lines[1:] if section.heading else section.lines
+        removed = False
+        while body and over > 0:
+            line = body.pop()
+            cost = estimate_tokens(line) + 1
+            if cost > over + 1:
+                # Long line (or unstructured text): keep its head instead of losing all of it
+                body.append(line[:len(line) - (over + 1) * CHARS_PER_TOKEN].rstrip())
+                over = 0
+            else:
+                over -= cost
+            removed = True
+        if removed:
+            section.lines = ([section.lines[0]] if section.heading else []) + body + [TRUNCATION_MARKER]
+            truncated.append(section.heading or "(preamble)")
+
+    result = "\n".join(s.text() for s in sections)
+    # Unstructured text (no headings or line breaks): hard cut
+    if estimate_tokens(result) > max_tokens:
+        keep_chars = max(0, max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER) - 1)
+        result = result[:keep_chars].rstrip() + "\n" + TRUNCATION_MARKER
+        if not truncated:
+            truncated.append("(text)")
+
+    return result, {
+        "original_tokens": original_tokens,
+        "final_tokens": estimate_tokens(result),
+        "dropped_sections": list(dict.fromkeys(dropped)),
+        "truncated_sections": list(dict.fromkeys(truncated)),
+    }
+
+
+class PromptBudget:
+    """
+    Per-field token budgets for one prompt
+
+    `fit` shrinks a field to its budget and remembers what it cut;
+    `report` lists those cuts for the response metadata.
+    """
+
+    def __init__(self, budgets: Dict[str, int]):
+        self.budgets = budgets
+        self._cuts: List[Dict[str, Any]] = []
+
+    def fit(self, field: str, text: str, kind: str = "") -> str:
+        budget = self.budgets.get(field)
+        if not text or budget is None or budget <= 0:
+            return text
+        fitted, cut = fit_to_budget(text, budget, kind or field)
+        if cut is not None:
+            self._cuts.append({"field": field, "budget_tokens": budget, **cut})
+        return fitted
+
+    def report(self) -> List[Dict[str, Any]]:
+        return list(self._cuts)
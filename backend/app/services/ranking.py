@@ -0,0 +1,138 @@
+"""
+Candidate Ranking
+Stored resume corpus with an incremental index that shortlists candidates for a JD before any LLM call
+"""
+from typing import Any, Dict, List, Optional
+import heapq
+import json
+import sqlite3
+import threading
+import time
+
+from app.services.retrieval import IncrementalBM25Index
+from app.services.skills import get_skill_extractor
+
+# Prefilter score = SKILL_WEIGHT * weighted skill coverage + (1 - SKILL_WEIGHT) * relative BM25
+SKILL_WEIGHT = 0.7
+
+
+class ResumeCorpus:
+    """
+    Resumes available for ranking, persisted in SQLite and indexed in memory
+
+    Each resume is indexed twice: BM25 postings over its words and the set
+    of canonical skills found by the SkillExtractor. Adding or removing a
+    resume only touches that resume's entries; the index is rebuilt from
+    the table once at startup. Without `db_path` the corpus lives in memory.
+    """
+
+    def __init__(self, db_path: str = ""):
+        self.persistent = bool(db_path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path or ":memory:", check_same_thread=False, timeout=5.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS resume_corpus ("
+            "resume_id TEXT PRIMARY KEY, name TEXT NOT NULL, text TEXT NOT NULL, "
+            "skills TEXT NOT NULL, added_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+        self.index = IncrementalBM25Index()
+        self._skills: Dict[str, List[str]] = {}
+        self._skill_postings: Dict[str, set] = {}
+        self._names: Dict[str, str] = {}
+        for resume_id, name, text, skills in self._db.execute(
+            "SELECT resume_id, name, text, skills FROM resume_corpus"
+        ):
+            self._index(resume_id, name, text, json.loads(skills))
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def add(self, resume_id: str, text: str, name: str = "") -> Dict[str, Any]:
+        """Store and index a resume; re-adding an id replaces it"""
+        skills = list(get_skill_extractor().extract(text))
+        name = name or resume_id[:12]
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO resume_corpus (resume_id, name, text, skills, added_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (resume_id, name, text, json.dumps(skills), time.time())
+            )
+            self._db.commit()
+            self._unindex(resume_id)
+            self._index(resume_id, name, text, skills)
+        return {"resume_id": resume_id, "name": name, "skills": skills}
+
+    def remove(self, resume_id: str) -> bool:
+        with self._lock:
+            self._db.execute("DELETE FROM resume_corpus WHERE resume_id = ?", (resume_id,))
+            self._db.commit()
+            return self._unindex(resume_id)
+
+    def get_text(self, resume_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT text FROM resume_corpus WHERE resume_id = ?", (resume_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def shortlist(self, job_description: str, top_k: int) -> List[Dict[str, Any]]:
+        """
+        Best `top_k` resumes for a JD by skill coverage and BM25, best first
+
+        Skills the JD mentions more than once count double, as in the fast
+        analysis mode. Only resumes sharing a word or skill with the JD are scored.
+        """
+        required = get_skill_extractor().extract(job_description)
+        weights = {skill: 2 if count > 1 else 1 for skill, count in required.items()}
+        total_weight = sum(weights.values())
+
+        with self._lock:
+            coverage: Dict[str, float] = {}
+            for skill, weight in weights.items():
+                for resume_id in self._skill_postings.get(skill, ()):
+                    coverage[resume_id] = coverage.get(resume_id, 0) + weight
+            lexical = self.index.scores(job_description)
+
+            best_lexical = max(lexical.values(), default=0.0) or 1.0
+            skill_weight = SKILL_WEIGHT / total_weight if total_weight else 0.0
+            lexical_weight = (1 - SKILL_WEIGHT if total_weight else 1.0) / best_lexical
+            scores = {
+                resume_id: skill_weight * coverage.get(resume_id, 0) + lexical_weight * lexical.get(resume_id, 0.0)
+                for resume_id in coverage.keys() | lexical.keys()
+            }
+            best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+            return [
+                {
+                    "resume_id": resume_id,
+                    "name": self._names[resume_id],
+                    "prefilter_score": round(10 * score, 2),
+                    "skills_matched": [skill for skill in weights if skill in self._skills[resume_id]],
+                }
+                for resume_id, score in best
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "resumes": len(self.index),
+            "distinct_skills": len(self._skill_postings),
+            "persistent": self.persistent,
+        }
+
+    def _index(self, resume_id: str, name: str, text: str, skills: List[str]) -> None:
+        self.index.add(resume_id, text)
+        self._skills[resume_id] = skills
+        self._names[resume_id] = name
+        for skill in skills:
+            self._skill_postings.setdefault(skill, set()).add(resume_id)
+
+    def _unindex(self, resume_id: str) -> bool:
+        self._names.pop(resume_id, None)
+        for skill in self._skills.pop(resume_id, []):
+            postings = self._skill_postings[skill]
+            postings.discard(resume_id)
+            if not postings:
+                del self._skill_postings[skill]
+        return self.index.remove(resume_id)
@@ -0,0 +1,159 @@
+"""
+Job Requirement Extraction
+Turns a raw job description into compact structured requirements once, cached by JD hash
+"""
+from typing import Any, Dict, List, Optional
+import copy
+
+from app.core import config
+from app.core.logger import logger
+from app.core.metrics import FALLBACK_RESULTS, record_llm_tokens, stage
+from app.services.cache import ResultCache, make_cache_key
+from app.services.llm_gateway import LLMOverloadedError, get_llm_gateway
+from app.services.llm_json import extract_json
+from app.services.llm_provider import get_chat_model, provider_model_name
+from app.services.prompt_budget import PromptBudget
+from app.services.singleflight import SingleFlight
+from app.services.tokens import estimate_tokens
+
+# Bump whenever requirements_prompt changes
+REQUIREMENTS_PROMPT_VERSION = "1"
+
+MAX_ITEMS = 12
+
+
+class RequirementExtractor:
+    """
+    Extracts must-have / nice-to-have skills, seniority and years of experience
+
+    Results are cached by JD content hash and concurrent requests for the
+    same JD share one LLM call, so screening many resumes against one JD
+    pays for the extraction once.
+    """
+
+    def __init__(self):
+        self.model_name = provider_model_name()
+        self.llm = get_chat_model(temperature=0.0)
+        self.cache = ResultCache(
+            max_entries=config.JD_REQUIREMENTS_CACHE_MAX_ENTRIES,
+            ttl_seconds=config.JD_REQUIREMENTS_CACHE_TTL_SECONDS,
+            db_path=config.JD_REQUIREMENTS_CACHE_DB_PATH,
+            max_disk_entries=config.JD_REQUIREMENTS_CACHE_DB_MAX_ENTRIES
+        )
+        self.inflight = SingleFlight()
+        self.gateway = get_llm_gateway()
+
+        from langchain_core.prompts import PromptTemplate
+
+        self.requirements_prompt = PromptTemplate(
+            input_variables=["job_description"],
+            template="""You are a technical recruiter. Extract the hiring requirements from this job description.
+
+JOB DESCRIPTION:
+{job_description}
+
+Return ONLY a valid JSON object with this exact structure (no markdown, no code blocks, no explanations):
+
+{{
+  "title": "Senior Backend Engineer",
+  "seniority": "senior",
+  "min_years_experience": 5,
+  "must_have": ["Python", "PostgreSQL", "REST API design"],
+  "nice_to_have": ["Kubernetes", "Terraform"],
+  "responsibilities": ["Own backend services in production", "Mentor junior engineers"],
+  "other_requirements": ["BS in Computer Science or equivalent"]
+}}
+
+Use "intern", "junior", "mid", "senior", "lead" or "unspecified" for seniority and null when years are not stated. Keep every list item short."""
+        )
+
+    def cached(self, job_description: str) -> Optional[Dict[str, Any]]:
+        """Requirements for a JD that was already extracted, without calling the LLM"""
+        cached = self.cache.get(self._cache_key(job_description))
+        return copy.deepcopy(cached) if cached is not None else None
+
+    async def extract(self, job_description: str, priority: str = "interactive") -> Optional[Dict[str, Any]]:
+        """Structured requirements, or None if extraction failed (callers fall back to the raw JD)"""
+        cache_key = self._cache_key(job_description)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        result = await self.inflight.do(cache_key, lambda: self._run_extraction(job_description, cache_key, priority))
+        return copy.deepcopy(result)
+
+    async def _run_extraction(self, job_description: str, cache_key: str, priority: str) -> Optional[Dict[str, Any]]:
+        try:
+            budget = PromptBudget({"job_description": config.ANALYZE_JD_TOKEN_BUDGET})
+            prompt_text = self.requirements_prompt.format(
+                job_description=budget.fit("job_description", job_description)
+            )
+            async with self.gateway.slot(priority):
+                with stage("requirements", "llm_call"):
+                    response = await self.llm.ainvoke(prompt_text)
+            result_text = response.content if hasattr(response, 'content') else str(response)
+            record_llm_tokens("requirements", response, prompt_text, result_text)
+
+            parsed = extract_json(result_text)
+            requirements = self._validate(parsed) if parsed else None
+        except LLMOverloadedError:
+            raise
+        except Exception as e:
+            logger.error("Requirement extraction failed", error=str(e))
+            requirements = None
+
+        if requirements is None:
+            FALLBACK_RESULTS.inc(service="requirements", reason="invalid_json")
+            return None
+        self.cache.set(cache_key, copy.deepcopy(requirements))
+        logger.debug(
+            "Extracted JD requirements",
+            jd_tokens=estimate_tokens(job_description),
+            compact_tokens=estimate_tokens(format_requirements(requirements))
+        )
+        return requirements
+
+    def _validate(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        def string_list(value: Any) -> List[str]:
+            if not isinstance(value, list):
+                return []
+            return [str(item).strip() for item in value if str(item).strip()][:MAX_ITEMS]
+
+        years = data.get("min_years_experience")
+        try:
+            years = float(years) if years is not None else None
+        except (TypeError, ValueError):
+            years = None
+
+        requirements = {
+            "title": str(data.get("title") or "").strip(),
+            "seniority": str(data.get("seniority") or "unspecified").strip().lower(),
+            "min_years_experience": years,
+            "must_have": string_list(data.get("must_have")),
+            "nice_to_have": string_list(data.get("nice_to_have")),
+            "responsibilities": string_list(data.get("responsibilities")),
+            "other_requirements": string_list(data.get("other_requirements")),
+        }
+        # Nothing usable extracted: the raw JD is the better prompt input
+        if not requirements["must_have"] and not requirements["nice_to_have"]:
+            return None
+        return requirements
+
+    def _cache_key(self, job_description: str) -> str:
+        return make_cache_key(job_description, self.model_name, REQUIREMENTS_PROMPT_VERSION)
+
+
+def format_requirements(requirements: Dict[str, Any]) -> str:
+    """Compact prompt text for extracted requirements"""
+    years = requirements.get("min_years_experience")
+    lines = [
+        f"Role: {requirements.get('title') or 'unspecified'}",
+        f"Seniority: {requirements.get('seniority') or 'unspecified'}",
+        f"Minimum years of experience: {years:g}" if years is not None else "Minimum years of experience: not stated",
+        f"Must-have: {', '.join(requirements.get('must_have') or []) or 'none stated'}",
+        f"Nice-to-have: {', '.join(requirements.get('nice_to_have') or []) or 'none stated'}",
+    ]
+    if requirements.get("responsibilities"):
+        lines.append(f"Responsibilities: {'; '.join(requirements['responsibilities'])}")
+    if requirements.get("other_requirements"):
+        lines.append(f"Other: {'; '.join(requirements['other_requirements'])}")
+    return "\n".join(lines)
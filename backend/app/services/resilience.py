@@ -0,0 +1,238 @@
+"""
+LLM Call Resilience
+Deadlines, hedged attempts and a circuit breaker around provider calls
+"""
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+import asyncio
+import time
+
+from app.core.logger import logger
+
+T = TypeVar("T")
+
+BREAKER_STATES = ("closed", "open", "half_open")
+
+
+class CircuitOpenError(Exception):
+    """The provider is failing; calls are short-circuited until the breaker half-opens"""
+
+
+class DeadlineExceeded(Exception):
+    """The call did not finish within its deadline"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    After `failure_threshold` failures in a row the breaker opens and calls
+    are refused for `reset_seconds`. It then half-opens: one probe call is
+    let through, and its outcome closes the breaker or opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+        self.opened = 0
+        self.short_circuited = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go to the provider now"""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        self.short_circuited += 1
+        return False
+
+    def rejects(self) -> bool:
+        """
+        Whether `allow` would refuse a call now, without taking the half-open probe
+
+        Lets callers skip queueing for a slot they could not use; a refusal
+        counts as short-circuited.
+        """
+        state = self.state
+        if state == "open" or (state == "half_open" and self._probing):
+            self.short_circuited += 1
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("LLM circuit breaker closed")
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        # A failed probe re-opens; otherwise only the threshold-crossing failure opens
+        if self._probing or (self._opened_at is None and self._failures >= self.failure_threshold):
+            self.opened += 1
+            self._opened_at = time.monotonic()
+            logger.warning("LLM circuit breaker opened", consecutive_failures=self._failures,
+                           reset_seconds=self.reset_seconds)
+        self._probing = False
+
+    def release_probe(self) -> None:
+        """A probe ended without a verdict (e.g. cancelled); let the next call probe"""
+        self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        state = self.state
+        return {
+            "state": state,
+            "open": 0 if state == "closed" else 1,
+            "consecutive_failures": self._failures,
+            "failure_threshold": self.failure_threshold,
+            "opened": self.opened,
+            "short_circuited": self.short_circuited,
+        }
+
+
+class ResilientCaller:
+    """
+    Runs one kind of LLM call under a deadline, a breaker and optional hedging
+
+    With hedging on, once `min_samples` latencies were seen, a call still
+    running after the `hedge_quantile` latency (at least `hedge_min_delay`)
+    gets a second, identical attempt; the first to succeed wins and the
+    other is cancelled. A hedge only starts if `reserve_slot` grants a free
+    slot at once, so hedging never queues behind real traffic.
+    """
+
+    def __init__(
+        self,
+        breaker: CircuitBreaker,
+        hedge: bool = False,
+        hedge_min_delay: float = 1.0,
+        hedge_quantile: float = 0.95,
+        min_samples: int = 20,
+        reserve_slot: Optional[Callable[[], bool]] = None,
+        release_slot: Optional[Callable[[], None]] = None
+    ):
+        self.breaker = breaker
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_quantile = hedge_quantile
+        self.min_samples = min_samples
+        self.reserve_slot = reserve_slot
+        self.release_slot = release_slot
+        self._latencies: Deque[float] = deque(maxlen=200)
+
+        self.calls = 0
+        self.deadline_exceeded = 0
+        self.errors = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while hedging is off or unprimed"""
+        if not self.hedge or len(self._latencies) < self.min_samples:
+            return None
+        latencies = sorted(self._latencies)
+        return max(self.hedge_min_delay, latencies[int(self.hedge_quantile * (len(latencies) - 1))])
+
+    async def call(self, attempt: Callable[[], Awaitable[T]], timeout: float) -> T:
+        """
+        Run `attempt()` (possibly twice) and return the first success
+
+        Raises CircuitOpenError without calling while the breaker is open,
+        DeadlineExceeded after `timeout` seconds, or the attempt's error.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError("LLM circuit breaker is open")
+        self.calls += 1
+        started = time.monotonic()
+        deadline = started + timeout
+        delay = self.hedge_delay()
+        tasks: Dict[asyncio.Future, tuple] = {asyncio.ensure_future(attempt()): ("primary", started)}
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        verdict = False
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                hedge_at = started + delay if delay is not None else None
+                wait = remaining if hedge_at is None else min(remaining, max(0.0, hedge_at - time.monotonic()))
+                done, pending = await asyncio.wait(pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    if task.exception() is None:
+                        label, attempt_started = tasks[task]
+                        self._latencies.append(time.monotonic() - attempt_started)
+                        if label == "hedge":
+                            self.hedge_wins += 1
+                        self.breaker.record_success()
+                        verdict = True
+                        return task.result()
+                    error = task.exception()
+
+                if hedge_at is not None and pending and time.monotonic() >= hedge_at:
+                    delay = None
+                    hedge = self._start_hedge(attempt)
+                    if hedge is not None:
+                        tasks[hedge] = ("hedge", time.monotonic())
+                        pending.add(hedge)
+
+            verdict = True
+            self.breaker.record_failure()
+            if pending or error is None:
+                self.deadline_exceeded += 1
+                raise DeadlineExceeded(f"LLM call exceeded its {timeout:.1f}s deadline")
+            self.errors += 1
+            raise error
+        finally:
+            if not verdict:
+                self.breaker.release_probe()
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _start_hedge(self, attempt: Callable[[], Awaitable[T]]) -> Optional[asyncio.Future]:
+        if self.reserve_slot is not None and not self.reserve_slot():
+            return None
+        self.hedges += 1
+
+        async def hedged() -> T:
+            try:
+                return await attempt()
+            finally:
+                if self.release_slot is not None:
+                    self.release_slot()
+
+        return asyncio.ensure_future(hedged())
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "deadline_exceeded": self.deadline_exceeded,
+            "hedging": self.hedge,
+            "hedge_delay_seconds": self.hedge_delay() or 0.0,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_win_rate": self.hedge_wins / self.hedges if self.hedges else 0.0,
+            "latency_seconds_p50": latencies[len(latencies) // 2] if latencies else 0.0,
+            "latency_seconds_p95": latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+            "breaker": self.breaker.stats(),
+        }
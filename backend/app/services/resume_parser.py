@@ -3,51 +3,103 @@ Resume Parser Service
 Extracts text from PDF, DOCX, and TXT files
 """
 from io import BytesIO
+from typing import BinaryIO, Optional, Union
 import re
 
+from app.core.logger import logger
+from app.core.metrics import stage
 
-def parse_resume_file(content: bytes, content_type: str) -> str:
+# Raw bytes, or the path of a spooled upload
+Source = Union[bytes, str]
+
+BULLETS = "\u2022\u2023\u2043\u2219\u25aa\u25ab\u25a0\u25a1\u25cf\u25cb\u25e6\u25c6\u25c7\u25ba\u25b8\u27a2\u27a4\u2713\u2714\uf0b7\uf0a7\uf0d8"
+_REPLACEMENTS = {
+    **{bullet: "- " for bullet in BULLETS},
+    **{dash: "-" for dash in "\u2010\u2011\u2012\u2013\u2014\u2015\u2212"},
+    "\u2018": "'", "\u2019": "'", "\u201c": '"', "\u201d": '"',
+}
+# Runs of characters outside word characters, whitespace and common
+# punctuation; mapped through _REPLACEMENTS, anything unmapped is dropped
+_SPECIAL_CHARS = re.compile(r'[^\w\s\-.,;:()\[\]@#+=/"\'&%$|]+')
+
+
+def _replace_special(match: "re.Match") -> str:
+    return "".join(_REPLACEMENTS.get(char, "") for char in match.group())
+
+
+def _open(source: Source) -> Union[BinaryIO, str]:
+    return BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+
+
+def parse_resume_file(content: Source, content_type: str, max_chars: Optional[int] = None) -> str:
     """
     Parse resume file and extract text based on file type
     
     Args:
-        content: File content as bytes
+        content: File content as bytes, or a path to the file
         content_type: MIME type of the file
+        max_chars: Stop extracting once this many characters were collected
         
     Returns:
         Extracted text from the file
     """
     if content_type == "application/pdf":
-        return extract_text_from_pdf(content)
+        return extract_text_from_pdf(content, max_chars=max_chars)
     elif content_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-        return extract_text_from_docx(content)
+        return extract_text_from_docx(content, max_chars=max_chars)
     elif content_type == "text/plain":
-        return content.decode('utf-8', errors='ignore')
+        with stage("resume_parser", "decode_text"):
+            if isinstance(content, (bytes, bytearray)):
+                text = content.decode('utf-8', errors='ignore')
+            else:
+                with open(content, encoding='utf-8', errors='ignore') as f:
+                    text = f.read(max_chars) if max_chars else f.read()
+            return text[:max_chars] if max_chars else text
     else:
         raise ValueError(f"Unsupported file type: {content_type}")
 
 
-def extract_text_from_pdf(pdf_bytes: bytes) -> str:
+def count_pdf_pages(source: Source) -> int:
+    """Page count from the PDF's page tree, without extracting any text"""
+    from PyPDF2 import PdfReader
+
+    return len(PdfReader(_open(source)).pages)
+
+
+def extract_text_from_pdf(source: Source, max_chars: Optional[int] = None,
+                          start_page: int = 0, end_page: Optional[int] = None) -> str:
     """
     Extract text from PDF file using PyPDF2
+
+    Pages are read in order from `start_page` up to `end_page` (exclusive);
+    extraction stops early once `max_chars` characters were collected.
     """
     try:
         from PyPDF2 import PdfReader
-        
-        pdf_file = BytesIO(pdf_bytes)
-        reader = PdfReader(pdf_file)
-        
-        text_parts = []
-        for page_num, page in enumerate(reader.pages):
-            text = page.extract_text()
-            if text:
-                text_parts.append(text)
-                print(f"Extracted {len(text)} characters from page {page_num + 1}")
-        
+
+        with stage("resume_parser", "pdf_extract"):
+            reader = PdfReader(_open(source))
+            pages = reader.pages[start_page:end_page]
+
+            text_parts = []
+            collected = 0
+            for page_num, page in enumerate(pages, start=start_page):
+                text = page.extract_text()
+                if text:
+                    text_parts.append(text)
+                    collected += len(text)
+                    logger.debug("Extracted PDF page", page=page_num + 1, characters=len(text))
+                if max_chars and collected >= max_chars:
+                    logger.info("PDF character budget reached", page=page_num + 1, max_chars=max_chars)
+                    break
+
         full_text = "\n".join(text_parts)
-        cleaned_text = clean_text(full_text)
-        
-        print(f"Total extracted text: {len(cleaned_text)} characters")
+        with stage("resume_parser", "clean_text"):
+            cleaned_text = clean_text(full_text)
+        if max_chars:
+            cleaned_text = cleaned_text[:max_chars]
+
+        logger.info("Parsed PDF resume", pages=len(pages), characters=len(cleaned_text))
         return cleaned_text
         
     except ImportError:
@@ -56,33 +108,59 @@ def extract_text_from_pdf(pdf_bytes: bytes) -> str:
         raise Exception(f"Error parsing PDF: {str(e)}")
 
 
-def extract_text_from_docx(docx_bytes: bytes) -> str:
+def extract_text_from_docx(source: Source, max_chars: Optional[int] = None) -> str:
     """
     Extract text from DOCX file using python-docx
     """
     try:
         from docx import Document
-        
-        docx_file = BytesIO(docx_bytes)
-        doc = Document(docx_file)
-        
-        text_parts = []
-     
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                text_parts.append(paragraph.text)
-        
-       
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if cell.text.strip():
-                        text_parts.append(cell.text)
-        
+
+        with stage("resume_parser", "docx_extract"):
+            doc = Document(_open(source))
+
+            text_parts = []
+            collected = 0
+            # Layout tables often repeat paragraph text
+            seen = set()
+
+            for paragraph in doc.paragraphs:
+                if paragraph.text.strip():
+                    text_parts.append(paragraph.text)
+                    seen.add(' '.join(paragraph.text.split()))
+                    collected += len(paragraph.text)
+                    if max_chars and collected >= max_chars:
+                        break
+
+            for table in doc.tables:
+                if max_chars and collected >= max_chars:
+                    break
+                # A merged cell appears once per grid column and row it spans;
+                # python-docx hands back the same <w:tc> element each time
+                emitted = set()
+                for row in table.rows:
+                    cells = []
+                    row_seen = set()
+                    for cell in row.cells:
+                        if cell._tc in emitted:
+                            continue
+                        emitted.add(cell._tc)
+                        key = ' '.join(cell.text.split())
+                        if key and key not in seen and key not in row_seen:
+                            row_seen.add(key)
+                            cells.append(cell.text)
+                    if cells:
+                        # One line per row keeps label/value pairs together
+                        row_text = " | ".join(cells)
+                        text_parts.append(row_text)
+                        collected += len(row_text)
+
         full_text = "\n".join(text_parts)
-        cleaned_text = clean_text(full_text)
-        
-        print(f"Extracted text from DOCX: {len(cleaned_text)} characters")
+        with stage("resume_parser", "clean_text"):
+            cleaned_text = clean_text(full_text)
+        if max_chars:
+            cleaned_text = cleaned_text[:max_chars]
+
+        logger.info("Parsed DOCX resume", characters=len(cleaned_text))
         return cleaned_text
         
     except ImportError:
@@ -93,17 +171,23 @@ def extract_text_from_docx(docx_bytes: bytes) -> str:
 
 def clean_text(text: str) -> str:
     """
-    Clean and normalize extracted text
+    Clean and normalize extracted text in one sweep
+
+    Unicode bullets become "- ", typographic dashes and quotes become ASCII,
+    other symbols are dropped, runs of spaces collapse and every line is
+    stripped. Line breaks are kept; runs of blank lines become one.
     """
+    text = _SPECIAL_CHARS.sub(_replace_special, text)
 
-    text = re.sub(r'\s+', ' ', text)
-    
-    text = re.sub(r'[^\w\s\-.,;:()\[\]@#+=/"\'&%$]', '', text)
-    
-   
-    text = text.replace('\r\n', '\n').replace('\r', '\n')
-    
-    
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    
-    return text.strip()
\ No newline at end of file
+    lines = []
+    blank = False
+    for line in text.splitlines():
+        words = line.split()
+        if not words:
+            blank = True
+            continue
+        if blank and lines:
+            lines.append('')
+        lines.append(' '.join(words))
+        blank = False
+    return '\n'.join(lines)
@@ -0,0 +1,237 @@
+"""
+Knowledge Base Retrieval
+Splits the career knowledge base into chunks and ranks them with BM25
+"""
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+import heapq
+import math
+import re
+
+from app.services.tokens import estimate_tokens
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+SECTION_PATTERN = re.compile(r"^===\s*(.+?)\s*===\s*$")
+SUBHEADING_PATTERN = re.compile(r"^[A-Z][A-Z0-9 &/()\-]+:\s*$")
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by can do does for from how i in is it me my of on or "
+    "should so that the to what when where which who why will with you your".split()
+)
+
+# Long bullet lists are split so a query only pulls in the lines it needs
+MAX_CHUNK_LINES = 8
+
+
+@dataclass
+class Chunk:
+    section: str
+    heading: str
+    text: str
+    tokens: int
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase word tokens, keeping tech names like c++, c#, node.js
+
+    A plural "s" is stripped so "interviews" matches "interview".
+    """
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        token = token.rstrip('.')
+        if token in STOP_WORDS:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def split_knowledge_base(kb: str) -> List[Chunk]:
+    """
+    Split the knowledge base into self-describing chunks
+
+    Each chunk is prefixed with its section (and sub-heading, if any) so it
+    still reads correctly when pulled into a prompt on its own.
+    """
+    chunks: List[Chunk] = []
+    section, heading = "", ""
+    lines: List[str] = []
+
+    def flush():
+        # Split evenly so a 9-line list becomes 5 + 4, not 8 + 1
+        pieces = -(-len(lines) // MAX_CHUNK_LINES)
+        size = -(-len(lines) // pieces) if pieces else 0
+        for start in range(0, len(lines), size or 1):
+            body = lines[start:start + size]
+            title = f"=== {section} ===" + (f"\n{heading}" if heading else "")
+            text = title + "\n" + "\n".join(body)
+            chunks.append(Chunk(section=section, heading=heading, text=text, tokens=estimate_tokens(text)))
+        lines.clear()
+
+    for raw in kb.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        section_match = SECTION_PATTERN.match(line)
+        if section_match:
+            flush()
+            section, heading = section_match.group(1), ""
+        elif not section:
+            continue  # Preamble such as "CAREER KNOWLEDGE BASE:"
+        elif SUBHEADING_PATTERN.match(line):
+            flush()
+            heading = line.rstrip(': ')
+        else:
+            lines.append(line)
+    flush()
+    return chunks
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed set of documents"""
+
+    def __init__(self, documents: List[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._doc_terms = [Counter(tokenize(doc)) for doc in documents]
+        self._doc_lengths = [sum(terms.values()) for terms in self._doc_terms]
+        self._avg_length = sum(self._doc_lengths) / len(documents) if documents else 0.0
+
+        document_frequency: Counter = Counter()
+        for terms in self._doc_terms:
+            document_frequency.update(terms.keys())
+        total = len(documents)
+        self._idf = {
+            term: math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for term, df in document_frequency.items()
+        }
+
+    def search(self, query: str, top_k: int) -> List[Tuple[int, float]]:
+        """Return (document index, score) pairs with a positive score, best first"""
+        query_terms = [t for t in set(tokenize(query)) if t in self._idf]
+        if not query_terms:
+            return []
+
+        scores = []
+        for index, terms in enumerate(self._doc_terms):
+            norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[index] / self._avg_length)
+            score = 0.0
+            for term in query_terms:
+                frequency = terms.get(term)
+                if frequency:
+                    score += self._idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+            if score > 0:
+                scores.append((index, score))
+
+        scores.sort(key=lambda item: item[1], reverse=True)
+        return scores[:top_k]
+
+
+class KnowledgeRetriever:
+    """Indexes the knowledge base once and serves top-k chunks under a token budget"""
+
+    def __init__(self, knowledge_base: str):
+        self.chunks = split_knowledge_base(knowledge_base)
+        # Section and heading names are repeated ahead of the body (which
+        # already starts with them) to weight the title as a strong signal
+        self.index = BM25Index([f"{c.section} {c.heading}\n{c.text}" for c in self.chunks])
+        self.full_tokens = estimate_tokens(knowledge_base)
+
+    def retrieve(self, query: str, top_k: int = 4, token_budget: int = 600) -> Tuple[str, Dict[str, Any]]:
+        """
+        Return the most relevant chunks and retrieval stats
+
+        Chunks are taken best-first until `top_k` chunks or `token_budget`
+        tokens are used, then emitted in knowledge-base order.
+        """
+        selected: List[int] = []
+        used = 0
+        for index, _ in self.index.search(query, top_k):
+            tokens = self.chunks[index].tokens
+            if used + tokens > token_budget:
+                continue
+            selected.append(index)
+            used += tokens
+
+        selected.sort()
+        context = "\n\n".join(self.chunks[index].text for index in selected)
+        stats = {
+            "knowledge_tokens": used,
+            "prompt_tokens_saved": self.full_tokens - used,
+            "knowledge_sections": list(dict.fromkeys(self.chunks[index].section for index in selected)),
+        }
+        return context, stats
+
+
+class IncrementalBM25Index:
+    """
+    Okapi BM25 over an inverted index that supports add and remove
+
+    Only documents sharing a term with the query are scored, so a query
+    over thousands of documents touches a small fraction of them.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._doc_terms: Dict[str, List[str]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._lengths
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index a document, replacing any previous version with the same id"""
+        self.remove(doc_id)
+        terms = Counter(tokenize(text))
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+        length = sum(terms.values())
+        self._lengths[doc_id] = length
+        self._doc_terms[doc_id] = list(terms)
+        self._total_length += length
+
+    def remove(self, doc_id: str) -> bool:
+        length = self._lengths.pop(doc_id, None)
+        if length is None:
+            return False
+        self._total_length -= length
+        for term in self._doc_terms.pop(doc_id):
+            del self._postings[term][doc_id]
+            if not self._postings[term]:
+                del self._postings[term]
+        return True
+
+    def search(self, query: str, top_k: int) -> List[Tuple[str, float]]:
+        """Return (doc id, score) pairs with a positive score, best first"""
+        return heapq.nlargest(top_k, self.scores(query).items(), key=lambda item: item[1])
+
+    def scores(self, query: str) -> Dict[str, float]:
+        """BM25 score of every document sharing at least one term with the query"""
+        total = len(self._lengths)
+        if not total:
+            return {}
+        avg_length = self._total_length / total or 1.0
+        k1, b = self.k1, self.b
+        norms: Dict[str, float] = {}
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            docs = self._postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (total - len(docs) + 0.5) / (len(docs) + 0.5)) * (k1 + 1)
+            for doc_id, frequency in docs.items():
+                norm = norms.get(doc_id)
+                if norm is None:
+                    norm = norms[doc_id] = k1 * (1 - b + b * self._lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency / (frequency + norm)
+        return scores
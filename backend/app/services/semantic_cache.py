@@ -0,0 +1,181 @@
+"""
+Semantic Response Cache
+Serves stored answers to reworded versions of questions already answered, using local sparse embeddings
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+import math
+import re
+import threading
+import time
+
+from app.services.cache import make_cache_key
+from app.services.retrieval import tokenize
+
+# Character trigrams catch inflections the tokenizer keeps apart ("prepare" / "preparation")
+TRIGRAM_WEIGHT = 0.35
+# Adjacent-word pairs keep order apart ("Python before SQL" / "SQL before Python")
+BIGRAM_WEIGHT = 0.8
+
+# Words that flip or retarget an answer while barely moving the similarity; questions only
+# match others with the same ones ("what not to put on a resume", "senior" vs "junior")
+NEGATION_PATTERN = re.compile(r"\b(?:not|no|never|nor|without|avoid)\b|n['’]t\b")
+SENIORITY_LEVELS = {
+    "junior": re.compile(r"\b(?:junior|jr|entry[\s-]level|new[\s-]grad|graduate|intern(?:ship)?|beginner|fresher)\b"),
+    "mid": re.compile(r"\b(?:mid[\s-]?level|intermediate)\b"),
+    "senior": re.compile(r"\b(?:senior|sr|experienced)\b"),
+    "lead": re.compile(r"\b(?:lead|staff|principal|manager|head of)\b"),
+}
+
+# Career-chat shorthand mapped to one spelling before embedding
+CANONICAL_TERMS = {
+    "dev": "developer", "engineer": "developer", "programmer": "developer",
+    "cv": "resume", "résumé": "resume",
+    "prep": "prepare", "preparation": "prepare", "preparing": "prepare", "ready": "prepare",
+    "interviewing": "interview",
+    "improve": "better", "improving": "better", "stronger": "better",
+    "skill": "learn", "study": "learn", "learning": "learn",
+    "tip": "advice", "suggestion": "advice",
+}
+
+
+def embed(text: str) -> Dict[str, float]:
+    """
+    L2-normalized sparse vector of word, word-bigram and character-trigram features
+
+    Computed locally in microseconds; no model or network involved.
+    """
+    vector: Dict[str, float] = {}
+    tokens = [CANONICAL_TERMS.get(token, token) for token in tokenize(text)]
+    for index, token in enumerate(tokens):
+        vector[token] = vector.get(token, 0.0) + 1.0
+        padded = f"^{token}$"
+        for i in range(len(padded) - 2):
+            gram = "#" + padded[i:i + 3]
+            vector[gram] = vector.get(gram, 0.0) + TRIGRAM_WEIGHT
+        if index:
+            pair = f"{tokens[index - 1]}>{token}"
+            vector[pair] = vector.get(pair, 0.0) + BIGRAM_WEIGHT
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    if norm:
+        for feature in vector:
+            vector[feature] /= norm
+    return vector
+
+
+def qualifiers(text: str) -> str:
+    """Negation and seniority markers of a question, e.g. "not|senior"; empty if none"""
+    lowered = text.lower()
+    markers = ["not"] if NEGATION_PATTERN.search(lowered) else []
+    markers += [level for level, pattern in SENIORITY_LEVELS.items() if pattern.search(lowered)]
+    return "|".join(markers)
+
+
+def cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(feature, 0.0) for feature, weight in a.items())
+
+
+@dataclass
+class _Entry:
+    query: str
+    vector: Dict[str, float]
+    partition: str
+    expires_at: float
+    value: Any
+
+
+class SemanticCache:
+    """
+    Bounded LRU of (question, answer) pairs looked up by similarity
+
+    A lookup returns the answer of the most similar stored question at or
+    above `threshold`. Questions are only compared within the same
+    `partition`, which callers use to keep apart questions that read alike
+    but need different answers (e.g. frontend vs backend), and with the same
+    negation and seniority `qualifiers`, which no score can weigh reliably
+    enough. Entries expire
+    after `ttl_seconds`; the least recently used is evicted when full.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 3600, threshold: float = 0.9):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._partitions: Dict[str, set] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._similarity_total = 0.0
+
+    def get(self, query: str, partition: str = "") -> Optional[Tuple[Any, float, str]]:
+        """Return (value, similarity, stored question) for the best match, or None"""
+        vector = embed(query)
+        partition = f"{partition}#{qualifiers(query)}"
+        now = time.time()
+        with self._lock:
+            best_key, best_similarity = None, 0.0
+            for key in list(self._partitions.get(partition, ())):
+                entry = self._entries[key]
+                if entry.expires_at <= now:
+                    self._remove(key)
+                    self.expirations += 1
+                    continue
+                similarity = cosine(vector, entry.vector)
+                if similarity > best_similarity:
+                    best_key, best_similarity = key, similarity
+
+            if best_key is None or best_similarity < self.threshold:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            self._similarity_total += best_similarity
+            entry = self._entries[best_key]
+            return entry.value, best_similarity, entry.query
+
+    def set(self, query: str, value: Any, partition: str = "") -> None:
+        partition = f"{partition}#{qualifiers(query)}"
+        key = make_cache_key(partition, query)
+        entry = _Entry(query, embed(query), partition, time.time() + self.ttl_seconds, value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._partitions.setdefault(partition, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._partitions.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "avg_hit_similarity": self._similarity_total / self.hits if self.hits else 0.0,
+            }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        keys = self._partitions[entry.partition]
+        keys.discard(key)
+        if not keys:
+            del self._partitions[entry.partition]
@@ -0,0 +1,60 @@
+"""
+Single-Flight Request Coalescing
+Concurrent calls with the same key share one in-flight upstream call
+"""
+from typing import Any, Awaitable, Callable, Dict
+import asyncio
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent async calls by key
+
+    The first caller for a key starts the call; later callers await the same
+    task. A waiter that is cancelled (e.g. its client disconnected) only
+    cancels the shared call if no other waiters remain.
+    """
+
+    def __init__(self):
+        # key -> [shared task, number of callers currently awaiting it]
+        self._inflight: Dict[str, list] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._inflight.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(fn())
+            entry = [task, 0]
+            self._inflight[key] = entry
+            task.add_done_callback(lambda finished: self._forget(key, entry))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+
+        task = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if entry[1] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            entry[1] -= 1
+
+    def _forget(self, key: str, entry: list) -> None:
+        if self._inflight.get(key) is entry:
+            del self._inflight[key]
+        # Mark the exception as retrieved if every waiter already left
+        if not entry[0].cancelled():
+            entry[0].exception()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.calls + self.coalesced
+        return {
+            "in_flight": len(self._inflight),
+            "upstream_calls": self.calls,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": self.coalesced / total if total else 0.0,
+        }
@@ -0,0 +1,237 @@
+"""
+Skill Extraction Service
+Deterministic skill matching with an Aho-Corasick automaton over a local taxonomy
+"""
+from collections import Counter, deque
+from typing import Dict, List, Tuple
+import re
+
+
+# Canonical skill -> aliases (lowercase). Seeded from the technologies listed
+# in CareerChatService's knowledge base. Bare "go" (which the canonical
+# name still adds) matches ordinary English far more often than the
+# language, so it is one of the AMBIGUOUS_ALIASES below.
+SKILL_TAXONOMY: Dict[str, List[str]] = {
+    "Python": ["python", "python3"],
+    "SQL": ["sql"],
+    "Statistics": ["statistics", "statistical analysis"],
+    "Machine Learning": ["machine learning", "ml"],
+    "Deep Learning": ["deep learning"],
+    "Data Visualization": ["data visualization", "data visualisation"],
+    "Tableau": ["tableau"],
+    "Power BI": ["power bi", "powerbi"],
+    "Pandas": ["pandas"],
+    "NumPy": ["numpy"],
+    "Scikit-learn": ["scikit-learn", "scikit learn", "sklearn"],
+    "TensorFlow": ["tensorflow"],
+    "PyTorch": ["pytorch"],
+    "HTML": ["html", "html5"],
+    "CSS": ["css", "css3"],
+    "JavaScript": ["javascript", "js", "es6"],
+    "TypeScript": ["typescript"],
+    "React": ["react", "react.js", "reactjs"],
+    "Vue.js": ["vue", "vue.js", "vuejs"],
+    "Next.js": ["next.js", "nextjs"],
+    "Responsive Design": ["responsive design"],
+    "Git": ["git"],
+    "Webpack": ["webpack"],
+    "npm": ["npm"],
+    "Figma": ["figma"],
+    "Node.js": ["node.js", "nodejs", "node"],
+    "Java": ["java"],
+    "REST APIs": ["rest api", "rest apis", "restful", "restful api", "restful apis"],
+    "Authentication": ["authentication", "oauth", "jwt"],
+    "FastAPI": ["fastapi"],
+    "Django": ["django"],
+    "Express.js": ["express.js", "expressjs"],
+    "Spring Boot": ["spring boot"],
+    "PostgreSQL": ["postgresql", "postgres"],
+    "MongoDB": ["mongodb", "mongo"],
+    "NoSQL": ["nosql"],
+    "Docker": ["docker", "containerization"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "AWS": ["aws", "amazon web services"],
+    "Azure": ["azure"],
+    "GCP": ["gcp", "google cloud"],
+    "Microservices": ["microservices", "microservice"],
+    "DevOps": ["devops"],
+    "CI/CD": ["ci/cd", "cicd", "continuous integration", "continuous delivery"],
+    "Terraform": ["terraform"],
+    "Ansible": ["ansible"],
+    "Jenkins": ["jenkins"],
+    "GitLab CI": ["gitlab ci", "gitlab ci/cd"],
+    "GitHub Actions": ["github actions"],
+    "Prometheus": ["prometheus"],
+    "Grafana": ["grafana"],
+    "Go": ["golang"],
+    "Rust": ["rust"],
+    "Swift": ["swift"],
+    "Kotlin": ["kotlin"],
+    "React Native": ["react native"],
+    "Flutter": ["flutter"],
+    "LLMs": ["llm", "llms", "large language models"],
+    "Prompt Engineering": ["prompt engineering"],
+    "Blockchain": ["blockchain", "web3", "smart contracts"],
+    "Cybersecurity": ["cybersecurity", "security engineering", "ethical hacking"],
+    "Data Engineering": ["data engineering", "data pipelines", "etl"],
+    "Data Structures": ["data structures"],
+    "Algorithms": ["algorithms"],
+    "System Design": ["system design"],
+    "Testing": ["unit testing", "testing", "pytest", "jest"],
+}
+
+# Aliases that are also everyday words ("react to feedback", "a node in the
+# graph", "testing the waters", "5 ml"). One only counts with a context word
+# for its skill within CONTEXT_WINDOW characters, or as an item of a list
+# that names another skill within the window ("Python, React, Docker").
+AMBIGUOUS_ALIASES: Dict[str, "re.Pattern[str]"] = {
+    "go": re.compile(r"\b(?:golang|goroutines?|gin|grpc|concurrency)\b"),
+    "ml": re.compile(r"\b(?:models?|machine|ai|data|learning|training|inference|mlops|engineer(?:ing)?)\b"),
+    "node": re.compile(r"\b(?:express(?:\.js)?|npm|javascript|typescript|js|backend|back-end|runtime|server)\b"),
+    "react": re.compile(r"\b(?:hooks|redux|jsx|components?|frontend|front-end|javascript|typescript|js|spa|ui)\b"),
+    "rust": re.compile(r"\b(?:cargo|crates?|tokio|systems programming|memory safety|webassembly|wasm)\b"),
+    "swift": re.compile(r"\b(?:ios|xcode|swiftui|uikit|cocoa|macos|apple)\b"),
+    "testing": re.compile(r"\b(?:unit|integration|e2e|end-to-end|automated|automation|tdd|test-driven|qa|selenium|cypress)\b"),
+}
+CONTEXT_WINDOW = 60
+_LIST_BEFORE = re.compile(r"(?:^|[,/|;:(]|\band|\bor)\s*$")
+_LIST_AFTER = re.compile(r"^\s*(?:$|[,/|;)]|and\b|or\b)")
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: finds every pattern occurrence in one pass over the text"""
+
+    def __init__(self, patterns: Dict[str, str]):
+        # patterns: pattern text -> payload (canonical skill)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, str]]] = [[]]
+
+        for pattern, payload in patterns.items():
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                node = next_node
+            self._output[node].append((len(pattern), payload))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """Return (start, end, payload) for every match"""
+        matches = []
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for length, payload in self._output[node]:
+                matches.append((index - length + 1, index + 1, payload))
+        return matches
+
+
+class SkillExtractor:
+    """Finds taxonomy skills in free text, normalizing aliases to canonical names"""
+
+    def __init__(self, taxonomy: Dict[str, List[str]] = SKILL_TAXONOMY):
+        patterns = {}
+        for canonical, aliases in taxonomy.items():
+            for alias in aliases + [canonical.lower()]:
+                patterns[alias] = canonical
+        self._automaton = AhoCorasick(patterns)
+
+    def extract(self, text: str) -> Counter:
+        """
+        Count canonical skill mentions
+
+        Only whole-word matches count, and where matches overlap the longest
+        wins, so "react native" is not also counted as "react". Ambiguous
+        aliases need context (see AMBIGUOUS_ALIASES).
+        """
+        normalized = re.sub(r'\s+', ' ', text.lower())
+        matches = []
+        for start, end, skill in self._automaton.find(normalized):
+            before = normalized[start - 1] if start > 0 else " "
+            after = normalized[end] if end < len(normalized) else " "
+            # "java" inside "javascript" or "sql" inside "postgresql" is not a mention
+            if before.isalnum() or after.isalnum():
+                continue
+            # Neither is "js" in "node.js" or "node" in "node.js"
+            if before == "." and start > 1 and normalized[start - 2].isalnum():
+                continue
+            if after == "." and end + 1 < len(normalized) and normalized[end + 1].isalnum():
+                continue
+            matches.append((start, end, skill))
+
+        if any(normalized[start:end] in AMBIGUOUS_ALIASES for start, end, _ in matches):
+            matches = self._drop_out_of_context(normalized, matches)
+
+        counts: Counter = Counter()
+        covered_until = -1
+        for start, end, skill in sorted(matches, key=lambda m: (m[0], m[0] - m[1])):
+            if start < covered_until:
+                continue
+            counts[skill] += 1
+            covered_until = end
+        return counts
+
+    @staticmethod
+    def _drop_out_of_context(text: str, matches: List[Tuple[int, int, str]]) -> List[Tuple[int, int, str]]:
+        """Keep ambiguous matches only next to a context word or in a list with other skills"""
+        anchors = [start for start, end, _ in matches if text[start:end] not in AMBIGUOUS_ALIASES]
+        kept = []
+        for start, end, skill in matches:
+            context = AMBIGUOUS_ALIASES.get(text[start:end])
+            if context is not None:
+                window = text[max(0, start - CONTEXT_WINDOW):end + CONTEXT_WINDOW]
+                in_list = (
+                    _LIST_BEFORE.search(text[max(0, start - 8):start])
+                    and _LIST_AFTER.match(text[end:end + 8])
+                    and any(abs(anchor - start) <= CONTEXT_WINDOW for anchor in anchors)
+                )
+                if not context.search(window) and not in_list:
+                    continue
+            kept.append((start, end, skill))
+        return kept
+
+    def compare(self, job_description: str, resume_text: str) -> Dict[str, List[str]]:
+        """
+        Skill overlap between a JD and a resume
+
+        Skills are ordered by how often the JD mentions them, most first.
+        """
+        required = self.extract(job_description)
+        offered = self.extract(resume_text)
+        ranked = [skill for skill, _ in required.most_common()]
+        return {
+            "required": ranked,
+            "matched": [skill for skill in ranked if skill in offered],
+            "missing": [skill for skill in ranked if skill not in offered],
+            "repeated": [skill for skill in ranked if required[skill] > 1],
+        }
+
+
+_extractor = None
+
+
+def get_skill_extractor() -> SkillExtractor:
+    """Shared extractor; the automaton is built once on first use"""
+    global _extractor
+    if _extractor is None:
+        _extractor = SkillExtractor()
+    return _extractor
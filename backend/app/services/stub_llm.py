@@ -0,0 +1,165 @@
+"""
+Stub Chat Model
+Offline LangChain chat model with simulated latency, for benchmarks and load tests
+"""
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+import asyncio
+import json
+import math
+import random
+import time
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from app.services.tokens import CHARS_PER_TOKEN, estimate_tokens
+
+
+DEFAULT_ANALYSIS_RESPONSE = json.dumps({
+    "match_score": 7.0,
+    "match_level": "Good Match",
+    "skills_matched": ["Python", "FastAPI", "SQL"],
+    "skills_gaps": [
+        {
+            "skill": "Docker",
+            "importance": "high",
+            "suggestion": "Containerize one of your projects and document the setup"
+        }
+    ],
+    "strengths_found": ["Solid backend fundamentals", "Relevant project experience"],
+    "actionable_tip": "Lead your resume with the API project that matches this role"
+})
+
+DEFAULT_REQUIREMENTS_RESPONSE = json.dumps({
+    "title": "Backend Engineer",
+    "seniority": "senior",
+    "min_years_experience": 5,
+    "must_have": ["Python", "FastAPI", "PostgreSQL"],
+    "nice_to_have": ["Docker", "Kubernetes"],
+    "responsibilities": ["Design APIs", "Own services in production"],
+    "other_requirements": []
+})
+
+DEFAULT_CHAT_RESPONSE = (
+    "Great question! Focus on building two or three portfolio projects that use the "
+    "skills employers list most often, and quantify the impact of each one.\n\n"
+    "- Pick one core stack and go deep before adding more tools\n"
+    "- Practice explaining your technical decisions out loud\n"
+    "- Apply consistently and ask for referrals where you can\n\n"
+    "Keep going; steady, visible progress is what hiring managers look for."
+)
+
+
+class StubChatModel(BaseChatModel):
+    """
+    Offline chat model for benchmarks and load tests
+
+    Simulates time-to-first-token from a configurable latency distribution
+    and generation time from a token rate. Responses come from `responses`
+    (first rule whose "match" substring is in the prompt wins) or fall back
+    to canned analysis JSON, requirements JSON or chat text.
+    """
+
+    latency_ms: float = 800.0
+    latency_jitter_ms: float = 200.0
+    latency_distribution: str = "lognormal"  # fixed | uniform | normal | lognormal
+    tokens_per_second: float = 80.0
+    responses: List[Dict[str, str]] = []
+    seed: Optional[int] = 0
+
+    _rng: Any = None
+
+    def model_post_init(self, __context: Any) -> None:
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "career-compass-stub"
+
+    def _respond(self, messages: List[BaseMessage]) -> str:
+        prompt = "\n".join(str(message.content) for message in messages)
+        for rule in self.responses:
+            if rule.get("match", "") in prompt:
+                return rule["response"]
+        if '"match_score"' in prompt:
+            return DEFAULT_ANALYSIS_RESPONSE
+        if '"must_have"' in prompt:
+            return DEFAULT_REQUIREMENTS_RESPONSE
+        return DEFAULT_CHAT_RESPONSE
+
+    def _first_token_seconds(self) -> float:
+        mean = self.latency_ms / 1000
+        jitter = self.latency_jitter_ms / 1000
+        if self.latency_distribution == "fixed" or jitter <= 0:
+            delay = mean
+        elif self.latency_distribution == "uniform":
+            delay = self._rng.uniform(mean - jitter, mean + jitter)
+        elif self.latency_distribution == "normal":
+            delay = self._rng.gauss(mean, jitter)
+        else:
+            # Lognormal with the requested mean and standard deviation: long right tail like real APIs
+            if mean <= 0:
+                return 0.0
+            sigma = math.sqrt(math.log(1 + (jitter / mean) ** 2))
+            delay = self._rng.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma)
+        return max(0.0, delay)
+
+    def _generation_seconds(self, text: str) -> float:
+        if self.tokens_per_second <= 0:
+            return 0.0
+        return estimate_tokens(text) / self.tokens_per_second
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        text = self._respond(messages)
+        time.sleep(self._first_token_seconds() + self._generation_seconds(text))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        text = self._respond(messages)
+        await asyncio.sleep(self._first_token_seconds() + self._generation_seconds(text))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        text = self._respond(messages)
+        time.sleep(self._first_token_seconds())
+        for piece in self._pieces(text):
+            time.sleep(self._generation_seconds(piece))
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        text = self._respond(messages)
+        await asyncio.sleep(self._first_token_seconds())
+        for piece in self._pieces(text):
+            await asyncio.sleep(self._generation_seconds(piece))
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+
+    @staticmethod
+    def _pieces(text: str) -> List[str]:
+        """Split text into roughly token-sized chunks"""
+        return [text[i:i + CHARS_PER_TOKEN] for i in range(0, len(text), CHARS_PER_TOKEN)]
@@ -0,0 +1,189 @@
+"""
+Chat History Summarization
+Folds the older turns of long conversations into a running summary, off the request path
+"""
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+import asyncio
+import time
+
+from app.core.logger import logger
+from app.core.metrics import record_llm_tokens, stage
+from app.services.history import SUMMARY_ROLE, HistoryStore, Message, split_summary
+from app.services.llm_gateway import LLMGateway, LLMOverloadedError
+from app.services.prompt_budget import TRUNCATION_MARKER
+from app.services.tokens import CHARS_PER_TOKEN, estimate_tokens
+
+# Rate-limit bookkeeping is kept for at most this many recently summarized sessions
+MAX_TRACKED_SESSIONS = 10_000
+
+
+def _format_turn(message: Message) -> str:
+    return f"{message['role'].upper()}: {message['content']}"
+
+
+def recent_window(turns: List[Message], token_budget: int, max_messages: int) -> int:
+    """
+    Index where the prompt's recent turns start
+
+    The newest turns are kept whole while they fit `token_budget` and number
+    at most `max_messages`; the newest turn is always kept.
+    """
+    start, used = len(turns), 0
+    for index in range(len(turns) - 1, -1, -1):
+        tokens = estimate_tokens(_format_turn(turns[index]))
+        if start < len(turns) and (used + tokens > token_budget or len(turns) - index > max_messages):
+            break
+        start, used = index, used + tokens
+    return start
+
+
+class HistorySummarizer:
+    """
+    Keeps chat prompts within a fixed history budget as conversations grow
+
+    The prompt carries the session's running summary plus its most recent
+    turns within `recent_tokens`. Once the unsummarized turns pass
+    `trigger_tokens`, or are about to be pushed out of the history store
+    (`store_max_messages`), every turn older than that recent window is
+    folded with the previous summary into a new summary of at most
+    `summary_tokens`. Refreshes run as background tasks at batch priority on
+    the LLM gateway, one per session at a time and at most once every
+    `min_interval_seconds` per session.
+    """
+
+    def __init__(self, history: HistoryStore, llm: Any, gateway: LLMGateway, enabled: bool = True,
+                 trigger_tokens: int = 1600, recent_tokens: int = 1200, recent_messages: int = 6,
+                 summary_tokens: int = 300, min_interval_seconds: float = 30, store_max_messages: int = 10):
+        self.history = history
+        self.llm = llm
+        self.gateway = gateway
+        self.enabled = enabled
+        self.trigger_tokens = trigger_tokens
+        self.recent_tokens = recent_tokens
+        self.recent_messages = recent_messages
+        self.summary_tokens = summary_tokens
+        self.min_interval_seconds = min_interval_seconds
+        self.store_max_messages = store_max_messages
+        self._last_refresh: "OrderedDict[str, float]" = OrderedDict()
+        self._running: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.refreshes = 0
+        self.folded_messages = 0
+        self.rate_limited = 0
+        self.stale = 0
+        self.failures = 0
+        self._summary_tokens_total = 0
+
+    def context(self, messages: List[Message]) -> Tuple[Optional[str], List[Message]]:
+        """The summary and the recent turns to inline in a prompt"""
+        summary, turns = split_summary(messages)
+        recent = turns[recent_window(turns, self.recent_tokens, self.recent_messages):]
+        if recent and estimate_tokens(_format_turn(recent[-1])) > self.recent_tokens:
+            # A single oversized turn keeps its beginning
+            newest = recent[-1]
+            content = newest["content"][:self.recent_tokens * CHARS_PER_TOKEN]
+            recent = [{"role": newest["role"], "content": content + " " + TRUNCATION_MARKER}]
+        return summary, recent
+
+    def _fold_point(self, turns: List[Message]) -> int:
+        """How many of the oldest turns to fold now (0: none)"""
+        start = recent_window(turns, self.recent_tokens, self.recent_messages)
+        if start == 0:
+            return 0
+        tokens = sum(estimate_tokens(_format_turn(turn)) for turn in turns)
+        if tokens > self.trigger_tokens or len(turns) >= self.store_max_messages - 2:
+            return start
+        return 0
+
+    def maybe_refresh(self, session_id: str) -> None:
+        """Schedule a background summary refresh if the session needs one; never blocks"""
+        if not self.enabled or not session_id or session_id in self._running:
+            return
+        messages = self.history.get(session_id)
+        summary, turns = split_summary(messages)
+        fold = self._fold_point(turns)
+        if not fold:
+            return
+
+        now = time.monotonic()
+        last = self._last_refresh.get(session_id)
+        if last is not None and now - last < self.min_interval_seconds:
+            self.rate_limited += 1
+            return
+        self._last_refresh[session_id] = now
+        self._last_refresh.move_to_end(session_id)
+        while len(self._last_refresh) > MAX_TRACKED_SESSIONS:
+            self._last_refresh.popitem(last=False)
+
+        folded = messages[:len(messages) - len(turns) + fold]
+        self._running.add(session_id)
+        task = asyncio.ensure_future(self._refresh(session_id, summary, folded))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _build_prompt(self, summary: Optional[str], turns: List[Message]) -> str:
+        conversation = "\n\n".join(_format_turn(turn) for turn in turns if turn["role"] != SUMMARY_ROLE)
+        words = self.summary_tokens * CHARS_PER_TOKEN // 6
+        return f"""You maintain a running summary of a career counseling conversation.
+
+Update the summary with the new turns below. Keep what later advice depends on: the user's goals, background, skills, constraints and decisions, the advice already given, and open questions. Drop pleasantries and repetition. Write plain prose of at most {words} words.
+
+CURRENT SUMMARY:
+{summary if summary else "None yet"}
+
+NEW TURNS:
+{conversation}
+
+UPDATED SUMMARY:"""
+
+    async def _refresh(self, session_id: str, summary: Optional[str], folded: List[Message]) -> None:
+        try:
+            prompt = self._build_prompt(summary, folded)
+            async with self.gateway.slot("batch"):
+                with stage("chat", "summarize"):
+                    response = await self.llm.ainvoke(prompt)
+            text = response.content if hasattr(response, 'content') else str(response)
+            record_llm_tokens("chat_summary", response, prompt, text)
+            text = text.strip()[:self.summary_tokens * CHARS_PER_TOKEN]
+            if not text:
+                self.failures += 1
+                return
+
+            if not self.history.compact(session_id, folded, text):
+                # The session was trimmed or compacted meanwhile; the next turn retries
+                self.stale += 1
+                self._last_refresh.pop(session_id, None)
+                return
+            self.refreshes += 1
+            self.folded_messages += sum(1 for m in folded if m["role"] != SUMMARY_ROLE)
+            self._summary_tokens_total += estimate_tokens(text)
+            logger.debug("Chat history summarized", folded=len(folded), summary_tokens=estimate_tokens(text))
+        except LLMOverloadedError:
+            # Summaries yield to interactive traffic; retried after the interval
+            self.failures += 1
+        except Exception as e:
+            self.failures += 1
+            logger.warning("Chat history summarization failed", error=str(e))
+        finally:
+            self._running.discard(session_id)
+
+    async def close(self) -> None:
+        """Cancel refreshes still running (shutdown)"""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "refreshes": self.refreshes,
+            "running": len(self._running),
+            "folded_messages": self.folded_messages,
+            "rate_limited": self.rate_limited,
+            "stale": self.stale,
+            "failures": self.failures,
+            "avg_summary_tokens": self._summary_tokens_total / self.refreshes if self.refreshes else 0.0,
+        }
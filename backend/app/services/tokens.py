@@ -0,0 +1,15 @@
+"""
+Token Estimation
+Cheap, dependency-free token counts for prompt budgeting
+"""
+
+# Gemini and most BPE tokenizers average roughly four characters per token
+# on English prose; close enough for budgeting without a tokenizer round trip
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the number of tokens in text"""
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
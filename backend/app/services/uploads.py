@@ -0,0 +1,69 @@
+"""
+Upload Reading
+Hashes and size-checks uploads chunk by chunk while copying them, and archive members, to temp files
+"""
+from contextlib import suppress
+from typing import BinaryIO, Callable, Optional, Tuple
+import asyncio
+import hashlib
+import os
+import tempfile
+
+from fastapi import UploadFile
+
+CHUNK_SIZE = 64 * 1024
+
+
+async def spool_upload(file: UploadFile, check_size: Callable[[int], None],
+                       directory: Optional[str] = None) -> Tuple[str, str, int]:
+    """
+    Stream an upload into a temp file while hashing it; returns (path, sha256 hex, size)
+
+    Starlette's spool of the multipart body (over-limit bodies never get that
+    far, see BodySizeLimitMiddleware) has no path parser workers could open,
+    so it is copied once, chunk by chunk in a thread: neither the app nor
+    the workers hold the whole file in memory. The caller deletes the file,
+    unless the copy is cancelled, in which case it is deleted here.
+    """
+    await file.seek(0)
+    copy = asyncio.ensure_future(asyncio.to_thread(spool_stream, file.file, check_size, directory))
+    try:
+        return await asyncio.shield(copy)
+    except asyncio.CancelledError:
+        copy.add_done_callback(_discard_copy)
+        raise
+
+
+def _discard_copy(future: "asyncio.Future") -> None:
+    """Delete the temp file of a copy that finished after its caller gave up"""
+    if not future.cancelled() and future.exception() is None:
+        with suppress(OSError):
+            os.unlink(future.result()[0])
+
+
+def spool_stream(source: BinaryIO, check_size: Callable[[int], None],
+                 directory: Optional[str] = None) -> Tuple[str, str, int]:
+    """
+    Copy a readable binary stream to a temp file; returns (path, sha256 hex, size)
+
+    The limit is enforced on the bytes actually read (an archive member's
+    declared size cannot be trusted), so an oversized file is neither held
+    in memory nor written out in full. Blocking; the caller deletes the file.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    spool = tempfile.NamedTemporaryFile(prefix="resume-", dir=directory, delete=False)
+    try:
+        with spool:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                check_size(size)
+                digest.update(chunk)
+                spool.write(chunk)
+    except BaseException:
+        os.unlink(spool.name)
+        raise
+    return spool.name, digest.hexdigest(), size
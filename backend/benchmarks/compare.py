@@ -0,0 +1,44 @@
+"""
+Compare Benchmark Results
+Prints per-scenario deltas between two saved load benchmark reports
+
+    python -m benchmarks.compare benchmarks/results/OLD.json benchmarks/results/NEW.json
+"""
+import argparse
+import json
+
+METRICS = ["throughput_rps", "p50_ms", "p95_ms", "p99_ms"]
+
+
+def load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two load benchmark reports")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    args = parser.parse_args()
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    old = {(r["scenario"], r["concurrency"]): r for r in baseline["results"]}
+
+    print(f"baseline {baseline['commit']}  ->  candidate {candidate['commit']}")
+    print(f"{'scenario':<24} {'c':>3} " + " ".join(f"{m:>22}" for m in METRICS))
+    for result in candidate["results"]:
+        key = (result["scenario"], result["concurrency"])
+        if key not in old:
+            continue
+        cells = []
+        for metric in METRICS:
+            before, after = old[key][metric], result[metric]
+            change = (after - before) / before * 100 if before else 0.0
+            cells.append(f"{after:10.1f} ({change:+6.1f}%)")
+        print(f"{key[0]:<24} {key[1]:>3} " + " ".join(f"{c:>22}" for c in cells))
+
+    print(f"peak RSS: {baseline['peak_rss_mb']['process']:.1f} MB -> {candidate['peak_rss_mb']['process']:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
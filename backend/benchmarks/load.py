@@ -0,0 +1,197 @@
+"""
+Endpoint Load Benchmark
+Drives /api/analyze, /api/chat and /api/parse-resume in-process against the stub LLM
+
+Run from the backend directory:
+    python -m benchmarks.load --concurrency 1 8 32 --requests 64
+"""
+from typing import Any, Awaitable, Callable, Dict, List
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import uuid
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def peak_rss_mb() -> Dict[str, float]:
+    """Peak resident set size of this process and of the largest child (parser workers)"""
+    if resource is None:
+        return {"process": 0.0, "largest_child": 0.0}
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "process": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / divisor,
+        "largest_child": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / divisor,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+async def run_scenario(name: str, make_request: Callable[[int], Awaitable[Any]],
+                       total: int, concurrency: int) -> Dict[str, Any]:
+    """Fire `total` requests with at most `concurrency` in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(index: int):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            response = await make_request(index)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "scenario": name,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+
+    from benchmarks.fixtures import make_job_description, make_resume_docx, make_resume_pdf, make_resume_text
+
+    app_module = importlib.import_module("main")
+    app = app_module.app
+
+    resume = make_resume_text(pages=2)
+    # Unique documents per request so the parsed-resume cache never short-circuits parsing
+    pdf_sizes = {"pdf_1p": 1, "pdf_10p": 10, "pdf_40p": 40}
+    documents = {
+        name: [make_resume_pdf(pages=pages, seed=i) for i in range(args.requests)]
+        for name, pages in pdf_sizes.items()
+    }
+    documents["docx_2p"] = [make_resume_docx(pages=2, seed=i) for i in range(args.requests)]
+    content_types = {name: "application/pdf" for name in pdf_sizes}
+    content_types["docx_2p"] = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with app_module.lifespan(app):
+        # Keep the one-off service warm-up out of the first scenario's latencies
+        await app_module.ensure_services()
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            scenarios: Dict[str, Callable[[int], Awaitable[Any]]] = {
+                "analyze": lambda i: client.post("/api/analyze", json={
+                    "job_description": make_job_description(i),
+                    "resume_text": resume,
+                    "use_cache": False
+                }),
+                # A new session per request (no history to carry) and the semantic cache
+                # off, so every chat request takes the LLM path
+                "chat": lambda i: client.post("/api/chat", json={
+                    "query": f"How should a backend developer prepare for interviews? ({i})",
+                    "session_id": uuid.uuid4().hex
+                }),
+            }
+            for name, docs in documents.items():
+                scenarios[f"parse_resume_{name}"] = (
+                    lambda i, docs=docs, name=name: client.post(
+                        "/api/parse-resume",
+                        files={"file": (f"resume-{i}", docs[i], content_types[name])}
+                    )
+                )
+
+            for name, make_request in scenarios.items():
+                if args.only and name not in args.only:
+                    continue
+                for concurrency in args.concurrency:
+                    # Fresh cache state per level keeps runs comparable
+                    app_module.resume_cache.clear()
+                    result = await run_scenario(name, make_request, args.requests, concurrency)
+                    results.append(result)
+                    print(
+                        f"{name:<24} c={concurrency:<3} {result['throughput_rps']:8.1f} req/s  "
+                        f"p50={result['p50_ms']:7.1f}ms  p95={result['p95_ms']:7.1f}ms  "
+                        f"p99={result['p99_ms']:7.1f}ms  errors={result['errors']}"
+                    )
+
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "settings": {
+            "requests": args.requests,
+            "stub_latency_ms": args.latency_ms,
+            "stub_tokens_per_second": args.tokens_per_second,
+            "chat_semantic_cache": False,
+        },
+        "peak_rss_mb": peak_rss_mb(),
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Career Compass endpoint load benchmark")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=64, help="requests per scenario and concurrency level")
+    parser.add_argument("--latency-ms", type=float, default=200, help="stub LLM time to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=200, help="stub LLM generation rate")
+    parser.add_argument("--only", nargs="*", help="scenario names to run (default: all)")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    # Must be set before the app (and its config) is imported
+    os.environ["LLM_PROVIDER"] = "stub"
+    os.environ["LLM_STUB_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["LLM_STUB_TOKENS_PER_SECOND"] = str(args.tokens_per_second)
+    os.environ.setdefault("LLM_MAX_QUEUE", str(max(args.concurrency) * 4))
+    # Reworded repeats of the chat question would otherwise be answered from the cache
+    os.environ["CHAT_SEMANTIC_CACHE_ENABLED"] = "false"
+    # Per-request info logs would drown the report
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    report = asyncio.run(run(args))
+    rss = report["peak_rss_mb"]
+    print(f"peak RSS: {rss['process']:.1f} MB (largest parser worker {rss['largest_child']:.1f} MB)")
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{report['commit']}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"saved {output}")
+
+
+if __name__ == "__main__":
+    main()
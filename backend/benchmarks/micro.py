@@ -0,0 +1,108 @@
+"""
+Microbenchmarks
+Hot helpers on the request path: clean_text, DOCX extraction, JSON extraction and prompt construction
+
+Run from the backend directory:
+    python -m benchmarks.micro
+"""
+from typing import Any, Callable, Dict
+import argparse
+import json
+import os
+import re
+import timeit
+
+
+def bench(name: str, fn: Callable[[], Any], size_bytes: int = 0, repeat: int = 5) -> Dict[str, Any]:
+    """Best-of-`repeat` timing with an auto-scaled loop count"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    result = {"name": name, "us_per_call": best * 1e6}
+    if size_bytes:
+        result["mb_per_s"] = size_bytes / best / (1024 * 1024)
+    throughput = f"  {result['mb_per_s']:8.1f} MB/s" if size_bytes else ""
+    print(f"{name:<36} {result['us_per_call']:12.1f} us/call{throughput}")
+    return result
+
+
+def legacy_clean_text(text: str) -> str:
+    """The multi-pass clean_text this repo used to ship, kept as a baseline"""
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^\w\s\-.,;:()\[\]@#+=/"\'&%$]', '', text)
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip()
+
+
+def run() -> Dict[str, Any]:
+    os.environ.setdefault("LLM_PROVIDER", "stub")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    from app.services.analyze import JobMatchAnalyzer
+    from app.services.chat import CareerChatService
+    from app.services.llm_json import IncrementalJSONParser, repair_json
+    from app.services.resume_parser import clean_text, extract_text_from_docx
+    from benchmarks.fixtures import make_job_description, make_resume_docx, make_resume_text
+
+    analyzer = JobMatchAnalyzer()
+    chat_service = CareerChatService()
+
+    results = []
+    for pages in (1, 10, 40, 200):
+        text = make_resume_text(pages=pages)
+        results.append(bench(f"clean_text[{pages}p]", lambda text=text: clean_text(text), len(text.encode())))
+        results.append(bench(f"legacy_clean_text[{pages}p]", lambda text=text: legacy_clean_text(text),
+                             len(text.encode())))
+    for pages in (1, 10):
+        docx = make_resume_docx(pages=pages)
+        results.append(bench(f"extract_text_from_docx[{pages}p]", lambda docx=docx: extract_text_from_docx(docx),
+                             len(docx), repeat=3))
+
+    payload = json.dumps({
+        "match_score": 7.5,
+        "match_level": "Good Match",
+        "skills_matched": ["Python", "FastAPI", "React"] * 5,
+        "skills_gaps": [{"skill": "Docker", "importance": "high", "suggestion": "Learn Docker"}] * 5,
+        "strengths_found": ["Strong programming foundation"] * 5,
+        "actionable_tip": "Emphasize your API project"
+    })
+    fenced = f"Here is the analysis:\n```json\n{payload}\n```\nLet me know if you need more."
+    results.append(bench("_extract_json[plain]", lambda: analyzer._extract_json(payload), len(payload)))
+    results.append(bench("_extract_json[fenced]", lambda: analyzer._extract_json(fenced), len(fenced)))
+
+    def parse_streamed():
+        parser = IncrementalJSONParser()
+        for i in range(0, len(fenced), 16):
+            parser.feed(fenced[i:i + 16])
+        return parser.result()
+    results.append(bench("IncrementalJSONParser[16B chunks]", parse_streamed, len(fenced)))
+    results.append(bench("repair_json[truncated]", lambda: repair_json(payload[:len(payload) * 2 // 3]),
+                         len(payload) * 2 // 3))
+
+    job_description = make_job_description()
+    resume = make_resume_text(pages=2)
+    results.append(bench("analysis_prompt.format", lambda: analyzer.analysis_prompt.format(
+        job_section=analyzer._format_job_section(job_description),
+        resume_text=resume,
+        skill_overlap=analyzer._format_skill_overlap(job_description, resume)
+    )))
+    results.append(bench("chat _build_prompt", lambda: chat_service._build_prompt(
+        "How should a backend developer prepare for interviews?", resume
+    )))
+    return {"results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Career Compass microbenchmarks")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    report = run()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Startup Benchmark
+Measures how long `import main` takes and how long a launched server needs to
+answer /healthz, /readyz and its first /api/analyze, against the stub LLM
+
+Run from the backend directory:
+    python -m benchmarks.startup --runs 5 --workers 1 2
+"""
+from typing import Any, Dict, List
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.load import RESULTS_DIR, git_commit
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import main; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def stub_env(latency_ms: float) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "LLM_PROVIDER": "stub",
+        "LLM_STUB_LATENCY_MS": str(latency_ms),
+        "PYTHONPATH": BACKEND_DIR,
+    })
+    env.setdefault("LOG_LEVEL", "WARNING")
+    return env
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(env: Dict[str, str]) -> Dict[str, float]:
+    """Wall time of a fresh interpreter importing the app, and of the import alone"""
+    started = time.perf_counter()
+    output = subprocess.check_output([sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND_DIR, env=env, text=True)
+    return {
+        "process_seconds": time.perf_counter() - started,
+        "import_seconds": float(output.strip().splitlines()[-1]),
+    }
+
+
+def measure_server(env: Dict[str, str], workers: int, timeout: float) -> Dict[str, float]:
+    """Seconds from launching serve.py until each milestone is reached"""
+    import httpx
+
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "serve.py", "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    timings: Dict[str, float] = {}
+    base = f"http://127.0.0.1:{port}"
+    try:
+        with httpx.Client(base_url=base, timeout=timeout) as client:
+            for milestone, path in (("healthz_seconds", "/healthz"), ("readyz_seconds", "/readyz")):
+                while True:
+                    if time.perf_counter() - started > timeout:
+                        raise TimeoutError(f"server not answering {path} after {timeout:.0f}s")
+                    try:
+                        if client.get(path).status_code == 200:
+                            break
+                    except httpx.TransportError:
+                        pass
+                    time.sleep(0.01)
+                timings[milestone] = time.perf_counter() - started
+
+            response = client.post("/api/analyze", json={
+                "job_description": "Backend engineer: Python, FastAPI, PostgreSQL, Docker",
+                "resume_text": "Python developer with FastAPI and SQL experience",
+                "use_cache": False,
+            })
+            response.raise_for_status()
+            timings["first_analyze_seconds"] = time.perf_counter() - started
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+    return timings
+
+
+def summarize(samples: List[Dict[str, float]]) -> Dict[str, float]:
+    return {
+        f"{field}_median": statistics.median(sample[field] for sample in samples)
+        for field in samples[0]
+    } | {
+        f"{field}_max": max(sample[field] for sample in samples)
+        for field in samples[0]
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    env = stub_env(args.latency_ms)
+    imports = summarize([measure_import(env) for _ in range(args.runs)])
+    print(f"import main          median={imports['import_seconds_median'] * 1000:7.1f}ms  "
+          f"process={imports['process_seconds_median'] * 1000:7.1f}ms")
+
+    servers = []
+    for workers in args.workers:
+        result = {"workers": workers, **summarize([
+            measure_server(env, workers, args.timeout) for _ in range(args.runs)
+        ])}
+        servers.append(result)
+        print(f"serve.py workers={workers:<3} healthz={result['healthz_seconds_median'] * 1000:7.1f}ms  "
+              f"readyz={result['readyz_seconds_median'] * 1000:7.1f}ms  "
+              f"first analyze={result['first_analyze_seconds_median'] * 1000:7.1f}ms")
+
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "settings": {"runs": args.runs, "stub_latency_ms": args.latency_ms},
+        "import": imports,
+        "servers": servers,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Career Compass startup benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="launches per measurement")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--latency-ms", type=float, default=50, help="stub LLM time to first token")
+    parser.add_argument("--timeout", type=float, default=60, help="give up on a launch after this many seconds")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/startup-<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    report = run(args)
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"startup-{report['commit']}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"saved {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,90 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+import time
+
+# Measured from here so /metrics can report how long importing the app took
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import Depends, FastAPI, HTTPException, Request, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Literal, Optional
+from contextlib import asynccontextmanager, suppress
+import asyncio
+import hashlib
+import json
+import os
+import uuid
 import uvicorn
 
-from app.services.analyze import JobMatchAnalyzer
-from app.services.chat import CareerChatService
-from app.services.resume_parser import parse_resume_file
+from app.core import config
+from app.core.body_limit import BodySizeLimitMiddleware
+from app.core.logger import logger
+from app.core.metrics import HTTP_REQUEST_SECONDS, SERVICE_STATE, render_metrics
+from app.services.analyze import get_analyzer
+from app.services.cache import ResultCache
+from app.services.llm_gateway import LLMOverloadedError, get_llm_gateway
+from app.services.chat import get_chat_service
+from app.services.jobs import AnalysisJobQueue, JobStore
+from app.services.ranking import ResumeCorpus
+from app.services.skills import get_skill_extractor
+from app.services.parser_pool import ResumeParseError, ResumeParserPool, ResumeTooLargeError
+from app.services.uploads import spool_upload
+from app.services.bulk_resumes import BulkResumeParser
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    job_store.purge(config.ANALYZE_JOB_RETENTION_SECONDS)
+    if config.WARMUP_ON_STARTUP:
+        start_services()
+    job_queue.start()
+    yield
+    await job_queue.stop()
+    if startup_state["ready"]:
+        await get_chat_service().summarizer.close()
+    parser_pool.shutdown()
+
 
 app = FastAPI(
     title="Career Compass API",
     description="AI-Powered Job Match Analysis and Career Guidance",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+@app.exception_handler(LLMOverloadedError)
+async def llm_overloaded_handler(request: Request, exc: LLMOverloadedError):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    # Route template, not the raw path, keeps label cardinality bounded
+    route = request.scope.get("route")
+    HTTP_REQUEST_SECONDS.observe(
+        time.perf_counter() - started,
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=str(response.status_code)
+    )
+    if "first_request_seconds" not in startup_state and request.url.path.startswith("/api/"):
+        startup_state["first_request_seconds"] = time.perf_counter() - _IMPORT_STARTED
+    return response
+
+
+# Oversized uploads get a 413 before Starlette reads and spools the multipart body
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={
+        "/api/parse-resume": config.RESUME_MAX_BYTES + config.UPLOAD_FORM_OVERHEAD_BYTES,
+        "/api/parse-resume/bulk": config.RESUME_BULK_MAX_BYTES
+    }
 )
 
 #  CORS
@@ -24,14 +97,182 @@ app.add_middleware(
 )
 
 # Initialize 
-analyzer = JobMatchAnalyzer()
-chat_service = CareerChatService()
+# The analyzer and chat service (LangChain, provider SDKs, LLM clients) are built off the
+# event loop, by the startup warm-up or the first request that needs them, never at import time
+startup_state = {
+    "ready": False, "import_seconds": 0.0, "warmup_seconds": 0.0, "warmup_failures": 0, "warmup_error": None
+}
+_services_task: Optional[asyncio.Task] = None
+
+
+def _build_services() -> None:
+    get_skill_extractor()
+    get_analyzer()
+    get_chat_service()
+
+
+async def _warm_up() -> None:
+    global _services_task
+    started = time.perf_counter()
+    try:
+        await asyncio.to_thread(_build_services)
+    except Exception as e:
+        startup_state["warmup_failures"] += 1
+        startup_state["warmup_error"] = str(e)
+        logger.error("Service warm-up failed", error=str(e))
+        # Let the next request try again
+        _services_task = None
+        raise
+    startup_state["warmup_seconds"] = time.perf_counter() - started
+    startup_state["ready"] = True
+    startup_state["warmup_error"] = None
+    logger.info("Services ready", warmup_seconds=round(startup_state["warmup_seconds"], 3))
+
+
+def start_services() -> asyncio.Task:
+    global _services_task
+    if _services_task is None:
+        _services_task = asyncio.ensure_future(_warm_up())
+    return _services_task
+
+
+async def ensure_services() -> None:
+    """Wait until the analyzer and chat service exist, building them if nobody has yet"""
+    if not startup_state["ready"]:
+        await asyncio.shield(start_services())
+
+
+async def services_ready() -> None:
+    """Dependency of the routes that use the analyzer or chat service; 503 if they cannot be built"""
+    try:
+        await ensure_services()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Service warm-up failed: {e}")
+
+
+def when_ready(stats):
+    """Metrics source that stays empty (rather than building services) until they exist"""
+    return lambda: stats() if startup_state["ready"] else {}
+
+
+async def run_analysis_job(**payload):
+    await ensure_services()
+    return await get_analyzer().analyze(priority="batch", **payload)
+
+
+parser_pool = ResumeParserPool(
+    max_workers=config.RESUME_PARSE_WORKERS,
+    max_concurrent=config.RESUME_PARSE_MAX_CONCURRENT,
+    max_bytes=config.RESUME_MAX_BYTES,
+    cpu_seconds=config.RESUME_PARSE_CPU_SECONDS,
+    timeout_seconds=config.RESUME_PARSE_TIMEOUT_SECONDS,
+    max_chars=config.RESUME_MAX_CHARS,
+    parallel_min_pages=config.RESUME_PDF_PARALLEL_MIN_PAGES
+)
+# Parsed resume text keyed by SHA-256 of the uploaded bytes
+resume_cache = ResultCache(
+    max_entries=config.RESUME_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.RESUME_CACHE_TTL_SECONDS,
+    db_path=config.RESUME_CACHE_DB_PATH,
+    max_disk_entries=config.RESUME_CACHE_DB_MAX_ENTRIES
+)
+bulk_parser = BulkResumeParser(
+    parser_pool,
+    resume_cache,
+    max_files=config.RESUME_BULK_MAX_FILES,
+    max_pending=config.RESUME_BULK_MAX_PENDING,
+    spool_dir=config.RESUME_SPOOL_DIR
+)
+# Stored resumes that /api/rank shortlists from
+resume_corpus = ResumeCorpus(config.RESUME_CORPUS_DB_PATH)
+
+# Background analyses that outlive the request (and the process)
+job_store = JobStore(config.ANALYZE_JOBS_DB_PATH, lease_seconds=config.ANALYZE_JOB_LEASE_SECONDS)
+job_queue = AnalysisJobQueue(
+    job_store,
+    analyze=run_analysis_job,
+    is_fallback=lambda result: get_analyzer().is_fallback(result),
+    workers=config.ANALYZE_JOB_WORKERS,
+    max_attempts=config.ANALYZE_JOB_MAX_ATTEMPTS,
+    retry_base_seconds=config.ANALYZE_JOB_RETRY_BASE_SECONDS,
+    callback_hosts=config.ANALYZE_JOB_CALLBACK_HOSTS
+)
+
+SERVICE_STATE.track("analyze_cache", when_ready(lambda: get_analyzer().cache.stats()))
+SERVICE_STATE.track("resume_cache", resume_cache.stats)
+SERVICE_STATE.track("jd_requirements_cache", when_ready(lambda: get_analyzer().requirements.cache.stats()))
+SERVICE_STATE.track("analyze_coalescing", when_ready(lambda: get_analyzer().inflight.stats()))
+SERVICE_STATE.track("chat_coalescing", when_ready(lambda: get_chat_service().inflight.stats()))
+SERVICE_STATE.track("chat_history", when_ready(lambda: get_chat_service().history.stats()))
+SERVICE_STATE.track("chat_summaries", when_ready(lambda: get_chat_service().summarizer.stats()))
+SERVICE_STATE.track("chat_semantic_cache", when_ready(lambda: get_chat_service().semantic_cache.stats()))
+SERVICE_STATE.track("llm_gateway", get_llm_gateway().stats)
+SERVICE_STATE.track("analyze_llm", when_ready(lambda: get_analyzer().llm_caller.stats()))
+SERVICE_STATE.track("analysis_jobs", job_queue.stats)
+SERVICE_STATE.track("resume_corpus", resume_corpus.stats)
+SERVICE_STATE.track("startup", lambda: startup_state)
+
+
+def resolve_resume_text(resume_text: Optional[str], resume_id: Optional[str]) -> Optional[str]:
+    """Return raw resume text, or the cached text for a resume_id from /api/parse-resume"""
+    if resume_id:
+        cached = resume_cache.get(resume_id)
+        if cached is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Unknown or expired resume_id; upload the resume again"
+            )
+        return cached["text"]
+    return resume_text
 
 
 # Request/Response 
 class AnalyzeRequest(BaseModel):
     job_description: str
-    resume_text: str
+    # Either raw text or a resume_id returned by /api/parse-resume
+    resume_text: Optional[str] = None
+    resume_id: Optional[str] = None
+    use_cache: bool = True
+    # "fast" returns a local keyword-overlap score without calling the LLM
+    mode: Literal["full", "fast"] = "full"
+    # Deadline for the LLM analysis (capped at ANALYZE_TIMEOUT_SECONDS); past it the keyword-overlap result is returned
+    timeout_seconds: Optional[float] = None
+
+
+class BatchAnalyzeRequest(BaseModel):
+    # Either one resume against many JDs, or one JD against many resumes
+    resume_text: Optional[str] = None
+    resume_id: Optional[str] = None
+    job_descriptions: Optional[List[str]] = None
+    job_description: Optional[str] = None
+    resume_texts: Optional[List[str]] = None
+    use_cache: bool = True
+    mode: Literal["full", "fast"] = "full"
+
+
+class AnalyzeJobRequest(AnalyzeRequest):
+    # POSTed the finished job (same body as GET /api/analyze/jobs/{id}); local hosts only
+    callback_url: Optional[str] = None
+
+
+class RequirementsRequest(BaseModel):
+    job_description: str
+
+
+class CorpusResumeRequest(BaseModel):
+    # Either raw text or a resume_id returned by /api/parse-resume
+    resume_text: Optional[str] = None
+    resume_id: Optional[str] = None
+    name: Optional[str] = ""
+
+
+class RankRequest(BaseModel):
+    job_description: str
+    top_k: int = 20
+    # False returns the prefilter shortlist only, without LLM analysis
+    analyze: bool = True
+    use_cache: bool = True
+    mode: Literal["full", "fast"] = "full"
 
 
 class SkillGap(BaseModel):
@@ -47,15 +288,31 @@ class AnalyzeResponse(BaseModel):
     skills_gaps: List[SkillGap]
     strengths_found: List[str]
     actionable_tip: str
+    # Present when the JD or resume was cut to fit its prompt token budget
+    prompt_truncation: Optional[List[dict]] = None
+    # True when the model reply was cut off and only its complete fields were used
+    partial: bool = False
+    # Why the keyword-overlap result was served instead of the LLM's: circuit_open, deadline, llm_error, invalid_output
+    degraded: Optional[str] = None
 
 
 class ChatRequest(BaseModel):
     query: str
     context: Optional[str] = ""
+    # Uses the parsed resume from /api/parse-resume as context
+    resume_id: Optional[str] = None
+    # Omit on the first message; the server assigns one and returns it
+    session_id: Optional[str] = None
 
 
 class ChatResponse(BaseModel):
     response: str
+    session_id: str
+    knowledge_sections: List[str] = []
+    prompt_tokens_saved: int = 0
+    prompt_truncation: List[dict] = []
+    # Set when the answer was reused from a near-identical earlier question
+    semantic_cache: Optional[dict] = None
 
 
 #Endpoints
@@ -66,47 +323,419 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "analyze": "/api/analyze",
+            "analyze_stream": "/api/analyze/stream",
+            "analyze_batch": "/api/analyze/batch",
+            "analyze_jobs": "/api/analyze/jobs",
+            "analyze_requirements": "/api/analyze/requirements",
+            "analyze_cache_stats": "/api/analyze/cache",
+            "coalescing_stats": "/api/coalescing",
+            "llm_gateway_stats": "/api/llm/gateway",
+            "llm_resilience_stats": "/api/llm/resilience",
+            "corpus": "/api/corpus/resumes",
+            "rank": "/api/rank",
             "chat": "/api/chat",
-            "parse_resume": "/api/parse-resume"
+            "chat_stream": "/api/chat/stream",
+            "chat_sessions": "/api/chat/sessions",
+            "chat_cache_stats": "/api/chat/cache",
+            "parse_resume": "/api/parse-resume",
+            "parse_resume_bulk": "/api/parse-resume/bulk",
+            "resume_cache_stats": "/api/parse-resume/cache",
+            "healthz": "/healthz",
+            "readyz": "/readyz",
+            "metrics": "/metrics"
         }
     }
 
 
-@app.post("/api/analyze", response_model=AnalyzeResponse)
+@app.get("/healthz")
+async def healthz():
+    """
+    Liveness: the process is up and serving; never waits for warm-up
+    """
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """
+    Readiness: 503 until the startup warm-up has built the LLM clients and services
+    """
+    ready = startup_state["ready"] or not config.WARMUP_ON_STARTUP
+    body = {
+        "status": "ready" if ready else "starting",
+        "services_built": startup_state["ready"],
+        "import_seconds": round(startup_state["import_seconds"], 3),
+        "warmup_seconds": round(startup_state["warmup_seconds"], 3),
+        "warmup_failures": startup_state["warmup_failures"],
+        "warmup_error": startup_state["warmup_error"],
+    }
+    return JSONResponse(status_code=200 if ready else 503, content=body)
+
+
+@app.post("/api/analyze", response_model=AnalyzeResponse, dependencies=[Depends(services_ready)])
 async def analyze_job_match(request: AnalyzeRequest):
     """
     Analyze job-resume match using AI
     """
+    resume_text = resolve_resume_text(request.resume_text, request.resume_id)
+    if resume_text is None:
+        raise HTTPException(status_code=400, detail="Provide resume_text or resume_id")
+
     try:
-        result = await analyzer.analyze(
+        result = await get_analyzer().analyze(
             job_description=request.job_description,
-            resume_text=request.resume_text
+            resume_text=resume_text,
+            use_cache=request.use_cache,
+            mode=request.mode,
+            timeout_seconds=request.timeout_seconds
         )
         return result
+    except LLMOverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/api/chat", response_model=ChatResponse)
+@app.post("/api/analyze/stream", dependencies=[Depends(services_ready)])
+async def analyze_job_match_stream(request: AnalyzeRequest, http_request: Request):
+    """
+    Analyze job-resume match, streaming each result field as a Server-Sent Event as soon as it is parsed
+    """
+    resume_text = resolve_resume_text(request.resume_text, request.resume_id)
+    if resume_text is None:
+        raise HTTPException(status_code=400, detail="Provide resume_text or resume_id")
+
+    if request.mode == "fast":
+        stream = None
+    else:
+        stream = get_analyzer().analyze_stream(
+            job_description=request.job_description,
+            resume_text=resume_text,
+            use_cache=request.use_cache,
+            timeout_seconds=request.timeout_seconds
+        )
+
+    # Wait for the first event before answering so an overloaded gateway
+    # still yields a proper 429 instead of an SSE error event
+    try:
+        if stream is None:
+            first_event = {"result": await get_analyzer().analyze(request.job_description, resume_text, mode="fast")}
+        else:
+            first_event = await stream.__anext__()
+    except StopAsyncIteration:
+        first_event = None
+    except LLMOverloadedError:
+        await stream.aclose()
+        raise
+
+    def format_event(event: dict) -> str:
+        if "field" in event:
+            return f"event: field\ndata: {json.dumps(event)}\n\n"
+        return f"event: result\ndata: {json.dumps(event['result'])}\n\n"
+
+    async def event_stream():
+        try:
+            if first_event is not None:
+                yield format_event(first_event)
+            if stream is not None:
+                async for event in stream:
+                    if await http_request.is_disconnected():
+                        break
+                    yield format_event(event)
+        except Exception as e:
+            logger.error("Analysis stream failed", error=str(e))
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+        finally:
+            # Stops the upstream generation if the client went away
+            if stream is not None:
+                await stream.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/api/analyze/batch", dependencies=[Depends(services_ready)])
+async def analyze_batch(request: BatchAnalyzeRequest):
+    """
+    Analyze one resume against many JDs (or one JD against many resumes)
+    Streams one NDJSON line per item as soon as it finishes
+    """
+    resume_text = resolve_resume_text(request.resume_text, request.resume_id)
+    if resume_text is not None and request.job_descriptions:
+        pairs = [(jd, resume_text) for jd in request.job_descriptions]
+    elif request.job_description is not None and request.resume_texts:
+        pairs = [(request.job_description, rt) for rt in request.resume_texts]
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail="Provide resume_text (or resume_id) with job_descriptions, or job_description with resume_texts"
+        )
+
+    if len(pairs) > config.ANALYZE_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large: at most {config.ANALYZE_BATCH_MAX_ITEMS} items allowed"
+        )
+
+    async def stream_results():
+        async for index, result, error in get_analyzer().analyze_many(
+            pairs,
+            concurrency=config.ANALYZE_BATCH_CONCURRENCY,
+            use_cache=request.use_cache,
+            mode=request.mode
+        ):
+            item = {"index": index, "result": result} if error is None else {"index": index, "error": error}
+            yield json.dumps(item) + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@app.post("/api/analyze/jobs", status_code=202)
+async def submit_analysis_job(request: AnalyzeJobRequest):
+    """
+    Queue an analysis and return its job id immediately
+    Poll GET /api/analyze/jobs/{job_id} or pass a callback_url
+    """
+    # Resolved now so the job does not depend on the resume cache later
+    resume_text = resolve_resume_text(request.resume_text, request.resume_id)
+    if resume_text is None:
+        raise HTTPException(status_code=400, detail="Provide resume_text or resume_id")
+
+    payload = {
+        "job_description": request.job_description,
+        "resume_text": resume_text,
+        "use_cache": request.use_cache,
+        "mode": request.mode
+    }
+    try:
+        return job_queue.submit(payload, callback_url=request.callback_url)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/api/analyze/jobs/{job_id}")
+async def get_analysis_job(job_id: str):
+    """
+    Status of a queued analysis, with the result once it succeeded
+    """
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job_id")
+    return job
+
+
+@app.post("/api/analyze/requirements", dependencies=[Depends(services_ready)])
+async def extract_requirements(request: RequirementsRequest):
+    """
+    Extract (and cache) a JD's structured requirements
+    Later analyses of the same JD use the compact form instead of the raw text
+    """
+    requirements = await get_analyzer().requirements.extract(request.job_description)
+    if requirements is None:
+        raise HTTPException(status_code=422, detail="Could not extract requirements from the job description")
+    return requirements
+
+
+@app.get("/api/analyze/cache", dependencies=[Depends(services_ready)])
+async def analyze_cache_stats():
+    """
+    Hit/miss counters for the analysis result cache
+    """
+    return get_analyzer().cache.stats()
+
+
+@app.get("/api/coalescing", dependencies=[Depends(services_ready)])
+async def coalescing_stats():
+    """
+    How many identical in-flight requests shared an upstream LLM call
+    """
+    return {
+        "analyze": get_analyzer().inflight.stats(),
+        "requirements": get_analyzer().requirements.inflight.stats(),
+        "chat": get_chat_service().inflight.stats()
+    }
+
+
+@app.get("/api/llm/gateway")
+async def llm_gateway_stats():
+    """
+    LLM concurrency, queue depth and wait times
+    """
+    return get_llm_gateway().stats()
+
+
+@app.get("/api/llm/resilience", dependencies=[Depends(services_ready)])
+async def llm_resilience_stats():
+    """
+    Circuit breaker state, deadline misses and hedge win rate of analysis LLM calls
+    """
+    return get_analyzer().llm_caller.stats()
+
+
+@app.post("/api/corpus/resumes")
+async def add_corpus_resume(request: CorpusResumeRequest):
+    """
+    Add (or replace) a resume in the ranking corpus
+    """
+    resume_text = resolve_resume_text(request.resume_text, request.resume_id)
+    if not resume_text:
+        raise HTTPException(status_code=400, detail="Provide resume_text or resume_id")
+    resume_id = request.resume_id or hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+    return resume_corpus.add(resume_id, resume_text, name=request.name or "")
+
+
+@app.delete("/api/corpus/resumes/{resume_id}")
+async def remove_corpus_resume(resume_id: str):
+    """
+    Remove a resume from the ranking corpus
+    """
+    if not resume_corpus.remove(resume_id):
+        raise HTTPException(status_code=404, detail="Unknown resume_id")
+    return {"resume_id": resume_id, "removed": True}
+
+
+@app.get("/api/corpus")
+async def corpus_stats():
+    """
+    Size of the ranking corpus
+    """
+    return resume_corpus.stats()
+
+
+@app.post("/api/rank")
+async def rank_candidates(request: RankRequest):
+    """
+    Rank stored resumes against a JD
+    A cheap index shortlists the top_k, and only those go through analysis
+    """
+    if not 1 <= request.top_k <= config.RANK_MAX_TOP_K:
+        raise HTTPException(status_code=400, detail=f"top_k must be between 1 and {config.RANK_MAX_TOP_K}")
+
+    started = time.perf_counter()
+    candidates = resume_corpus.shortlist(request.job_description, request.top_k)
+    shortlist_ms = (time.perf_counter() - started) * 1000
+
+    if request.analyze and candidates:
+        await services_ready()
+        pairs = [(request.job_description, resume_corpus.get_text(c["resume_id"]) or "") for c in candidates]
+        async for index, result, error in get_analyzer().analyze_many(
+            pairs,
+            concurrency=config.RANK_ANALYZE_CONCURRENCY,
+            use_cache=request.use_cache,
+            mode=request.mode
+        ):
+            candidates[index]["analysis"] = result
+            if error is not None:
+                candidates[index]["error"] = error
+        candidates.sort(
+            key=lambda c: ((c.get("analysis") or {}).get("match_score", -1), c["prefilter_score"]),
+            reverse=True
+        )
+
+    return {
+        "corpus_size": len(resume_corpus),
+        "shortlist_ms": round(shortlist_ms, 2),
+        "candidates": candidates
+    }
+
+
+@app.post("/api/chat", response_model=ChatResponse, dependencies=[Depends(services_ready)])
 async def career_chat(request: ChatRequest):
     """
     Chat with AI career assistant
     """
+    session_id = request.session_id or uuid.uuid4().hex
+    context = resolve_resume_text(request.context, request.resume_id)
     try:
-        response = await chat_service.chat(
+        result = await get_chat_service().chat(
             query=request.query,
-            context=request.context
+            context=context,
+            session_id=session_id
         )
-        return ChatResponse(response=response)
+        return ChatResponse(session_id=session_id, **result)
+    except LLMOverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/chat/stream", dependencies=[Depends(services_ready)])
+async def career_chat_stream(request: ChatRequest, http_request: Request):
+    """
+    Chat with AI career assistant, streaming tokens as Server-Sent Events
+    """
+    session_id = request.session_id or uuid.uuid4().hex
+    context = resolve_resume_text(request.context, request.resume_id)
+
+    metadata = {}
+    stream = get_chat_service().chat_stream(
+        query=request.query,
+        context=context,
+        session_id=session_id,
+        metadata=metadata
+    )
+
+    # Wait for the first token before answering so an overloaded gateway
+    # still yields a proper 429 instead of an SSE error event
+    try:
+        first_token = await stream.__anext__()
+    except StopAsyncIteration:
+        first_token = None
+    except LLMOverloadedError:
+        await stream.aclose()
+        raise
+
+    async def event_stream():
+        try:
+            if first_token is not None:
+                yield f"event: token\ndata: {json.dumps({'token': first_token})}\n\n"
+                async for token in stream:
+                    if await http_request.is_disconnected():
+                        break
+                    yield f"event: token\ndata: {json.dumps({'token': token})}\n\n"
+                else:
+                    yield f"event: done\ndata: {json.dumps({'session_id': session_id, **metadata})}\n\n"
+            else:
+                yield f"event: done\ndata: {json.dumps({'session_id': session_id, **metadata})}\n\n"
+        except Exception as e:
+            logger.error("Chat stream failed", session_id=session_id, error=str(e))
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+        finally:
+            # Stops the upstream generation if the client went away
+            await stream.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Session-Id": session_id}
+    )
+
+
+@app.get("/api/chat/cache", dependencies=[Depends(services_ready)])
+async def chat_cache_stats():
+    """
+    Hit rate, size and evictions of the chat semantic cache
+    """
+    return get_chat_service().semantic_cache.stats()
+
+
+@app.get("/api/chat/sessions", dependencies=[Depends(services_ready)])
+async def chat_session_stats():
+    """
+    Session count and memory usage of the chat history store, and rolling-summary activity
+    """
+    chat_service = get_chat_service()
+    return {**chat_service.history.stats(), "summaries": chat_service.summarizer.stats()}
+
+
 @app.post("/api/parse-resume")
 async def parse_resume(file: UploadFile = File(...)):
     """
     Parse uploaded resume file (PDF, DOCX, TXT)
-    Returns extracted text from the file
+    Returns extracted text and a resume_id usable by /api/analyze and /api/chat
     """
     try:
         # Validate_file
@@ -122,24 +751,75 @@ async def parse_resume(file: UploadFile = File(...)):
                 detail="Invalid file type. Please upload PDF, DOCX, or TXT file"
             )
         
-        # Read_file
-        content = await file.read()
-        
-        # Parse_file
-        text = parse_resume_file(content, file.content_type)
-        
+        if file.size is not None:
+            parser_pool.check_size(file.size)
+
+        # Spool_file: hashed while streamed to a temp file the parser workers open by path
+        path, resume_id, size = await spool_upload(file, parser_pool.check_size, config.RESUME_SPOOL_DIR)
+        try:
+            # Identical bytes were parsed before: skip the parser entirely
+            cached = resume_cache.get(resume_id)
+            if cached is not None:
+                text = cached["text"]
+            else:
+                # Parse_file (in worker processes, off the event loop)
+                text = await parser_pool.parse(path, file.content_type)
+                resume_cache.set(resume_id, {"text": text, "content_type": file.content_type})
+        finally:
+            with suppress(OSError):
+                os.unlink(path)
+
         return {
+            "resume_id": resume_id,
             "text": text,
             "filename": file.filename,
             "content_type": file.content_type,
-            "size": len(content)
+            "size": size,
+            "truncated": len(text) >= config.RESUME_MAX_CHARS,
+            "cached": cached is not None
         }
         
     except HTTPException:
         raise
+    except ResumeTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ResumeParseError as e:
+        raise HTTPException(status_code=422, detail=f"Error parsing file: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error parsing file: {str(e)}")
 
 
+@app.post("/api/parse-resume/bulk")
+async def parse_resumes_bulk(files: List[UploadFile] = File(...), include_text: bool = False):
+    """
+    Parse many resumes: several files and/or ZIP archives of PDF, DOCX and TXT files
+    Streams one NDJSON line per file as soon as it is parsed (errors inline), then a summary line
+    """
+    async def stream_results():
+        async for item in bulk_parser.parse(files, include_text=include_text):
+            yield json.dumps(item) + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@app.get("/api/parse-resume/cache")
+async def resume_cache_stats():
+    """
+    Hit/miss counters for the parsed resume cache
+    """
+    return resume_cache.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Stage latencies, token counts, fallbacks and service state in Prometheus text format
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+startup_state["import_seconds"] = time.perf_counter() - _IMPORT_STARTED
+
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""
+Production entry point: uvicorn with several worker processes and no reload
+
+    python serve.py --workers 4
+
+`python main.py` remains the single-process development server with auto-reload.
+"""
+from typing import Dict
+import argparse
+import os
+
+import uvicorn
+
+from app.core import config
+from app.core.logger import logger
+
+
+def share_worker_state(workers: int) -> Dict[str, str]:
+    """
+    Move state that later requests depend on out of process memory when there are several workers
+
+    A resume_id from /api/parse-resume and a chat session_id can reach any
+    worker, so the resume cache and chat history must be shared: when left
+    per-process they are pointed at SQLite files next to the app. Settings
+    already configured are kept. Returns the variables set; workers inherit
+    them through the environment.
+    """
+    if workers <= 1:
+        return {}
+    updates = {}
+    if not config.RESUME_CACHE_DB_PATH:
+        updates["RESUME_CACHE_DB_PATH"] = os.path.join(config.BACKEND_DIR, "resume_cache.db")
+    if config.CHAT_HISTORY_BACKEND == "memory":
+        updates["CHAT_HISTORY_BACKEND"] = "sqlite"
+        if not config.CHAT_HISTORY_DB_PATH:
+            updates["CHAT_HISTORY_DB_PATH"] = os.path.join(config.BACKEND_DIR, "chat_history.db")
+    os.environ.update(updates)
+    return updates
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the Career Compass API")
+    parser.add_argument("--host", default=config.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=config.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=config.SERVER_WORKERS,
+                        help="worker processes; each has its own caches and LLM gateway")
+    args = parser.parse_args()
+
+    shared = share_worker_state(args.workers)
+    if shared:
+        logger.warning("Per-process state shared through SQLite for multiple workers", **shared)
+
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=max(1, args.workers),
+        reload=False,
+        # Let in-flight requests and queued analysis jobs finish on SIGTERM
+        timeout_graceful_shutdown=30
+    )
+
+
+if __name__ == "__main__":
+    main()
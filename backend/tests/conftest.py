@@ -0,0 +1,15 @@
+import os
+import sys
+import tempfile
+
+# Lets `pytest` run from the repo root as well as from backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Offline settings; must be in place before app.core.config is first imported
+os.environ.setdefault("LLM_PROVIDER", "stub")
+os.environ.setdefault("LLM_STUB_LATENCY_MS", "5")
+os.environ.setdefault("LLM_STUB_LATENCY_JITTER_MS", "0")
+os.environ.setdefault("LLM_STUB_TOKENS_PER_SECOND", "100000")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("WARMUP_ON_STARTUP", "false")
+os.environ.setdefault("ANALYZE_JOBS_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="career-compass-tests-"), "jobs.db"))
@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.llm_gateway import LLMGateway, LLMOverloadedError, get_llm_gateway
+
+
+async def _queued(gateway: LLMGateway, count: int) -> None:
+    """Let waiters reach the queue"""
+    for _ in range(50):
+        if len(gateway._waiters) >= count:
+            return
+        await asyncio.sleep(0)
+    raise AssertionError("waiters did not queue")
+
+
+def test_interactive_waiters_are_served_before_batch():
+    async def scenario():
+        gateway = LLMGateway(max_concurrency=1, max_queue=10)
+        order = []
+
+        async def call(name, priority):
+            async with gateway.slot(priority):
+                order.append(name)
+
+        await gateway.acquire()
+        tasks = [asyncio.ensure_future(call("batch-1", "batch")),
+                 asyncio.ensure_future(call("batch-2", "batch"))]
+        await _queued(gateway, 2)
+        tasks += [asyncio.ensure_future(call("interactive-1", "interactive")),
+                  asyncio.ensure_future(call("interactive-2", "interactive"))]
+        await _queued(gateway, 4)
+        gateway.release()
+        await asyncio.gather(*tasks)
+        return order, gateway.stats()
+
+    order, stats = asyncio.run(scenario())
+    assert order == ["interactive-1", "interactive-2", "batch-1", "batch-2"]
+    assert stats["active"] == 0
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    async def scenario():
+        gateway = LLMGateway(max_concurrency=1, max_queue=1)
+        await gateway.acquire()
+        waiter = asyncio.ensure_future(gateway.acquire())
+        await _queued(gateway, 1)
+        with pytest.raises(LLMOverloadedError) as excinfo:
+            await gateway.acquire()
+        gateway.release()
+        await waiter
+        gateway.release()
+        return excinfo.value, gateway.stats()
+
+    error, stats = asyncio.run(scenario())
+    assert error.retry_after >= 1
+    assert stats["rejected"] == 1
+    assert stats["active"] == 0
+
+
+def test_queue_wait_times_out():
+    async def scenario():
+        gateway = LLMGateway(max_concurrency=1, max_queue=4, max_queue_seconds=0.02)
+        await gateway.acquire()
+        with pytest.raises(LLMOverloadedError):
+            await gateway.acquire()
+        return gateway.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["timed_out"] == 1
+    assert stats["queue_depth"] == 0
+
+
+def test_overloaded_gateway_answers_429_with_retry_after(monkeypatch):
+    import main
+
+    gateway = get_llm_gateway()
+    with TestClient(main.app) as client:
+        monkeypatch.setattr(gateway, "max_concurrency", 0)
+        monkeypatch.setattr(gateway, "max_queue", 0)
+        response = client.post("/api/chat", json={"query": "How do I negotiate a raise?"})
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        gateway = LLMGateway(max_concurrency=1, max_queue=4)
+        await gateway.acquire()
+        waiter = asyncio.ensure_future(gateway.acquire())
+        await _queued(gateway, 1)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        queued = gateway.stats()["queue_depth"]
+        gateway.release()
+        return queued, gateway.stats()
+
+    queued, stats = asyncio.run(scenario())
+    assert queued == 0
+    assert stats["active"] == 0
+
+
+def test_slot_handed_to_a_cancelled_waiter_is_released():
+    async def scenario():
+        gateway = LLMGateway(max_concurrency=1, max_queue=4)
+        await gateway.acquire()
+        waiter = asyncio.ensure_future(gateway.acquire())
+        await _queued(gateway, 1)
+        # The slot is handed over, then the waiter is cancelled before it resumes
+        gateway.release()
+        waiter.cancel()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            pass
+        else:
+            # Some Python versions let acquire() finish instead; then the caller owns the slot
+            gateway.release()
+        return gateway.stats()
+
+    assert asyncio.run(scenario())["active"] == 0
+
+
+def test_cancelled_call_releases_its_slot():
+    async def scenario():
+        gateway = LLMGateway(max_concurrency=1, max_queue=4)
+        started = asyncio.Event()
+
+        async def call():
+            async with gateway.slot():
+                started.set()
+                await asyncio.sleep(10)
+
+        task = asyncio.ensure_future(call())
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The freed slot is available without queueing
+        return gateway.try_acquire()
+
+    assert asyncio.run(scenario())
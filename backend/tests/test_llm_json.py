@@ -0,0 +1,122 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services.llm_json import IncrementalJSONParser, extract_json, repair_json
+
+REPLY = {
+    "match_score": 72,
+    "matching_skills": ["Python", "FastAPI", "SQL"],
+    "missing_skills": ["Kubernetes"],
+    "summary": "Strong backend fit, braces } and \"quotes\" in text, light on ops",
+    "details": {"years": 4, "remote": True, "notes": None},
+}
+
+
+def _fields_in_order(chunks):
+    parser = IncrementalJSONParser()
+    events = []
+    for chunk in chunks:
+        for key, value in parser.feed(chunk).items():
+            events.append((key, value))
+    return parser, events
+
+
+def test_complete_object_wrapped_in_prose_and_fences():
+    text = "Here is the analysis:\n```json\n" + json.dumps(REPLY) + "\n```\nHope this helps {not json}"
+    assert repair_json(text) == REPLY
+    assert extract_json(text) == REPLY
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 16])
+def test_fields_are_emitted_once_across_chunk_boundaries(size):
+    text = "```json\n" + json.dumps(REPLY, indent=2) + "\n```"
+    chunks = [text[i:i + size] for i in range(0, len(text), size)]
+    parser, events = _fields_in_order(chunks)
+
+    assert events == list(REPLY.items())
+    assert parser.complete
+    assert parser.result() == REPLY
+
+
+def test_field_is_reported_by_the_chunk_that_completes_it():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"match_score": 7') == {}
+    # A number is only complete once a delimiter follows it
+    assert parser.feed('2, "matching_skills": ["Py') == {"match_score": 72}
+    assert parser.feed('thon"') == {}
+    assert parser.feed(']') == {"matching_skills": ["Python"]}
+    assert not parser.complete
+
+
+def test_truncated_reply_is_closed_after_last_complete_field():
+    text = '{"match_score": 72, "matching_skills": ["Python", "FastAPI"], "summary": "Strong backend f'
+    assert repair_json(text) == {"match_score": 72, "matching_skills": ["Python", "FastAPI"]}
+
+
+def test_truncated_array_keeps_complete_elements():
+    text = '{"match_score": 72, "matching_skills": ["Python", "FastAPI", "Dock'
+    assert repair_json(text) == {"match_score": 72, "matching_skills": ["Python", "FastAPI"]}
+
+
+def test_unfinished_nested_object_is_dropped():
+    text = '{"match_score": 72, "details": {"years": 4, "remote": tr'
+    assert repair_json(text) == {"match_score": 72}
+
+
+def test_truncated_reply_cut_after_a_comma():
+    assert extract_json('```json\n{"match_score": 72, "missing_skills": [],') == {
+        "match_score": 72, "missing_skills": []
+    }
+
+
+def test_trailing_commas_are_forgiven():
+    assert extract_json('{"matching_skills": ["Python", "SQL",], "match_score": 60,}') == {
+        "matching_skills": ["Python", "SQL"], "match_score": 60
+    }
+
+
+def test_no_object_yields_none():
+    assert repair_json("I cannot analyze this resume.") is None
+    assert extract_json("I cannot analyze this resume.") is None
+    assert repair_json("{") == {}
+
+
+def test_complete_but_malformed_reply_keeps_parsed_fields_and_is_flagged():
+    parser = IncrementalJSONParser()
+    parser.feed('{"match_score": 72, "matching_skills": ["Python" "SQL"], "summary": "ok"}')
+    assert parser.complete
+    assert parser.result() == {"match_score": 72, "summary": "ok"}
+    assert parser.malformed
+
+
+class _ScriptedLLM:
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = 0
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        return self.reply
+
+
+@pytest.mark.parametrize("reply, calls, degraded", [
+    (json.dumps({**REPLY, "match_score": 7.2}), 1, None),
+    ('{"match_score": 7.2, "matching_skills": ["Python" "SQL"], "summary": "ok"}', 2, "malformed_output"),
+])
+def test_only_fully_parsed_replies_are_cached(reply, calls, degraded):
+    from app.services.analyze import JobMatchAnalyzer
+
+    analyzer = JobMatchAnalyzer()
+    analyzer.llm = _ScriptedLLM(reply)
+
+    async def scenario():
+        jd, resume = "Backend engineer: Python, SQL, Kubernetes", "Python developer with SQL experience"
+        return [await analyzer.analyze(jd, resume) for _ in range(2)]
+
+    first, second = asyncio.run(scenario())
+    assert analyzer.llm.calls == calls
+    assert first["match_score"] == 7.2
+    assert first.get("degraded") == degraded
+    assert second.get("degraded") == degraded
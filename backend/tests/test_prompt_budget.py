@@ -0,0 +1,83 @@
+from app.services.prompt_budget import TRUNCATION_MARKER, PromptBudget, fit_to_budget
+from app.services.tokens import estimate_tokens
+
+
+def _section(heading: str, line: str, count: int) -> str:
+    return "\n".join([heading] + [f"{line} {i}" for i in range(count)])
+
+
+SKILLS = _section("SKILLS", "Python, FastAPI, PostgreSQL, Docker, Kubernetes", 10)
+EXPERIENCE = _section("EXPERIENCE", "Built and operated backend services handling heavy traffic", 20)
+CORE = "\n".join([
+    "Jane Doe - jane@example.com",
+    SKILLS,
+    EXPERIENCE,
+    _section("EDUCATION", "BSc Computer Science, State University", 5),
+])
+RESUME = "\n".join([
+    CORE,
+    _section("HOBBIES", "Hiking, chess, photography and long-distance cycling", 20),
+    _section("REFERENCES", "Available on request from previous managers", 20),
+])
+
+
+def test_text_within_budget_is_untouched():
+    assert fit_to_budget(RESUME, estimate_tokens(RESUME), "resume") == (RESUME, None)
+
+
+def test_output_stays_within_budget():
+    for budget in (400, 250, 120, 40):
+        fitted, report = fit_to_budget(RESUME, budget, "resume")
+        assert estimate_tokens(fitted) <= budget
+        assert report["final_tokens"] == estimate_tokens(fitted)
+        assert report["original_tokens"] == estimate_tokens(RESUME)
+
+
+def test_low_value_sections_are_dropped_before_high_value_ones():
+    # Room for everything but the hobbies and references
+    fitted, report = fit_to_budget(RESUME, estimate_tokens(CORE) + 10, "resume")
+
+    assert report["dropped_sections"] == ["REFERENCES", "HOBBIES"]
+    assert report["truncated_sections"] == []
+    assert fitted == CORE
+
+
+def test_highest_priority_sections_are_truncated_not_dropped():
+    fitted, report = fit_to_budget(RESUME, 120, "resume")
+
+    assert "SKILLS" in fitted and "EXPERIENCE" in fitted
+    assert "SKILLS" not in report["dropped_sections"] and "EXPERIENCE" not in report["dropped_sections"]
+    assert TRUNCATION_MARKER in fitted
+
+
+def test_job_description_keeps_requirements_over_boilerplate():
+    jd = "\n".join([
+        "Senior Backend Engineer",
+        _section("Requirements:", "5+ years of Python and distributed systems", 15),
+        _section("About Us:", "We are a fast-growing company on a mission", 15),
+        _section("Equal Opportunity:", "We welcome applicants from every background", 15),
+    ])
+    fitted, report = fit_to_budget(jd, 200, "job_description")
+
+    assert estimate_tokens(fitted) <= 200
+    assert "5+ years of Python and distributed systems 14" in fitted
+    assert report["dropped_sections"][0] == "Equal Opportunity"
+
+
+def test_unstructured_text_is_cut_to_budget():
+    text = "word " * 2000
+    fitted, report = fit_to_budget(text, 100, "resume")
+    assert estimate_tokens(fitted) <= 100
+    assert fitted.endswith(TRUNCATION_MARKER)
+    assert report["truncated_sections"]
+
+
+def test_prompt_budget_reports_cuts_per_field():
+    budget = PromptBudget({"resume": 120, "job_description": 1000})
+    assert budget.fit("job_description", "Short JD") == "Short JD"
+    budget.fit("resume", RESUME)
+
+    [cut] = budget.report()
+    assert cut["field"] == "resume"
+    assert cut["budget_tokens"] == 120
+    assert cut["final_tokens"] <= 120
@@ -0,0 +1,249 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.resilience import CircuitBreaker, CircuitOpenError, DeadlineExceeded, ResilientCaller
+
+
+async def _fail():
+    raise RuntimeError("provider down")
+
+
+async def _ok():
+    return "ok"
+
+
+def test_breaker_opens_after_threshold_then_half_opens_and_closes():
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=0.05)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.short_circuited == 1
+
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    # Only one probe goes through while half-open
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+    assert breaker.opened == 1
+
+
+def test_failed_probe_reopens_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.opened == 2
+
+
+def test_caller_short_circuits_while_open():
+    caller = ResilientCaller(CircuitBreaker(failure_threshold=2, reset_seconds=60))
+    attempts = []
+
+    async def attempt():
+        attempts.append(1)
+        return await _fail()
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await caller.call(attempt, timeout=1)
+        with pytest.raises(CircuitOpenError):
+            await caller.call(attempt, timeout=1)
+
+    asyncio.run(scenario())
+    assert len(attempts) == 2
+    assert caller.errors == 2
+
+
+def test_cancelled_probe_lets_next_call_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.01)
+    caller = ResilientCaller(breaker)
+    breaker.record_failure()
+    time.sleep(0.02)
+
+    async def scenario():
+        probe = asyncio.ensure_future(caller.call(lambda: asyncio.sleep(10), timeout=20))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        return await caller.call(_ok, timeout=1)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_deadline_expiry_cancels_attempt_and_counts_failure():
+    breaker = CircuitBreaker(failure_threshold=5)
+    caller = ResilientCaller(breaker)
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def scenario():
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            await caller.call(slow, timeout=0.05)
+        elapsed = time.monotonic() - started
+        await asyncio.sleep(0)
+        return elapsed
+
+    elapsed = asyncio.run(scenario())
+    assert elapsed < 1
+    assert cancelled == [True]
+    assert caller.deadline_exceeded == 1
+    assert breaker.stats()["consecutive_failures"] == 1
+
+
+def _primed_hedging_caller(**kwargs) -> ResilientCaller:
+    caller = ResilientCaller(CircuitBreaker(), hedge=True, hedge_min_delay=0.02, min_samples=1, **kwargs)
+    caller._latencies.append(0.02)
+    return caller
+
+
+def test_hedge_win_cancels_primary_and_releases_slot():
+    released = []
+    caller = _primed_hedging_caller(reserve_slot=lambda: True, release_slot=lambda: released.append(True))
+    calls = 0
+    primary_cancelled = []
+
+    async def attempt():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                primary_cancelled.append(True)
+                raise
+        return "hedge"
+
+    async def scenario():
+        result = await caller.call(attempt, timeout=1)
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(scenario()) == "hedge"
+    assert primary_cancelled == [True]
+    assert released == [True]
+    assert caller.hedges == 1
+    assert caller.hedge_wins == 1
+
+
+def test_primary_win_cancels_hedge_and_releases_slot():
+    released = []
+    caller = _primed_hedging_caller(reserve_slot=lambda: True, release_slot=lambda: released.append(True))
+    calls = 0
+    hedge_cancelled = []
+
+    async def attempt():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(0.05)
+            return "primary"
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            hedge_cancelled.append(True)
+            raise
+
+    async def scenario():
+        result = await caller.call(attempt, timeout=1)
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(scenario()) == "primary"
+    assert hedge_cancelled == [True]
+    assert released == [True]
+    assert caller.hedge_wins == 0
+
+
+def test_no_hedge_without_free_slot():
+    caller = _primed_hedging_caller(reserve_slot=lambda: False)
+    calls = 0
+
+    async def attempt():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    assert asyncio.run(caller.call(attempt, timeout=1)) == "primary"
+    assert calls == 1
+    assert caller.hedges == 0
+
+
+JD = "Backend engineer: Python, FastAPI, PostgreSQL, Docker"
+RESUME = "Python developer with FastAPI and SQL experience"
+
+
+@pytest.fixture
+def busy_analyzer():
+    """Analyzer whose only LLM slot is taken, with a long queue wait"""
+    from app.services.analyze import JobMatchAnalyzer
+    from app.services.llm_gateway import LLMGateway
+
+    analyzer = JobMatchAnalyzer()
+    analyzer.gateway = LLMGateway(max_concurrency=1, max_queue=4, max_queue_seconds=3)
+    analyzer.gateway.try_acquire()
+    return analyzer
+
+
+def _timed_analyze(analyzer, **kwargs):
+    async def scenario():
+        started = time.monotonic()
+        result = await analyzer.analyze(JD, RESUME, use_cache=False, **kwargs)
+        return result, time.monotonic() - started
+
+    return asyncio.run(scenario())
+
+
+def test_open_breaker_degrades_without_queueing(busy_analyzer):
+    breaker = busy_analyzer.llm_caller.breaker
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    result, elapsed = _timed_analyze(busy_analyzer)
+    assert result["degraded"] == "circuit_open"
+    assert elapsed < 0.5
+    assert busy_analyzer.gateway.stats()["timed_out"] == 0
+
+
+def test_deadline_running_out_in_the_queue_degrades(busy_analyzer):
+    result, elapsed = _timed_analyze(busy_analyzer, timeout_seconds=0.2)
+    assert result["degraded"] == "deadline"
+    assert 0.15 < elapsed < 1
+
+
+def test_full_queue_still_answers_overloaded(busy_analyzer):
+    from app.services.llm_gateway import LLMOverloadedError
+
+    busy_analyzer.gateway.max_queue = 0
+    with pytest.raises(LLMOverloadedError):
+        _timed_analyze(busy_analyzer, timeout_seconds=0.2)
+
+
+def test_streaming_deadline_running_out_in_the_queue_degrades(busy_analyzer):
+    async def scenario():
+        return [event async for event in busy_analyzer.analyze_stream(JD, RESUME, use_cache=False,
+                                                                      timeout_seconds=0.2)]
+
+    events = asyncio.run(scenario())
+    assert events[-1]["result"]["degraded"] == "deadline"
+    assert busy_analyzer.llm_caller.breaker.state == "closed"
@@ -0,0 +1,42 @@
+from io import BytesIO
+
+import pytest
+
+from app.services.resume_parser import extract_text_from_docx
+
+docx = pytest.importorskip("docx")
+
+
+def _docx_bytes(build):
+    document = docx.Document()
+    build(document)
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def test_vertically_merged_cell_is_emitted_once():
+    def build(document):
+        table = document.add_table(rows=3, cols=2)
+        table.cell(0, 0).merge(table.cell(2, 0)).text = "Acme Corp 2019-2023"
+        for row, text in enumerate(["Built billing APIs", "Led a team of four", "Python, PostgreSQL"]):
+            table.cell(row, 1).text = text
+
+    text = extract_text_from_docx(_docx_bytes(build))
+    assert text.count("Acme Corp") == 1
+    assert text.splitlines() == [
+        "Acme Corp 2019-2023 | Built billing APIs",
+        "Led a team of four",
+        "Python, PostgreSQL",
+    ]
+
+
+def test_horizontally_merged_cell_and_repeated_values_in_other_rows():
+    def build(document):
+        table = document.add_table(rows=3, cols=2)
+        table.cell(0, 0).merge(table.cell(0, 1)).text = "Skills"
+        table.cell(1, 0).text, table.cell(1, 1).text = "Backend", "Python"
+        table.cell(2, 0).text, table.cell(2, 1).text = "Data", "Python"
+
+    text = extract_text_from_docx(_docx_bytes(build))
+    assert text.splitlines() == ["Skills", "Backend | Python", "Data | Python"]
@@ -0,0 +1,101 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.services.chat import get_chat_service
+from app.services.semantic_cache import SemanticCache, cosine, embed, qualifiers
+
+FRONTEND = "What career path should I take as a frontend developer?"
+BACKEND = "What career path should I take as a backend developer?"
+
+
+@pytest.fixture
+def chat_service():
+    service = get_chat_service()
+    service.semantic_cache.clear()
+    yield service
+    service.semantic_cache.clear()
+
+
+def _ask(service, query):
+    # A new session each time: questions with earlier turns never use the cache
+    return asyncio.run(service.chat(query=query, context="", session_id=uuid.uuid4().hex))
+
+
+def test_frontend_and_backend_questions_do_not_share_an_answer(chat_service):
+    first = _ask(chat_service, FRONTEND)
+    second = _ask(chat_service, BACKEND)
+
+    assert "semantic_cache" not in first
+    assert "semantic_cache" not in second
+    assert chat_service._semantic_partition(FRONTEND, "", "") != chat_service._semantic_partition(BACKEND, "", "")
+
+
+def test_reworded_question_reuses_the_answer(chat_service):
+    first = _ask(chat_service, FRONTEND)
+    reworded = _ask(chat_service, "Which career path should I take as a frontend engineer?")
+
+    assert reworded["semantic_cache"]["matched_query"] == FRONTEND
+    assert reworded["response"] == first["response"]
+
+
+def test_named_skills_keep_questions_apart(chat_service):
+    react = "How do I get better at React for frontend interviews?"
+    vue = "How do I get better at Vue for frontend interviews?"
+    assert chat_service._semantic_partition(react, "", "") != chat_service._semantic_partition(vue, "", "")
+
+
+def test_questions_with_resume_context_are_not_cached(chat_service):
+    assert chat_service._semantic_partition(FRONTEND, "Five years of React and TypeScript", "") is None
+
+
+def test_partitions_isolate_lookalike_questions():
+    # A threshold low enough to match on wording alone...
+    assert cosine(embed(FRONTEND), embed(BACKEND)) >= 0.5
+    cache = SemanticCache(threshold=0.5)
+    cache.set(FRONTEND, "frontend answer", partition="frontend|")
+
+    # ...so only the partition keeps the backend question from getting the frontend answer
+    assert cache.get(BACKEND, partition="backend|") is None
+    value, similarity, matched = cache.get(FRONTEND.replace("What", "Which"), partition="frontend|")
+    assert value == "frontend answer"
+    assert matched == FRONTEND
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("stored, asked", [
+    ("What should I not put on my resume?", "What should I put on my resume?"),
+    ("What shouldn't I put on my resume?", "What should I put on my resume?"),
+    ("How should a senior developer negotiate salary?", "How should a junior developer negotiate salary?"),
+    ("Should I learn Python before SQL?", "Should I learn SQL before Python?"),
+    ("How do I switch from frontend to backend?", "How do I switch from backend to frontend?"),
+])
+def test_opposite_questions_do_not_match(stored, asked):
+    cache = SemanticCache()
+    cache.set(stored, "answer")
+    assert cache.get(asked) is None
+    # Nor the other way round
+    cache = SemanticCache()
+    cache.set(asked, "answer")
+    assert cache.get(stored) is None
+
+
+def test_word_order_changes_the_embedding():
+    assert cosine(embed("Should I learn Python before SQL?"), embed("Should I learn SQL before Python?")) < 0.9
+    assert cosine(embed("Should I learn Python before SQL?"), embed("should i learn python before sql")) == pytest.approx(1.0)
+
+
+def test_qualifiers():
+    assert qualifiers("What should I not put on my resume?") == "not"
+    assert qualifiers("Which skills don't matter for a senior role?") == "not|senior"
+    assert qualifiers("Tips for an entry-level data analyst") == "junior"
+    assert qualifiers("How do I become a staff engineer?") == "lead"
+    assert qualifiers("How do I write a cover letter?") == ""
+
+
+def test_rewording_with_the_same_qualifiers_still_matches():
+    cache = SemanticCache()
+    cache.set("How should a senior developer negotiate salary?", "answer")
+    assert cache.get("How should a senior engineer negotiate salary?") is not None
+    assert cache.get("How should a senior engineer not negotiate salary?") is None
@@ -0,0 +1,33 @@
+import os
+
+import serve
+
+
+def test_single_worker_keeps_per_process_state(monkeypatch):
+    monkeypatch.setattr(serve.config, "RESUME_CACHE_DB_PATH", "")
+    monkeypatch.setattr(serve.config, "CHAT_HISTORY_BACKEND", "memory")
+    assert serve.share_worker_state(1) == {}
+
+
+def test_multiple_workers_share_resume_cache_and_chat_history(monkeypatch):
+    for name in ("RESUME_CACHE_DB_PATH", "CHAT_HISTORY_BACKEND", "CHAT_HISTORY_DB_PATH"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(serve.config, "RESUME_CACHE_DB_PATH", "")
+    monkeypatch.setattr(serve.config, "CHAT_HISTORY_BACKEND", "memory")
+    monkeypatch.setattr(serve.config, "CHAT_HISTORY_DB_PATH", "")
+
+    shared = serve.share_worker_state(2)
+
+    assert shared == {
+        "RESUME_CACHE_DB_PATH": os.path.join(serve.config.BACKEND_DIR, "resume_cache.db"),
+        "CHAT_HISTORY_BACKEND": "sqlite",
+        "CHAT_HISTORY_DB_PATH": os.path.join(serve.config.BACKEND_DIR, "chat_history.db"),
+    }
+    # Workers read their settings from the environment they inherit
+    assert {name: os.environ[name] for name in shared} == shared
+
+
+def test_configured_shared_state_is_kept(monkeypatch):
+    monkeypatch.setattr(serve.config, "RESUME_CACHE_DB_PATH", "/data/resumes.db")
+    monkeypatch.setattr(serve.config, "CHAT_HISTORY_BACKEND", "sqlite")
+    assert serve.share_worker_state(4) == {}
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from app.services.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    async def scenario():
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"answer": 42}
+
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+        return results, calls, flight.stats()
+
+    results, calls, stats = asyncio.run(scenario())
+    assert calls == 1
+    assert all(result == {"answer": 42} for result in results)
+    assert stats["coalesced"] == 4
+    assert stats["in_flight"] == 0
+
+
+def test_one_callers_cancellation_does_not_cancel_the_shared_call():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+        cancelled = []
+
+        async def fetch():
+            try:
+                await release.wait()
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("key", fetch))
+        second = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        release.set()
+        return await second, cancelled
+
+    result, cancelled = asyncio.run(scenario())
+    assert result == "done"
+    assert cancelled == []
+
+
+def test_last_callers_cancellation_cancels_the_shared_call():
+    async def scenario():
+        flight = SingleFlight()
+        cancelled = []
+
+        async def fetch():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        callers = [asyncio.ensure_future(flight.do("key", fetch)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+        return cancelled, flight.stats()
+
+    cancelled, stats = asyncio.run(scenario())
+    assert cancelled == [True]
+    assert stats["in_flight"] == 0
+
+
+def test_error_reaches_every_waiter_and_key_is_retried_afterwards():
+    async def scenario():
+        flight = SingleFlight()
+        calls = 0
+
+        async def failing():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+
+        outcomes = await asyncio.gather(*(flight.do("key", failing) for _ in range(3)), return_exceptions=True)
+        retried = await flight.do("key", lambda: asyncio.sleep(0, result="recovered"))
+        return outcomes, calls, retried
+
+    outcomes, calls, retried = asyncio.run(scenario())
+    assert calls == 1
+    assert len(outcomes) == 3
+    assert all(isinstance(outcome, ValueError) and str(outcome) == "upstream failed" for outcome in outcomes)
+    assert retried == "recovered"
@@ -0,0 +1,50 @@
+import pytest
+
+from app.services.skills import SkillExtractor
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    return SkillExtractor()
+
+
+@pytest.mark.parametrize("text", [
+    "I react to feedback quickly and keep stakeholders informed",
+    "Each node in the org chart owns a budget",
+    "Known for a swift turnaround on support tickets",
+    "Removed rust from old pipes during the renovation",
+    "Comfortable testing the waters with new markets",
+    "Mix 5 ml of the solution into the sample",
+    "Ready to go to market with the new product line",
+])
+def test_everyday_words_are_not_skills(extractor, text):
+    assert not extractor.extract(text)
+
+
+def test_ml_inside_other_words_is_not_machine_learning(extractor):
+    assert set(extractor.extract("Wrote XML and YAML configs, HTML emails and an ML-free rules engine")) == {"HTML"}
+
+
+def test_everyday_words_next_to_real_skills_are_not_counted(extractor):
+    skills = extractor.extract("Python developer who can react to feedback and go the extra mile")
+    assert set(skills) == {"Python"}
+
+
+@pytest.mark.parametrize("text, skill", [
+    ("Built SPA components in React with hooks", "React"),
+    ("Skills: Python, React, Docker", "React"),
+    ("Backend services on Node with Express", "Node.js"),
+    ("Shipped iOS apps in Swift and SwiftUI", "Swift"),
+    ("Systems programming in Rust with tokio", "Rust"),
+    ("Deployed ML models to production", "Machine Learning"),
+    ("Wrote automated testing for the payment flow", "Testing"),
+    ("Services in Go using goroutines", "Go"),
+    ("Kotlin, Rust and Java", "Rust"),
+])
+def test_ambiguous_aliases_count_in_context(extractor, text, skill):
+    assert skill in extractor.extract(text)
+
+
+def test_unambiguous_forms_need_no_context(extractor):
+    skills = extractor.extract("node.js, reactjs, golang, machine learning, unit testing")
+    assert set(skills) == {"Node.js", "React", "Go", "Machine Learning", "Testing"}
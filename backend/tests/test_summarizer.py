@@ -0,0 +1,105 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.history import SUMMARY_ROLE, MemoryHistoryStore, SQLiteHistoryStore, split_summary
+from app.services.llm_gateway import LLMGateway
+from app.services.summarizer import HistorySummarizer
+from app.services.tokens import estimate_tokens
+
+
+class FakeLLM:
+    """Records prompts and answers each with a numbered summary"""
+
+    def __init__(self):
+        self.prompts = []
+
+    async def ainvoke(self, prompt):
+        self.prompts.append(prompt)
+        return SimpleNamespace(content=f"summary {len(self.prompts)}")
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def history(request, tmp_path):
+    limits = {"max_messages": 12, "max_bytes": 1_000_000}
+    if request.param == "memory":
+        return MemoryHistoryStore(**limits)
+    return SQLiteHistoryStore(str(tmp_path / "history.db"), **limits)
+
+
+def _summarizer(history, llm, **kwargs):
+    settings = {"trigger_tokens": 100, "recent_tokens": 60, "recent_messages": 4,
+                "summary_tokens": 50, "min_interval_seconds": 0, "store_max_messages": 12}
+    settings.update(kwargs)
+    return HistorySummarizer(history, llm, LLMGateway(), **settings)
+
+
+def _turn(index):
+    role = "user" if index % 2 == 0 else "assistant"
+    return {"role": role, "content": f"turn {index}: " + "career detail " * 6}
+
+
+async def _chat(summarizer, history, session_id, start, count):
+    """Append turns one exchange at a time, as the chat service does, letting refreshes finish"""
+    for index in range(start, start + count, 2):
+        history.append(session_id, [_turn(index), _turn(index + 1)])
+        summarizer.maybe_refresh(session_id)
+        await asyncio.gather(*summarizer._tasks)
+
+
+def test_folding_preserves_message_order(history):
+    llm = FakeLLM()
+    summarizer = _summarizer(history, llm)
+    asyncio.run(_chat(summarizer, history, "s", 0, 10))
+
+    summary, turns = split_summary(history.get("s"))
+    assert summarizer.refreshes >= 1
+    assert summary == f"summary {len(llm.prompts)}"
+    # What remains are the newest turns, unchanged and in order
+    indexes = [int(turn["content"].split(":")[0].split()[1]) for turn in turns]
+    assert indexes == list(range(10 - len(turns), 10))
+    assert turns == [_turn(i) for i in indexes]
+    # Every folded turn went to the summarizer exactly once, oldest first
+    folded = [line for prompt in llm.prompts for line in prompt.splitlines() if ": turn " in line]
+    assert [int(line.split("turn ")[1].split(":")[0]) for line in folded] == list(range(10 - len(turns)))
+
+
+def test_later_fold_builds_on_previous_summary(history):
+    llm = FakeLLM()
+    summarizer = _summarizer(history, llm)
+    asyncio.run(_chat(summarizer, history, "s", 0, 10))
+    first_refreshes = len(llm.prompts)
+    asyncio.run(_chat(summarizer, history, "s", 10, 10))
+
+    assert len(llm.prompts) > first_refreshes
+    assert f"CURRENT SUMMARY:\nsummary {first_refreshes}" in llm.prompts[first_refreshes]
+    messages = history.get("s")
+    assert [m["role"] for m in messages].count(SUMMARY_ROLE) == 1
+    assert messages[0]["role"] == SUMMARY_ROLE
+
+
+def test_context_stays_within_the_recent_budget(history):
+    summarizer = _summarizer(history, FakeLLM())
+    asyncio.run(_chat(summarizer, history, "s", 0, 10))
+
+    summary, recent = summarizer.context(history.get("s"))
+    assert summary is not None
+    assert sum(estimate_tokens(f"{t['role'].upper()}: {t['content']}") for t in recent) <= 60
+    assert len(recent) <= 4
+    assert recent[-1] == _turn(9)
+
+
+def test_short_conversation_is_not_summarized(history):
+    llm = FakeLLM()
+    summarizer = _summarizer(history, llm)
+    asyncio.run(_chat(summarizer, history, "s", 0, 2))
+    assert llm.prompts == []
+    assert split_summary(history.get("s"))[0] is None
+
+
+def test_compact_refuses_a_stale_fold(history):
+    history.append("s", [_turn(i) for i in range(4)])
+    assert not history.compact("s", [_turn(1), _turn(2)], "summary")
+    assert history.compact("s", [_turn(0), _turn(1)], "summary")
+    assert history.get("s") == [{"role": SUMMARY_ROLE, "content": "summary"}, _turn(2), _turn(3)]
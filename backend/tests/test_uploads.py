@@ -0,0 +1,85 @@
+import hashlib
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+RESUME = b"Jane Doe\nSKILLS\nPython, FastAPI, PostgreSQL\n" * 2000
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    import main
+
+    monkeypatch.setattr(main.config, "RESUME_SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(main.bulk_parser, "spool_dir", str(tmp_path))
+    main.resume_cache.clear()
+    with TestClient(main.app) as client:
+        yield client, main
+
+
+def test_upload_is_parsed_from_a_spooled_file_and_cleaned_up(client, monkeypatch, tmp_path):
+    client, main = client
+    sources = []
+    parse = main.parser_pool.parse
+
+    async def recording_parse(source, content_type):
+        sources.append(source)
+        assert os.path.dirname(source) == str(tmp_path)
+        with open(source, "rb") as f:
+            assert f.read() == RESUME
+        return await parse(source, content_type)
+
+    monkeypatch.setattr(main.parser_pool, "parse", recording_parse)
+    response = client.post("/api/parse-resume", files={"file": ("cv.txt", RESUME, "text/plain")})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["resume_id"] == hashlib.sha256(RESUME).hexdigest()
+    assert body["size"] == len(RESUME)
+    assert body["text"].startswith("Jane Doe")
+    # The parser got a path, not the bytes, and the temp file is gone
+    assert len(sources) == 1 and isinstance(sources[0], str)
+    assert os.listdir(tmp_path) == []
+
+
+def test_cached_upload_skips_the_parser_and_cleans_up(client, tmp_path):
+    client, main = client
+    first = client.post("/api/parse-resume", files={"file": ("cv.txt", RESUME, "text/plain")})
+    second = client.post("/api/parse-resume", files={"file": ("cv.txt", RESUME, "text/plain")})
+
+    assert first.json()["cached"] is False
+    assert second.json()["cached"] is True
+    assert os.listdir(tmp_path) == []
+
+
+def test_oversized_upload_is_refused_before_spooling(client, tmp_path):
+    client, main = client
+    too_big = b"x" * (main.config.RESUME_MAX_BYTES + main.config.UPLOAD_FORM_OVERHEAD_BYTES + 1)
+    response = client.post("/api/parse-resume", files={"file": ("cv.txt", too_big, "text/plain")})
+
+    assert response.status_code == 413
+    assert os.listdir(tmp_path) == []
+
+
+def test_bulk_plain_files_are_spooled_and_cleaned_up(client, monkeypatch, tmp_path):
+    client, main = client
+    spooled = []
+    parse = main.parser_pool.parse
+
+    async def recording_parse(source, content_type):
+        spooled.append(os.path.dirname(source))
+        return await parse(source, content_type)
+
+    monkeypatch.setattr(main.parser_pool, "parse", recording_parse)
+    response = client.post("/api/parse-resume/bulk", files=[
+        ("files", ("a.txt", RESUME, "text/plain")),
+        ("files", ("b.txt", RESUME + b"\nReferences", "text/plain")),
+        ("files", ("c.txt", RESUME, "text/plain")),
+    ])
+
+    lines = response.text.splitlines()
+    assert response.status_code == 200
+    assert '"duplicates": 1' in lines[-1] and '"errors": 0' in lines[-1]
+    assert spooled == [str(tmp_path)] * 2
+    assert os.listdir(tmp_path) == []
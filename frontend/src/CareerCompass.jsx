@@ -7,12 +7,14 @@ const CareerCompass = () => {
   const [jobDesc, setJobDesc] = useState('');
   const [resume, setResume] = useState('');
   const [resumeFile, setResumeFile] = useState(null);
+  const [resumeId, setResumeId] = useState(null);
   const [analysis, setAnalysis] = useState(null);
   const [loading, setLoading] = useState(false);
   const [activeTab, setActiveTab] = useState('analyze');
   const [chatQuery, setChatQuery] = useState('');
   const [chatHistory, setChatHistory] = useState([]);
   const [chatLoading, setChatLoading] = useState(false);
+  const [chatSessionId, setChatSessionId] = useState(null);
   const [uploadMode, setUploadMode] = useState('text');
   const fileInputRef = useRef(null);
 
@@ -36,16 +38,39 @@ const CareerCompass = () => {
     }
 
     setResumeFile(file);
+    setResumeId(null);
     setResume('');
   };
 
   const removeFile = () => {
     setResumeFile(null);
+    setResumeId(null);
     if (fileInputRef.current) {
       fileInputRef.current.value = '';
     }
   };
 
+  // Upload the file once; later requests reference it by resume_id
+  const getResumeId = async () => {
+    if (resumeId) return resumeId;
+
+    const formData = new FormData();
+    formData.append('file', resumeFile);
+
+    const uploadResponse = await fetch(`${API_URL}/api/parse-resume`, {
+      method: 'POST',
+      body: formData
+    });
+
+    if (!uploadResponse.ok) {
+      throw new Error('Failed to parse resume file');
+    }
+
+    const { resume_id } = await uploadResponse.json();
+    setResumeId(resume_id);
+    return resume_id;
+  };
+
   
   const analyzeMatch = async () => {
 
@@ -63,25 +88,9 @@ const CareerCompass = () => {
     setAnalysis(null);
     
     try {
-      let resumeText = resume;
-
-      
-      if (resumeFile) {
-        const formData = new FormData();
-        formData.append('file', resumeFile);
-
-        const uploadResponse = await fetch(`${API_URL}/api/parse-resume`, {
-          method: 'POST',
-          body: formData
-        });
-
-        if (!uploadResponse.ok) {
-          throw new Error('Failed to parse resume file');
-        }
-        
-        const { text } = await uploadResponse.json();
-        resumeText = text;
-      }
+      const resumePayload = resumeFile
+        ? { resume_id: await getResumeId() }
+        : { resume_text: resume };
 
      
       const response = await fetch(`${API_URL}/api/analyze`, {
@@ -91,11 +100,13 @@ const CareerCompass = () => {
         },
         body: JSON.stringify({
           job_description: jobDesc,
-          resume_text: resumeText
+          ...resumePayload
         })
       });
 
       if (!response.ok) {
+        // Server evicted the parsed resume; re-upload on the next attempt
+        if (response.status === 404) setResumeId(null);
         throw new Error('Analysis failed');
       }
       
@@ -119,21 +130,14 @@ const CareerCompass = () => {
     setChatLoading(true);
 
     try {
-      let contextText = resume;
+      let contextPayload = { context: resume };
 
  
       if (resumeFile && !resume) {
-        const formData = new FormData();
-        formData.append('file', resumeFile);
-
-        const uploadResponse = await fetch(`${API_URL}/api/parse-resume`, {
-          method: 'POST',
-          body: formData
-        });
-
-        if (uploadResponse.ok) {
-          const { text } = await uploadResponse.json();
-          contextText = text;
+        try {
+          contextPayload = { resume_id: await getResumeId() };
+        } catch (uploadError) {
+          console.error(uploadError);
         }
       }
 
@@ -144,15 +148,18 @@ const CareerCompass = () => {
         },
         body: JSON.stringify({
           query: userMessage.content,
-          context: contextText || ''
+          ...contextPayload,
+          session_id: chatSessionId
         })
       });
 
       if (!response.ok) {
+        if (response.status === 404) setResumeId(null);
         throw new Error('Chat failed');
       }
       
       const data = await response.json();
+      setChatSessionId(data.session_id);
       setChatHistory(prev => [...prev, { role: 'assistant', content: data.response }]);
     } catch (error) {
       alert('Error in chat. Make sure backend is running.');